@@ -0,0 +1,10 @@
+"""
+Evaluates techniques on datasets from the command line, see api.cli, e.g.
+    python -m api --datasets Drone --techniques "(. (VSM NT) (0 2))" --format csv
+"""
+import sys
+
+from api.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+The following module defines an asyncio front-end for the Tracer that runs evaluations in an executor so that
+they do not block the event loop.
+"""
+import asyncio
+import itertools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.tables.metric_table import Metrics
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.parser.data import TechniqueData
+from api.tracer import Tracer
+
+_worker_tracer: Optional[
+    Tracer
+] = None  # tracer of each worker process, reused to avoid reloading datasets
+
+
+def parse_technique_name(technique_name: str) -> Tuple[str, bool]:
+    """
+    Returns the canonical name of given technique definition and whether it is stochastic.
+    :param technique_name: the technique definition
+    :return: the canonical name and whether the technique contains a stochastic technique
+    """
+    technique = create_technique_from_name(technique_name)
+    return technique.get_name(), technique.definition.contains_stochastic_technique()
+
+
+def run_tracer_method(method_name: str, *args) -> Any:
+    """
+    Calls method of the tracer belonging to the current worker process.
+    :param method_name: the name of the Tracer method to call
+    :param args: the arguments passed to the method
+    :return: the result of the method
+    """
+    global _worker_tracer  # pylint: disable=global-statement
+    if _worker_tracer is None:
+        _worker_tracer = Tracer()
+    return getattr(_worker_tracer, method_name)(*args)
+
+
+class PendingComputation:
+    """
+    A computation running in the executor along with the number of requests waiting on its result.
+    """
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.n_waiters = 0
+
+
+class AsyncTracer:
+    """
+    Asyncio version of the Tracer. Concurrent requests for the same evaluation share a single computation, unless
+    a stochastic technique is evaluated in which case each request draws its own sample.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None):
+        """
+        :param executor: where evaluations are run, either a thread or process pool. Defaults to a thread pool.
+        """
+        self.owns_executor = executor is None
+        self.executor = ThreadPoolExecutor() if executor is None else executor
+        self.tracer = Tracer()
+        self.pending: Dict[Tuple, PendingComputation] = {}
+        self.request_ids = (
+            itertools.count()
+        )  # distinguishes requests that are not shared
+
+    async def get_technique_data(
+        self, dataset_name: str, technique_name: str, timeout: Optional[float] = None
+    ) -> TechniqueData:
+        """
+        Asynchronous version of Tracer.get_technique_data.
+        :param dataset_name: name of dataset
+        :param technique_name: technique definition to calculate
+        :param timeout: seconds to wait for the result before raising asyncio.TimeoutError, waits forever if None
+        :return: TechniqueData
+        """
+        technique_name, is_stochastic = parse_technique_name(technique_name)
+        return await self.run(
+            "get_technique_data",
+            (dataset_name, technique_name),
+            timeout,
+            is_shared=not is_stochastic,
+        )
+
+    async def get_batch_technique_data(
+        self,
+        dataset_name: str,
+        technique_names: List[str],
+        timeout: Optional[float] = None,
+    ) -> List[TechniqueData]:
+        """
+        Asynchronous version of Tracer.get_batch_technique_data.
+        :param dataset_name: name of dataset
+        :param technique_names: the technique definitions to calculate
+        :param timeout: seconds to wait for the result before raising asyncio.TimeoutError, waits forever if None
+        :return: list of TechniqueData in the order of given technique names
+        """
+        parsed_names = [parse_technique_name(name) for name in technique_names]
+        return await self.run(
+            "get_batch_technique_data",
+            (dataset_name, [name for name, _ in parsed_names]),
+            timeout,
+            is_shared=not any(is_stochastic for _, is_stochastic in parsed_names),
+        )
+
+    async def get_metrics(
+        self,
+        dataset_name: str,
+        technique_name: str,
+        summary_metrics=True,
+        timeout: Optional[float] = None,
+    ) -> List[Metrics]:
+        """
+        Asynchronous version of Tracer.get_metrics.
+        :param dataset_name: name of dataset
+        :param technique_name: technique definition to evaluate
+        :param summary_metrics: if true metrics of all queries are taken, otherwise individual queries are used
+        :param timeout: seconds to wait for the result before raising asyncio.TimeoutError, waits forever if None
+        :return: list of metrics, one per query. If summary_metrics is True, then list will contain a single item.
+        """
+        technique_name, is_stochastic = parse_technique_name(technique_name)
+        return await self.run(
+            "get_metrics",
+            (dataset_name, technique_name, summary_metrics),
+            timeout,
+            is_shared=not is_stochastic,
+        )
+
+    async def run(
+        self,
+        method_name: str,
+        args: Tuple,
+        timeout: Optional[float] = None,
+        is_shared: bool = True,
+    ) -> Any:
+        """
+        Waits for the result of given Tracer method, joining the computation of an identical pending request if one
+        exists. Cancelling or timing out a request only cancels the computation once no other request is waiting on
+        it and the computation has not started running.
+        :param method_name: the name of the Tracer method to call
+        :param args: the arguments passed to the method
+        :param timeout: seconds to wait for the result before raising asyncio.TimeoutError, waits forever if None
+        :param is_shared: whether identical requests may share the computation, False for stochastic techniques
+        :return: the result of the method
+        """
+        key = (method_name, repr(args))
+        if not is_shared:
+            key += (next(self.request_ids),)
+        computation = self.pending.get(key)
+        if computation is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, self.create_task_function(method_name, args)
+            )
+            computation = PendingComputation(future)
+            self.pending[key] = computation
+            future.add_done_callback(partial(self.remove_pending, key, computation))
+
+        computation.n_waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(computation.future), timeout)
+        finally:
+            computation.n_waiters -= 1
+            if computation.n_waiters == 0 and not computation.future.done():
+                computation.future.cancel()
+
+    def create_task_function(self, method_name: str, args: Tuple) -> Callable:
+        """
+        Returns function calling given Tracer method that can be submitted to the executor.
+        :param method_name: the name of the Tracer method to call
+        :param args: the arguments passed to the method
+        :return: function without arguments
+        """
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return partial(run_tracer_method, method_name, *args)
+        return partial(getattr(self.tracer, method_name), *args)
+
+    def remove_pending(
+        self, key: Tuple, computation: PendingComputation, _: asyncio.Future
+    ):
+        """
+        Removes computation from the pending computations once it has finished.
+        :param key: the key of the computation
+        :param computation: the finished computation
+        :param _: the finished future
+        :return: None
+        """
+        if self.pending.get(key) is computation:
+            del self.pending[key]
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts down the executor if it was created by this tracer.
+        :param wait: whether to wait for running evaluations to finish
+        :return: None
+        """
+        if self.owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
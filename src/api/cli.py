@@ -0,0 +1,225 @@
+"""
+The following module implements the command line batch evaluator (python -m api). Every technique is evaluated on
+every dataset and a row is written to stdout per evaluation (summary mode) or per query (query mode) as soon as the
+evaluation completes, e.g.
+    python -m api --datasets Drone EasyClinic --techniques "(. (VSM NT) (0 2))" --format csv
+    python -m api --datasets Drone --technique-file techniques.txt --workers 4 --mode query > metrics.jsonl
+Progress is written to stderr.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from concurrent.futures import as_completed
+from itertools import product
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from api.extension.cache import Cache, CacheConfig
+from api.extension.file_operations import read_technique_names
+from api.extension.parallelism import create_process_pool
+from api.tables.metric_table import Metrics
+from api.technique.definitions.combined.technique import get_technique_type
+from api.tracer import Tracer
+
+SUMMARY_MODE = "summary"
+QUERY_MODE = "query"
+JSON_LINES_FORMAT = "jsonl"
+CSV_FORMAT = "csv"
+SUMMARY_FIELDS = [
+    "dataset",
+    "technique",
+    "technique_type",
+    "ap",
+    "auc",
+    "lag",
+    "seconds",
+]
+QUERY_FIELDS = SUMMARY_FIELDS[:3] + ["query_id"] + SUMMARY_FIELDS[3:]
+
+Job = Tuple[str, str]  # dataset name, technique definition
+# dataset, technique, metrics and seconds taken
+JobResult = Tuple[str, str, List[Metrics], float]
+Row = Dict[str, object]
+
+# tracer of the current process, keeps loaded datasets between jobs
+_worker_tracer: Optional[Tracer] = None
+
+
+def evaluate_job(
+    job: Job, summary_metrics: bool, cache_config: CacheConfig
+) -> JobResult:
+    """
+    Evaluates technique on dataset, timing the evaluation.
+    :param job: tuple containing the dataset name and technique definition
+    :param summary_metrics: whether to summarize the metrics of all queries
+    :param cache_config: the cache settings used during the evaluation
+    :return: the dataset name, technique definition, resulting metrics and seconds taken
+    """
+    global _worker_tracer  # pylint: disable=global-statement
+    if _worker_tracer is None:
+        _worker_tracer = Tracer()
+    dataset_name, technique_name = job
+    start = time.perf_counter()
+    with Cache.use_config(cache_config):
+        metrics = _worker_tracer.get_metrics(
+            dataset_name, technique_name, summary_metrics=summary_metrics
+        )
+    return dataset_name, technique_name, metrics, time.perf_counter() - start
+
+
+def iterate_results(
+    jobs: List[Job],
+    summary_metrics: bool,
+    n_workers: Optional[int],
+    cache_config: CacheConfig,
+) -> Iterable[JobResult]:
+    """
+    Yields the result of each job as it completes. Jobs run in the current process if n_workers is 1.
+    :param jobs: the evaluations to run
+    :param summary_metrics: whether to summarize the metrics of all queries
+    :param n_workers: the number of worker processes, chosen automatically if None
+    :param cache_config: the cache settings used during the evaluations
+    :return: JobResult per job
+    """
+    if n_workers == 1:
+        for job in jobs:
+            yield evaluate_job(job, summary_metrics, cache_config)
+        return
+    with create_process_pool(n_workers, len(jobs)) as executor:
+        futures = [
+            executor.submit(evaluate_job, job, summary_metrics, cache_config)
+            for job in jobs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def create_rows(result: JobResult, summary_metrics: bool) -> List[Row]:
+    """
+    Returns the output rows of an evaluation. Undefined metrics (NaN) are written as null.
+    :param result: the result of the evaluation
+    :param summary_metrics: whether the metrics are summarized, otherwise a row is created per query
+    :return: list of rows
+    """
+    dataset_name, technique_name, metrics, seconds = result
+    rows = []
+    for query_metrics in metrics:
+        row = {
+            "dataset": dataset_name,
+            "technique": technique_name,
+            "technique_type": get_technique_type(technique_name),
+            "ap": query_metrics.ap,
+            "auc": query_metrics.auc,
+            "lag": query_metrics.lag,
+            "seconds": round(seconds, 6),
+        }
+        if not summary_metrics:
+            row["query_id"] = query_metrics.query_id
+        rows.append(
+            {
+                name: None if isinstance(value, float) and math.isnan(value) else value
+                for name, value in row.items()
+            }
+        )
+    return rows
+
+
+class RowWriter:
+    """
+    Writes rows to a stream as JSON lines or CSV (with a header before the first row), flushing after each write.
+    """
+
+    def __init__(self, stream: TextIO, output_format: str, fields: List[str]):
+        self.stream = stream
+        self.csv_writer = None
+        if output_format == CSV_FORMAT:
+            self.csv_writer = csv.DictWriter(stream, fieldnames=fields)
+            self.csv_writer.writeheader()
+
+    def write(self, rows: List[Row]):
+        """
+        Writes rows to the stream.
+        :param rows: the rows to write
+        :return: None
+        """
+        for row in rows:
+            if self.csv_writer is None:
+                self.stream.write(json.dumps(row) + "\n")
+            else:
+                self.csv_writer.writerow(row)
+        self.stream.flush()
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """
+    Returns the parser of the command line arguments.
+    :return: ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m api",
+        description="Evaluates techniques on datasets and writes their metrics to stdout.",
+    )
+    parser.add_argument("--datasets", nargs="+", required=True)
+    parser.add_argument(
+        "--techniques", nargs="*", default=[], help="technique definitions"
+    )
+    parser.add_argument(
+        "--technique-file", default=None, help="file with a technique per line"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes, 1 evaluates in this process",
+    )
+    parser.add_argument("--cache", choices=["on", "off"], default="off")
+    parser.add_argument(
+        "--mode",
+        choices=[SUMMARY_MODE, QUERY_MODE],
+        default=SUMMARY_MODE,
+        help="a row per evaluation or per query",
+    )
+    parser.add_argument(
+        "--format", choices=[JSON_LINES_FORMAT, CSV_FORMAT], default=JSON_LINES_FORMAT
+    )
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    return parser
+
+
+def main(
+    arguments: Optional[List[str]] = None,
+    stdout: TextIO = sys.stdout,
+    stderr: TextIO = sys.stderr,
+) -> int:
+    """
+    Evaluates the techniques given on the command line, writing rows to stdout and progress to stderr.
+    :param arguments: the command line arguments, read from sys.argv if None
+    :param stdout: where rows are written
+    :param stderr: where progress is written
+    :return: the exit code
+    """
+    parser = create_parser()
+    args = parser.parse_args(arguments)
+    technique_names = read_technique_names(args.techniques, args.technique_file)
+    if len(technique_names) == 0:
+        parser.error("no techniques given, use --techniques or --technique-file")
+
+    summary_metrics = args.mode == SUMMARY_MODE
+    writer = RowWriter(
+        stdout, args.format, SUMMARY_FIELDS if summary_metrics else QUERY_FIELDS
+    )
+    jobs = list(product(args.datasets, technique_names))
+    cache_config = Cache.get_config().with_cache_on(args.cache == "on")
+    results = iterate_results(jobs, summary_metrics, args.workers, cache_config)
+    for n_completed, result in enumerate(results, start=1):
+        writer.write(create_rows(result, summary_metrics))
+        if not args.quiet:
+            dataset_name, technique_name, _, seconds = result
+            stderr.write(
+                "[%d/%d] %s %s %.3fs\n"
+                % (n_completed, len(jobs), dataset_name, technique_name, seconds)
+            )
+            stderr.flush()
+    return 0
@@ -43,3 +43,4 @@ PATH_TO_SOURCE_CODE = os.path.join(PATH_TO_RESOURCES, "SourceCode")
 
 # Cache
 PATH_TO_CACHE_TEMP = os.path.join(PATH_TO_ROOT, "cache")
+PATH_TO_COST_CONSTANTS = os.path.join(PATH_TO_CACHE_TEMP, "cost_constants.json")
@@ -0,0 +1,197 @@
+"""
+The following module is responsible for describing edits to the artifacts and trace links of a dataset (a change
+set) and the resulting changes to the indices of each artifact level.
+"""
+from typing import Dict, List, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArtifactId = Union[str, int]
+LinkChange = Tuple[
+    int, int, int, int
+]  # source level, source index, target level, target index
+
+
+class ChangeSet:
+    """
+    Collects artifacts to add, modify and delete per level and trace links to add and remove. Methods return the
+    change set so that edits can be chained.
+    """
+
+    def __init__(self):
+        self.added_artifacts: Dict[int, List[Tuple[ArtifactId, str]]] = {}
+        self.modified_artifacts: Dict[int, Dict[ArtifactId, str]] = {}
+        self.deleted_artifacts: Dict[int, List[ArtifactId]] = {}
+        self.added_links: List[Tuple[ArtifactId, ArtifactId]] = []
+        self.removed_links: List[Tuple[ArtifactId, ArtifactId]] = []
+
+    def add_artifact(
+        self, level_index: int, artifact_id: ArtifactId, text: str
+    ) -> "ChangeSet":
+        """
+        Adds a new artifact to the end of a level.
+        :param level_index: the index of the level
+        :param artifact_id: the id of the new artifact
+        :param text: the text of the new artifact
+        :return: this change set
+        """
+        self.added_artifacts.setdefault(level_index, []).append((artifact_id, text))
+        return self
+
+    def modify_artifact(
+        self, level_index: int, artifact_id: ArtifactId, text: str
+    ) -> "ChangeSet":
+        """
+        Replaces the text of an existing artifact.
+        :param level_index: the index of the level containing the artifact
+        :param artifact_id: the id of the artifact
+        :param text: the new text of the artifact
+        :return: this change set
+        """
+        self.modified_artifacts.setdefault(level_index, {})[artifact_id] = text
+        return self
+
+    def delete_artifact(self, level_index: int, artifact_id: ArtifactId) -> "ChangeSet":
+        """
+        Removes an artifact along with its trace links.
+        :param level_index: the index of the level containing the artifact
+        :param artifact_id: the id of the artifact
+        :return: this change set
+        """
+        self.deleted_artifacts.setdefault(level_index, []).append(artifact_id)
+        return self
+
+    def add_link(self, source_id: ArtifactId, target_id: ArtifactId) -> "ChangeSet":
+        """
+        Traces two artifacts in different levels. Links are applied after the artifact edits.
+        :param source_id: the id of one artifact
+        :param target_id: the id of the other artifact
+        :return: this change set
+        """
+        self.added_links.append((source_id, target_id))
+        return self
+
+    def remove_link(self, source_id: ArtifactId, target_id: ArtifactId) -> "ChangeSet":
+        """
+        Removes the trace link between two artifacts in different levels.
+        :param source_id: the id of one artifact
+        :param target_id: the id of the other artifact
+        :return: this change set
+        """
+        self.removed_links.append((source_id, target_id))
+        return self
+
+
+class LevelChanges:
+    """
+    Describes how the artifacts of a level changed after applying a change set.
+    """
+
+    def __init__(self, previous_indices: np.ndarray, changed_indices: Set[int]):
+        """
+        :param previous_indices: for each artifact in the level its index before the change, -1 if it was added
+        :param changed_indices: the indices of the artifacts that were added or modified
+        """
+        self.previous_indices = previous_indices
+        self.changed_indices = changed_indices
+
+    def is_reindexed(self) -> bool:
+        """
+        Returns whether artifacts were added to or deleted from the level.
+        :return: bool
+        """
+        return (self.previous_indices != np.arange(len(self.previous_indices))).any()
+
+    def get_kept_indices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the indices of the artifacts that existed before the change.
+        :return: their current indices and their previous indices
+        """
+        current_indices = np.flatnonzero(self.previous_indices >= 0)
+        return current_indices, self.previous_indices[current_indices]
+
+
+class DatasetChanges:  # pylint: disable=too-few-public-methods
+    """
+    Describes how the artifacts and trace links of a dataset changed after applying a change set.
+    """
+
+    def __init__(self, levels: List[LevelChanges], changed_links: List[LinkChange]):
+        """
+        :param levels: the changes of each artifact level
+        :param changed_links: the added and removed trace links in current indices
+        """
+        self.levels = levels
+        self.changed_links = changed_links
+
+
+def apply_artifact_edits(
+    artifact_level: pd.DataFrame, change_set: ChangeSet, level_index: int
+) -> Tuple[pd.DataFrame, LevelChanges]:
+    """
+    Returns the artifact level after deleting, modifying and adding the artifacts in change set.
+    :param artifact_level: the artifacts of the level
+    :param change_set: the edits to apply
+    :param level_index: the index of the level
+    :return: the edited artifact level and the resulting changes to its indices
+    """
+    artifact_ids = list(artifact_level["id"])
+    deleted_ids = change_set.deleted_artifacts.get(level_index, [])
+    modified_artifacts = change_set.modified_artifacts.get(level_index, {})
+    added_artifacts = change_set.added_artifacts.get(level_index, [])
+    for artifact_id in list(deleted_ids) + list(modified_artifacts.keys()):
+        if artifact_id not in artifact_ids:
+            raise ValueError(
+                "Artifact %s does not exist in level %d" % (artifact_id, level_index)
+            )
+
+    is_kept = ~artifact_level["id"].isin(deleted_ids).to_numpy()
+    edited_level = artifact_level[is_kept].reset_index(drop=True)
+    for artifact_id, text in modified_artifacts.items():
+        edited_level.loc[edited_level["id"] == artifact_id, "text"] = text
+    remaining_ids = set(edited_level["id"])
+    for artifact_id, _ in added_artifacts:
+        if artifact_id in remaining_ids:
+            raise ValueError(
+                "Artifact %s already exists in level %d" % (artifact_id, level_index)
+            )
+        remaining_ids.add(artifact_id)
+    if len(added_artifacts) > 0:
+        added_level = pd.DataFrame(added_artifacts, columns=["id", "text"])
+        edited_level = pd.concat([edited_level, added_level], ignore_index=True)
+
+    n_kept = int(is_kept.sum())
+    previous_indices = np.concatenate(
+        [np.flatnonzero(is_kept), np.full(len(added_artifacts), -1)]
+    )
+    modified_ids = set(modified_artifacts.keys())
+    changed_indices = {
+        index
+        for index, artifact_id in enumerate(edited_level["id"])
+        if index >= n_kept or artifact_id in modified_ids
+    }
+    return edited_level, LevelChanges(previous_indices, changed_indices)
+
+
+def reindex_matrix(
+    matrix: np.ndarray, row_changes: LevelChanges, col_changes: LevelChanges
+) -> np.ndarray:
+    """
+    Returns a copy of matrix whose rows and columns follow the current indices of their levels. The entries of
+    added artifacts are zero.
+    :param matrix: matrix between two levels in their previous indices
+    :param row_changes: the changes of the level represented by the rows
+    :param col_changes: the changes of the level represented by the columns
+    :return: the reindexed matrix
+    """
+    current_rows, previous_rows = row_changes.get_kept_indices()
+    current_cols, previous_cols = col_changes.get_kept_indices()
+    reindexed_matrix = np.zeros(
+        (len(row_changes.previous_indices), len(col_changes.previous_indices)),
+        dtype=matrix.dtype,
+    )
+    reindexed_matrix[np.ix_(current_rows, current_cols)] = matrix[
+        np.ix_(previous_rows, previous_cols)
+    ]
+    return reindexed_matrix
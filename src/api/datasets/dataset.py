@@ -1,6 +1,7 @@
 """
 TODO
 """
+import copy
 import os
 from typing import List, Union
 
@@ -9,6 +10,15 @@ import pandas as pd
 
 from api.constants.techniques import ArtifactLevel
 from api.datasets.builder.get_dataset_path import get_path_to_dataset
+from api.datasets.builder.trace_id_map import TraceIdMap
+from api.datasets.change_set import (
+    ArtifactId,
+    ChangeSet,
+    DatasetChanges,
+    LinkChange,
+    apply_artifact_edits,
+    reindex_matrix,
+)
 
 
 class Dataset:
@@ -22,6 +32,7 @@ class Dataset:
 
         self.artifacts: List[ArtifactLevel] = []
         self.traced_matrices = {}  # TODO: rename to traced matrices
+        self.revision = 0  # number of change sets applied since loading
 
         self.load_artifact_levels()
         self.load_trace_matrices()
@@ -113,3 +124,77 @@ class Dataset:
                 artifact_index = int(query.index[0])
                 return level_index, artifact_index
         raise Exception(f"Could not find {artifact_id} in dataset {self.name}.")
+
+    def apply_change_set(self, change_set: ChangeSet) -> DatasetChanges:
+        """
+        Edits the artifacts and trace links of the dataset in memory. The dataset on disk is left untouched, so
+        values calculated on the edited dataset are no longer read from or stored in the cache.
+        :param change_set: the artifacts and trace links to edit
+        :return: the resulting changes to the indices of each level and the edited trace links
+        """
+        edited_levels = [
+            level_index
+            for edits in [
+                change_set.added_artifacts,
+                change_set.modified_artifacts,
+                change_set.deleted_artifacts,
+            ]
+            for level_index in edits.keys()
+        ]
+        for level_index in edited_levels:
+            if not 0 <= level_index < len(self.artifacts):
+                raise ValueError("Level does not exist: %d" % level_index)
+
+        # edits are applied to a copy so that a failing change set leaves the dataset untouched
+        edited_dataset = copy.copy(self)
+        edited_dataset.artifacts = []
+        level_changes = []
+        for level_index, artifact_level in enumerate(self.artifacts):
+            edited_level, changes = apply_artifact_edits(
+                artifact_level, change_set, level_index
+            )
+            edited_dataset.artifacts.append(edited_level)
+            level_changes.append(changes)
+        edited_dataset.traced_matrices = {}
+        for trace_id, trace_matrix in self.traced_matrices.items():
+            upper_level, lower_level = TraceIdMap.parse_trace_id(trace_id)
+            edited_dataset.traced_matrices[trace_id] = reindex_matrix(
+                trace_matrix, level_changes[upper_level], level_changes[lower_level]
+            )
+
+        changed_links = [
+            edited_dataset.set_trace_link(source_id, target_id, 1)
+            for source_id, target_id in change_set.added_links
+        ] + [
+            edited_dataset.set_trace_link(source_id, target_id, 0)
+            for source_id, target_id in change_set.removed_links
+        ]
+        self.artifacts = edited_dataset.artifacts
+        self.traced_matrices = edited_dataset.traced_matrices
+        self.revision += 1
+        return DatasetChanges(level_changes, changed_links)
+
+    def set_trace_link(
+        self, source_id: ArtifactId, target_id: ArtifactId, value: int
+    ) -> LinkChange:
+        """
+        Sets whether two artifacts are traced in every trace matrix between their levels.
+        :param source_id: the id of one artifact
+        :param target_id: the id of the other artifact
+        :param value: 1 if the artifacts are traced, 0 otherwise
+        :return: the levels and indices of the artifacts
+        """
+        source_level, source_index = self.get_artifact_level_index(source_id)
+        target_level, target_index = self.get_artifact_level_index(target_id)
+        trace_id = "%d-%d" % (source_level, target_level)
+        r_trace_id = TraceIdMap.reverse_id(trace_id)
+        if (
+            trace_id not in self.traced_matrices
+            and r_trace_id not in self.traced_matrices
+        ):
+            raise ValueError("No trace matrix exists between levels: %s" % trace_id)
+        if trace_id in self.traced_matrices:
+            self.traced_matrices[trace_id][source_index, target_index] = value
+        if r_trace_id in self.traced_matrices:
+            self.traced_matrices[r_trace_id][target_index, source_index] = value
+        return source_level, source_index, target_level, target_index
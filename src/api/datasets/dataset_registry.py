@@ -0,0 +1,148 @@
+"""
+The following module is responsible for providing a registry of datasets that are loaded on first access and
+evicted in least-recently-used order once their combined memory exceeds a budget.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from api.datasets.dataset import Dataset
+
+DatasetLoader = Callable[[str], Dataset]  # creates dataset with given name
+EvictionCallback = Callable[[Dataset], None]  # called with each evicted dataset
+
+
+def get_dataset_bytes(dataset: Dataset) -> int:
+    """
+    Returns the approximate number of bytes used by the artifacts and trace matrices of dataset.
+    :param dataset: the dataset to measure
+    :return: int
+    """
+    artifact_bytes = sum(
+        int(artifact_level.memory_usage(deep=True).sum())
+        for artifact_level in dataset.artifacts
+    )
+    matrix_bytes = sum(matrix.nbytes for matrix in dataset.traced_matrices.values())
+    return artifact_bytes + matrix_bytes
+
+
+class DatasetRegistry:
+    """
+    Maps dataset names to loaded datasets. The most recently accessed dataset is never evicted, even if it alone
+    exceeds the budget. The registry can be used by concurrent threads: each dataset is loaded by a single thread
+    while threads requesting other datasets proceed.
+    """
+
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        load_dataset: DatasetLoader = Dataset,
+    ):
+        """
+        :param memory_budget: the maximum number of bytes of loaded datasets, unbounded if None
+        :param load_dataset: creates the dataset with given name on first access
+        """
+        self.memory_budget = memory_budget
+        self.load_dataset = load_dataset
+        self.datasets: Dict[str, Dataset] = OrderedDict()  # least recently used first
+        self.dataset_bytes: Dict[str, int] = {}
+        self.eviction_callbacks: List[EvictionCallback] = []
+        self.lock = threading.RLock()  # guards the registered datasets
+        self.load_locks: Dict[str, threading.Lock] = {}  # held while loading dataset
+
+    def get(self, name: str) -> Dataset:
+        """
+        Returns the dataset with given name, loading it if it is not registered.
+        :param name: the name of the dataset
+        :return: Dataset
+        """
+        with self.lock:
+            if name in self.datasets:
+                self.datasets.move_to_end(name)
+                return self.datasets[name]
+            load_lock = self.load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            with self.lock:
+                if name in self.datasets:  # loaded by another thread
+                    self.datasets.move_to_end(name)
+                    return self.datasets[name]
+            dataset = self.load_dataset(name)
+            self.add(dataset)
+            return dataset
+
+    def add(self, dataset: Dataset):
+        """
+        Registers an already loaded dataset as the most recently used one.
+        :param dataset: the dataset to register
+        :return: None
+        """
+        dataset_bytes = get_dataset_bytes(dataset)
+        with self.lock:
+            self.datasets[dataset.name] = dataset
+            self.datasets.move_to_end(dataset.name)
+            self.dataset_bytes[dataset.name] = dataset_bytes
+            self.evict_to_budget()
+
+    def add_eviction_callback(self, callback: EvictionCallback):
+        """
+        Registers function cleaning up data derived from a dataset once it is evicted.
+        :param callback: called with each evicted dataset
+        :return: None
+        """
+        with self.lock:
+            self.eviction_callbacks.append(callback)
+
+    def evict_to_budget(self):
+        """
+        Evicts the least recently used datasets until the registry fits within its budget. Datasets edited by a
+        change set are kept since reloading them would discard their edits.
+        :return: None
+        """
+        if self.memory_budget is None:
+            return
+        with self.lock:
+            while self.get_total_bytes() > self.memory_budget:
+                evictable_names = [
+                    name
+                    for name, dataset in list(self.datasets.items())[:-1]
+                    if dataset.revision == 0
+                ]
+                if len(evictable_names) == 0:
+                    return
+                self.evict(evictable_names[0])
+
+    def evict(self, name: str):
+        """
+        Removes dataset from the registry and cleans up its derived data.
+        :param name: the name of the dataset to evict
+        :return: None
+        """
+        with self.lock:
+            dataset = self.datasets.pop(name)
+            del self.dataset_bytes[name]
+            for callback in self.eviction_callbacks:
+                callback(dataset)
+
+    def get_total_bytes(self) -> int:
+        """
+        Returns the approximate number of bytes used by registered datasets.
+        :return: int
+        """
+        with self.lock:
+            return sum(self.dataset_bytes.values())
+
+    def get_names(self) -> List[str]:
+        """
+        Returns the names of the registered datasets, least recently used first.
+        :return: list of names
+        """
+        with self.lock:
+            return list(self.datasets.keys())
+
+    def __contains__(self, name: str) -> bool:
+        with self.lock:
+            return name in self.datasets
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.datasets)
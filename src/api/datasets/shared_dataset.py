@@ -0,0 +1,128 @@
+"""
+The following module is responsible for publishing loaded datasets to worker processes through shared memory so
+that each worker can access a dataset without reading its artifacts and trace matrices from disk.
+"""
+import pickle
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from api.datasets.dataset import Dataset
+
+MatrixHandle = Tuple[str, Tuple[int, ...], str]  # shared memory name, shape, dtype
+
+
+class SharedDatasetHandle:  # pylint: disable=too-few-public-methods
+    """
+    Picklable description of where the data of a published dataset is located in shared memory.
+    """
+
+    def __init__(
+        self,
+        dataset_name: str,
+        path_to_dataset: str,
+        artifacts_handle: Tuple[str, int],
+        matrix_handles: Dict[str, MatrixHandle],
+        revision: int = 0,
+    ):
+        """
+        :param dataset_name: the name of the dataset
+        :param path_to_dataset: the path to the dataset folder
+        :param artifacts_handle: shared memory name and number of bytes of the pickled artifact levels
+        :param matrix_handles: trace id to the location of its trace matrix
+        :param revision: the number of change sets applied to the dataset
+        """
+        self.dataset_name = dataset_name
+        self.path_to_dataset = path_to_dataset
+        self.artifacts_handle = artifacts_handle
+        self.matrix_handles = matrix_handles
+        self.revision = revision
+
+
+class SharedDataset:
+    """
+    Copies the artifacts and trace matrices of a dataset into shared memory. The blocks are owned by this object and
+    are released on close, so it must outlive every process attached to it.
+    """
+
+    def __init__(self, dataset: Dataset):
+        self.blocks: List[SharedMemory] = []
+        artifacts_bytes = pickle.dumps(dataset.artifacts)
+        artifacts_block = self.create_block(len(artifacts_bytes))
+        artifacts_block.buf[: len(artifacts_bytes)] = artifacts_bytes
+
+        matrix_handles = {}
+        for trace_id, matrix in dataset.traced_matrices.items():
+            matrix_block = self.create_block(matrix.nbytes)
+            shared_matrix = np.ndarray(
+                matrix.shape, dtype=matrix.dtype, buffer=matrix_block.buf
+            )
+            shared_matrix[:] = matrix
+            matrix_handles[trace_id] = (
+                matrix_block.name,
+                matrix.shape,
+                matrix.dtype.str,
+            )
+
+        self.handle = SharedDatasetHandle(
+            dataset.name,
+            dataset.path_to_dataset,
+            (artifacts_block.name, len(artifacts_bytes)),
+            matrix_handles,
+            dataset.revision,
+        )
+
+    def create_block(self, n_bytes: int) -> SharedMemory:
+        """
+        Creates a shared memory block owned by this dataset.
+        :param n_bytes: the size of the block, empty blocks are given a single byte
+        :return: SharedMemory
+        """
+        block = SharedMemory(create=True, size=max(n_bytes, 1))
+        self.blocks.append(block)
+        return block
+
+    def close(self):
+        """
+        Releases the shared memory of the dataset.
+        :return: None
+        """
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def attach_dataset(handle: SharedDatasetHandle) -> Dataset:
+    """
+    Creates a dataset whose trace matrices are views of the shared memory of a published dataset. The returned
+    matrices are read-only and valid as long as the publishing SharedDataset is open.
+    :param handle: the handle of the published dataset
+    :return: Dataset
+    """
+    dataset = Dataset.__new__(Dataset)
+    dataset.name = handle.dataset_name
+    dataset.path_to_dataset = handle.path_to_dataset
+    dataset.revision = handle.revision
+    dataset.shared_blocks = []
+
+    artifacts_name, artifacts_size = handle.artifacts_handle
+    artifacts_block = SharedMemory(name=artifacts_name)
+    dataset.artifacts = pickle.loads(artifacts_block.buf[:artifacts_size])
+    artifacts_block.close()
+
+    dataset.traced_matrices = {}
+    for trace_id, (block_name, shape, dtype) in handle.matrix_handles.items():
+        matrix_block = SharedMemory(name=block_name)
+        matrix = np.ndarray(shape, dtype=np.dtype(dtype), buffer=matrix_block.buf)
+        matrix.flags.writeable = False
+        dataset.traced_matrices[trace_id] = matrix
+        dataset.shared_blocks.append(matrix_block)  # keeps buffers mapped
+    return dataset
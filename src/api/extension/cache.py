@@ -3,21 +3,135 @@ The Cache module is intended to be used to speed up technique calculations. Name
 component similarity matrices that can be reused to avoid redundant calculation. It is beneficial to turn
 on the Cache when calculating a lot of techniques, note, by default caching is turned off.
 
+The size of the cache folder can be bounded by setting Cache.MAX_CACHE_SIZE (in bytes). Once the stored matrices
+exceed this budget the entries chosen by Cache.EVICTION_POLICY are removed. Matrices can optionally be stored
+compressed by setting Cache.STORAGE_CODEC to StorageCodec.NPZ_COMPRESSED.
+
+Besides final similarity matrices, pipelines can store typed intermediate values (e.g. TF-IDF document-term matrices,
+LSI projections) keyed by the pipeline step that produced them and the inputs of that step. Intermediate values count
+towards MAX_CACHE_SIZE and are evicted like similarity matrices.
+
+Lookups, loads and stores of similarity matrices are recorded in Cache.statistics (see CacheStatistics) which can be
+exported via Cache.statistics.to_dict() or to_json() and cleared via Cache.statistics.reset().
+
+The Cache can be used by concurrent threads: its meta-data is guarded by Cache.lock while files are written
+atomically and read without holding the lock. The class attributes (e.g. Cache.CACHE_ON) are the settings shared by
+every thread, a thread can instead use its own settings within Cache.use_config(CacheConfig(...)).
+
 :TODO: create a unique key for item in cache and only delete those so parallel runs do not interfere.
 """
 import os
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Optional, Tuple
+from urllib.parse import quote, unquote
 
 import numpy as np
 import pandas as pd
 
 from api.constants.paths import PATH_TO_CACHE_TEMP
 from api.datasets.dataset import Dataset
+from api.extension.cache_policies import EvictionPolicy, StorageCodec
+from api.extension.cache_statistics import CacheStatistics, get_technique_type
+from api.extension.intermediates import (
+    IntermediateType,
+    load_intermediate,
+    save_intermediate,
+)
 from api.technique.parser.itechnique_definition import ITechniqueDefinition
 from api.technique.variationpoints.algebraicmodel.models import SimilarityMatrix
 
-CACHE_COLUMNS = ["dataset", "technique", "file_name"]
+CACHE_COLUMNS = [
+    "dataset",
+    "technique",
+    "file_name",
+    "size",
+    "last_accessed",
+    "n_accesses",
+]
 DEFAULT_IS_CACHE_ENABLED = False
+DEFAULT_MAX_CACHE_SIZE = None  # no limit on the number of bytes stored
+DEFAULT_EVICTION_POLICY = EvictionPolicy.LRU
+DEFAULT_STORAGE_CODEC = StorageCodec.NPY
+COMPRESSED_MATRIX_KEY = "similarity_matrix"
+CACHE_FILE_EXTENSIONS = [codec.value for codec in StorageCodec]
+INTERMEDIATES_FOLDER = "intermediates"
+# prefixes the technique column of intermediate entries
+INTERMEDIATE_PREFIX = "intermediate:"
+# separates the dataset name from the rest of a cache file name
+FILE_NAME_SEPARATOR = "_"
+
+
+class CacheConfig:  # pylint: disable=too-few-public-methods
+    """
+    Settings of the Cache used by the threads running within Cache.use_config (see Cache class attributes).
+    """
+
+    def __init__(
+        self,
+        cache_on: bool = DEFAULT_IS_CACHE_ENABLED,
+        max_cache_size: Optional[int] = DEFAULT_MAX_CACHE_SIZE,
+        eviction_policy: EvictionPolicy = DEFAULT_EVICTION_POLICY,
+        storage_codec: StorageCodec = DEFAULT_STORAGE_CODEC,
+    ):
+        """
+        :param cache_on: whether similarity matrices are read from and stored in the cache
+        :param max_cache_size: the maximum number of bytes stored, unbounded if None
+        :param eviction_policy: the order in which entries are removed once over budget
+        :param storage_codec: the file format of stored similarity matrices
+        """
+        self.cache_on = cache_on
+        self.max_cache_size = max_cache_size
+        self.eviction_policy = eviction_policy
+        self.storage_codec = storage_codec
+
+    def with_cache_on(self, cache_on: bool) -> "CacheConfig":
+        """
+        Returns a copy of these settings in which the cache is turned on or off.
+        :param cache_on: whether similarity matrices are read from and stored in the cache
+        :return: CacheConfig
+        """
+        return CacheConfig(
+            cache_on, self.max_cache_size, self.eviction_policy, self.storage_codec
+        )
+
+
+def get_temporary_path(path_to_file: str) -> str:
+    """
+    Returns a hidden path next to given file, unique to the current process and thread, keeping its extension so
+    that a file can be written there and then renamed to path.
+    :param path_to_file: the final path of the file
+    :return: str
+    """
+    folder, file_name = os.path.split(path_to_file)
+    return os.path.join(
+        folder, ".%d-%d-%s" % (os.getpid(), threading.get_ident(), file_name)
+    )
+
+
+def get_cache_file_name(dataset_name: str, entry_name: str) -> str:
+    """
+    Returns the name of the cache file of an entry. The dataset name is percent-encoded (including the separator)
+    so that dataset names containing the separator can be recovered by parse_cache_file_name.
+    :param dataset_name: the name of the dataset the entry was calculated on
+    :param entry_name: the technique name or the intermediate step and key of the entry
+    :return: str
+    """
+    encoded_dataset_name = quote(dataset_name, safe="").replace(
+        FILE_NAME_SEPARATOR, "%%%02X" % ord(FILE_NAME_SEPARATOR)
+    )
+    return encoded_dataset_name + FILE_NAME_SEPARATOR + entry_name
+
+
+def parse_cache_file_name(file_name: str) -> Tuple[str, str]:
+    """
+    Returns the dataset name and entry name encoded in a cache file name, see get_cache_file_name.
+    :param file_name: the name of the file without its folder
+    :return: tuple containing the dataset name and the entry name
+    """
+    encoded_dataset_name, _, entry_name = file_name.partition(FILE_NAME_SEPARATOR)
+    return unquote(encoded_dataset_name), entry_name
 
 
 def load_previous_caches(path_to_data: str) -> pd.DataFrame:
@@ -28,18 +142,40 @@ def load_previous_caches(path_to_data: str) -> pd.DataFrame:
     """
     previous_caches_df = pd.DataFrame(columns=CACHE_COLUMNS)
     for file_name in os.listdir(path_to_data):
-        if file_name[0] == ".":
+        if file_name[0] == "." or file_name[-4:] not in CACHE_FILE_EXTENSIONS:
             continue
         path_to_file = os.path.join(path_to_data, file_name)
-        file_parts = file_name.split("_")
-        dataset = file_parts[0]
-        technique_name = "_".join(file_parts[1:])[:-4]  # removes .npy
+        dataset, technique_name = parse_cache_file_name(
+            file_name[:-4]
+        )  # removes .npy or .npz
+        file_stats = os.stat(path_to_file)
         entry = {
             "dataset": dataset,
             "technique": technique_name,
             "file_name": path_to_file,
+            "size": file_stats.st_size,
+            "last_accessed": max(file_stats.st_atime, file_stats.st_mtime),
+            "n_accesses": 0,
         }
         previous_caches_df = previous_caches_df.append(entry, ignore_index=True)
+
+    path_to_intermediates = os.path.join(path_to_data, INTERMEDIATES_FOLDER)
+    if os.path.isdir(path_to_intermediates):
+        for file_name in os.listdir(path_to_intermediates):
+            if file_name[0] == ".":
+                continue
+            path_to_file = os.path.join(path_to_intermediates, file_name)
+            dataset, entry_name = parse_cache_file_name(file_name)
+            file_stats = os.stat(path_to_file)
+            entry = {
+                "dataset": dataset,
+                "technique": INTERMEDIATE_PREFIX + entry_name,
+                "file_name": path_to_file,
+                "size": file_stats.st_size,
+                "last_accessed": max(file_stats.st_atime, file_stats.st_mtime),
+                "n_accesses": 0,
+            }
+            previous_caches_df = previous_caches_df.append(entry, ignore_index=True)
     return previous_caches_df
 
 
@@ -57,8 +193,46 @@ class Cache:
     """
 
     CACHE_ON = DEFAULT_IS_CACHE_ENABLED
+    MAX_CACHE_SIZE: Optional[int] = DEFAULT_MAX_CACHE_SIZE
+    EVICTION_POLICY: EvictionPolicy = DEFAULT_EVICTION_POLICY
+    STORAGE_CODEC: StorageCodec = DEFAULT_STORAGE_CODEC
     path_to_memory = PATH_TO_CACHE_TEMP
     stored_similarities_df = load_previous_caches(path_to_memory)
+    statistics = CacheStatistics()
+    lock = threading.RLock()  # guards stored_similarities_df
+    thread_state = threading.local()  # settings of threads running within use_config
+
+    @staticmethod
+    def get_config() -> CacheConfig:
+        """
+        Returns the settings used by the current thread.
+        :return: CacheConfig
+        """
+        config = getattr(Cache.thread_state, "config", None)
+        if config is not None:
+            return config
+        return CacheConfig(
+            Cache.CACHE_ON,
+            Cache.MAX_CACHE_SIZE,
+            Cache.EVICTION_POLICY,
+            Cache.STORAGE_CODEC,
+        )
+
+    @staticmethod
+    @contextmanager
+    def use_config(config: Optional[CacheConfig]):
+        """
+        Makes the current thread use given settings instead of the class attributes until the block exits.
+        :param config: the settings to use, the current settings are kept if None
+        :return: None
+        """
+        previous_config = getattr(Cache.thread_state, "config", None)
+        if config is not None:
+            Cache.thread_state.config = config
+        try:
+            yield
+        finally:
+            Cache.thread_state.config = previous_config
 
     @staticmethod
     def reload():
@@ -66,7 +240,9 @@ class Cache:
         Reads cache folder and reloads the DataFrame storing the meta-data for each item.
         :return:
         """
-        Cache.stored_similarities_df = load_previous_caches(Cache.path_to_memory)
+        stored_similarities_df = load_previous_caches(Cache.path_to_memory)
+        with Cache.lock:
+            Cache.stored_similarities_df = stored_similarities_df
 
     @staticmethod
     def query(dataset: Dataset, technique: ITechniqueDefinition) -> pd.DataFrame:
@@ -76,11 +252,23 @@ class Cache:
         :param technique: The technique whose SimilarityMatrix we are querying for.
         :return: DataFrame
         """
-        assert Cache.CACHE_ON
-        return Cache.stored_similarities_df[
-            (Cache.stored_similarities_df["dataset"] == dataset.name)
-            & (Cache.stored_similarities_df["technique"] == technique.get_name())
-        ]
+        assert Cache.get_config().cache_on
+        with Cache.lock:
+            stored_similarities_df = Cache.stored_similarities_df
+            return stored_similarities_df[
+                (stored_similarities_df["dataset"] == dataset.name)
+                & (stored_similarities_df["technique"] == technique.get_name())
+            ]
+
+    @staticmethod
+    def is_dataset_cacheable(dataset: Dataset) -> bool:
+        """
+        Returns whether values calculated on dataset can be read from and stored in the cache. Datasets modified
+        in memory by a change set no longer match the dataset on disk that cached values are keyed by.
+        :param dataset: the dataset whose values are cached
+        :return: bool
+        """
+        return Cache.get_config().cache_on and dataset.revision == 0
 
     @staticmethod
     def is_cached(dataset: Dataset, technique: ITechniqueDefinition):
@@ -90,10 +278,14 @@ class Cache:
         :param technique: the technique of producing the potentially stored similarity matrix on given dataset
         :return:
         """
-        if not Cache.CACHE_ON:
+        if not Cache.is_dataset_cacheable(dataset):
             return False
-        query = Cache.query(dataset, technique)
-        return len(query) == 1
+        with Cache.lock:
+            is_hit = len(Cache.query(dataset, technique)) == 1
+            Cache.statistics.record_lookup(
+                dataset.name, get_technique_type(technique), is_hit
+            )
+        return is_hit
 
     @staticmethod
     def store_similarities(
@@ -109,41 +301,251 @@ class Cache:
         :return:
         """
         assert isinstance(similarity_matrix, np.ndarray), type(similarity_matrix)
-        if not Cache.CACHE_ON:
+        if not Cache.is_dataset_cacheable(dataset):
             return
-        file_name = "_".join([dataset.name, technique.get_name()])
-        export_path = os.path.join(Cache.path_to_memory, file_name) + ".npy"
-        np.save(export_path, similarity_matrix)
+        config = Cache.get_config()
+        start = time.perf_counter()
+        file_name = get_cache_file_name(dataset.name, technique.get_name())
+        export_path = os.path.join(Cache.path_to_memory, file_name)
+        export_path = export_path + config.storage_codec.value
+        temporary_path = get_temporary_path(export_path)
+        if config.storage_codec == StorageCodec.NPZ_COMPRESSED:
+            np.savez_compressed(
+                temporary_path, **{COMPRESSED_MATRIX_KEY: similarity_matrix}
+            )
+        else:
+            np.save(temporary_path, similarity_matrix)
+        file_size = os.path.getsize(temporary_path)
 
-        entry = {
-            "dataset": dataset.name,
-            "technique": technique.get_name(),
-            "file_name": export_path,
-        }
-        if not Cache.is_cached(dataset, technique):
+        with Cache.lock:
+            os.replace(temporary_path, export_path)
+            Cache.statistics.record_store(
+                dataset.name,
+                get_technique_type(technique),
+                file_size,
+                time.perf_counter() - start,
+            )
+            previous_entries = Cache.query(dataset, technique)
+            if len(previous_entries) > 0:
+                Cache.remove_entries(previous_entries, keep_file_name=export_path)
+            entry = {
+                "dataset": dataset.name,
+                "technique": technique.get_name(),
+                "file_name": export_path,
+                "size": file_size,
+                "last_accessed": time.time(),
+                "n_accesses": 0,
+            }
             Cache.stored_similarities_df = Cache.stored_similarities_df.append(
                 entry, ignore_index=True
             )
+            Cache.enforce_budget(keep_file_name=export_path)
 
     @staticmethod
     def get_similarities(
         dataset: Dataset, technique: ITechniqueDefinition
-    ) -> SimilarityMatrix:
+    ) -> Optional[SimilarityMatrix]:
         """
-        Returns similarity matrix for given technique on given Dataset
+        Returns similarity matrix for given technique on given Dataset. The file is read without holding the lock so
+        other threads can use the cache meanwhile.
         :param dataset: dataset whose artifacts to compare
         :param technique: definition describing how to produce the similarity values
-        :return: numpy.ndarray containing similarity values
+        :return: numpy.ndarray containing similarity values, None if the entry was evicted by another thread
         """
-        assert Cache.is_cached(dataset, technique), (
-            "given technique has not been cached: %s" % technique.get_name()
-        )
-        assert Cache.CACHE_ON
-        query = Cache.query(dataset, technique)
-        file_name = query.iloc[0]["file_name"]
-        loaded_matrix = np.load(file_name, allow_pickle=True)
+        assert Cache.get_config().cache_on
+        with Cache.lock:
+            query = Cache.query(dataset, technique)
+            if len(query) == 0:
+                return None  # evicted by another thread since the lookup
+            file_name = query.iloc[0]["file_name"]
+            file_size = int(query.iloc[0]["size"])
+
+        start = time.perf_counter()
+        try:
+            loaded_matrix = np.load(file_name, allow_pickle=True)
+            if file_name.endswith(StorageCodec.NPZ_COMPRESSED.value):
+                with loaded_matrix as compressed_file:
+                    loaded_matrix = compressed_file[COMPRESSED_MATRIX_KEY]
+            os.utime(file_name)  # persists access time for other processes
+        except FileNotFoundError:
+            return None  # evicted by another thread while loading
+        with Cache.lock:
+            Cache.statistics.record_load(
+                dataset.name,
+                get_technique_type(technique),
+                file_size,
+                time.perf_counter() - start,
+            )
+            stored_similarities_df = Cache.stored_similarities_df
+            is_entry = stored_similarities_df["file_name"] == file_name
+            stored_similarities_df.loc[is_entry, "last_accessed"] = time.time()
+            stored_similarities_df.loc[is_entry, "n_accesses"] += 1
         return loaded_matrix
 
+    @staticmethod
+    def get_size() -> int:
+        """
+        Returns the total number of bytes used by the files stored in the cache.
+        :return: int
+        """
+        with Cache.lock:
+            return int(Cache.stored_similarities_df["size"].sum())
+
+    @staticmethod
+    def enforce_budget(keep_file_name: Optional[str] = None):
+        """
+        Removes entries in the order defined by the eviction policy until the cache fits in MAX_CACHE_SIZE.
+        :param keep_file_name: path to a file that should never be evicted (e.g. the one just stored)
+        :return: None
+        """
+        config = Cache.get_config()
+        with Cache.lock:
+            if (
+                config.max_cache_size is None
+                or Cache.get_size() <= config.max_cache_size
+            ):
+                return
+            sort_columns = {
+                EvictionPolicy.LRU: ["last_accessed"],
+                EvictionPolicy.LFU: ["n_accesses", "last_accessed"],
+            }[config.eviction_policy]
+            candidates = Cache.stored_similarities_df.sort_values(by=sort_columns)
+            candidates = candidates[candidates["file_name"] != keep_file_name]
+
+            bytes_over_budget = Cache.get_size() - config.max_cache_size
+            n_entries_to_evict = 0
+            for entry_size in candidates["size"]:
+                if bytes_over_budget <= 0:
+                    break
+                bytes_over_budget = bytes_over_budget - entry_size
+                n_entries_to_evict = n_entries_to_evict + 1
+            Cache.remove_entries(candidates.iloc[:n_entries_to_evict])
+
+    @staticmethod
+    def remove_entries(entries: pd.DataFrame, keep_file_name: Optional[str] = None):
+        """
+        Deletes the files of given cache entries and removes them from the cache meta-data.
+        :param entries: subset of rows in stored_similarities_df
+        :param keep_file_name: path to a file that is removed from the meta-data but not deleted
+        :return: None
+        """
+        with Cache.lock:
+            for file_name in entries["file_name"]:
+                if file_name != keep_file_name and os.path.exists(file_name):
+                    os.remove(file_name)
+            Cache.stored_similarities_df = Cache.stored_similarities_df.drop(
+                index=entries.index
+            )
+
+    @staticmethod
+    def get_path_to_intermediate(
+        dataset: Dataset, step_name: str, key: str, entry_type: IntermediateType
+    ) -> str:
+        """
+        Returns the path to the file storing the intermediate value of given pipeline step.
+        :param dataset: the dataset the step was applied to
+        :param step_name: the name of the pipeline step producing the value
+        :param key: identifies the inputs of the step (e.g. the artifact levels compared)
+        :param entry_type: the type of the value stored
+        :return: str - path to file
+        """
+        file_name = get_cache_file_name(
+            dataset.name, "_".join([step_name, key]) + entry_type.value
+        )
+        return os.path.join(Cache.path_to_memory, INTERMEDIATES_FOLDER, file_name)
+
+    @staticmethod
+    def is_intermediate_cached(
+        dataset: Dataset, step_name: str, key: str, entry_type: IntermediateType
+    ) -> bool:
+        """
+        Returns whether the intermediate value of given pipeline step has been cached for given dataset.
+        :param dataset: the dataset the step was applied to
+        :param step_name: the name of the pipeline step producing the value
+        :param key: identifies the inputs of the step
+        :param entry_type: the type of the value stored
+        :return: bool
+        """
+        if not Cache.is_dataset_cacheable(dataset):
+            return False
+        return os.path.isfile(
+            Cache.get_path_to_intermediate(dataset, step_name, key, entry_type)
+        )
+
+    @staticmethod
+    def store_intermediate(
+        dataset: Dataset,
+        step_name: str,
+        key: str,
+        value: Any,
+        entry_type: IntermediateType,
+    ):
+        """
+        Stores the intermediate value of given pipeline step, overwriting any previous value.
+        :param dataset: the dataset the step was applied to
+        :param step_name: the name of the pipeline step producing the value
+        :param key: identifies the inputs of the step
+        :param value: the value to store
+        :param entry_type: the type of the value determining how it is stored
+        :return: None
+        """
+        if not Cache.is_dataset_cacheable(dataset):
+            return
+        path_to_intermediates = os.path.join(Cache.path_to_memory, INTERMEDIATES_FOLDER)
+        os.makedirs(path_to_intermediates, exist_ok=True)
+        path_to_file = Cache.get_path_to_intermediate(
+            dataset, step_name, key, entry_type
+        )
+        temporary_path = get_temporary_path(path_to_file)
+        save_intermediate(temporary_path, value, entry_type)
+        file_size = os.path.getsize(temporary_path)
+
+        with Cache.lock:
+            os.replace(temporary_path, path_to_file)  # readers never see a partial file
+            stored_similarities_df = Cache.stored_similarities_df
+            Cache.stored_similarities_df = stored_similarities_df[
+                stored_similarities_df["file_name"] != path_to_file
+            ]
+            entry = {
+                "dataset": dataset.name,
+                "technique": INTERMEDIATE_PREFIX
+                + parse_cache_file_name(os.path.basename(path_to_file))[1],
+                "file_name": path_to_file,
+                "size": file_size,
+                "last_accessed": time.time(),
+                "n_accesses": 0,
+            }
+            Cache.stored_similarities_df = Cache.stored_similarities_df.append(
+                entry, ignore_index=True
+            )
+            Cache.enforce_budget(keep_file_name=path_to_file)
+
+    @staticmethod
+    def get_intermediate(
+        dataset: Dataset, step_name: str, key: str, entry_type: IntermediateType
+    ) -> Any:
+        """
+        Returns the cached intermediate value of given pipeline step.
+        :param dataset: the dataset the step was applied to
+        :param step_name: the name of the pipeline step producing the value
+        :param key: identifies the inputs of the step
+        :param entry_type: the type of the value stored
+        :return: the stored value
+        """
+        assert Cache.is_intermediate_cached(
+            dataset, step_name, key, entry_type
+        ), "intermediate has not been cached: %s %s" % (step_name, key)
+        path_to_file = Cache.get_path_to_intermediate(
+            dataset, step_name, key, entry_type
+        )
+        value = load_intermediate(path_to_file, entry_type)
+        with Cache.lock:
+            stored_similarities_df = Cache.stored_similarities_df
+            is_entry = stored_similarities_df["file_name"] == path_to_file
+            stored_similarities_df.loc[is_entry, "last_accessed"] = time.time()
+            stored_similarities_df.loc[is_entry, "n_accesses"] += 1
+        return value
+
     @staticmethod
     def cleanup(dataset_name: Optional[str] = None):
         """
@@ -153,12 +555,27 @@ class Cache:
         :param dataset_name:
         :return: None
         """
-        for _, row in Cache.stored_similarities_df.iterrows():
-            dataset, _, file_name = row
-            if dataset == dataset_name or dataset_name is None:
-                if os.path.exists(file_name):
-                    os.remove(file_name)
+        with Cache.lock:
+            for _, row in Cache.stored_similarities_df.iterrows():
+                dataset, file_name = row["dataset"], row["file_name"]
+                if dataset == dataset_name or dataset_name is None:
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+
+            path_to_intermediates = os.path.join(
+                Cache.path_to_memory, INTERMEDIATES_FOLDER
+            )
+            if os.path.isdir(path_to_intermediates):
+                for file_name in os.listdir(path_to_intermediates):
+                    if (
+                        dataset_name is None
+                        or parse_cache_file_name(file_name)[0] == dataset_name
+                    ):
+                        os.remove(os.path.join(path_to_intermediates, file_name))
 
-        Cache.stored_similarities_df = Cache.stored_similarities_df[
-            (Cache.stored_similarities_df["dataset"] != dataset_name)
-        ]
+            if dataset_name is None:
+                Cache.stored_similarities_df = pd.DataFrame(columns=CACHE_COLUMNS)
+            else:
+                Cache.stored_similarities_df = Cache.stored_similarities_df[
+                    (Cache.stored_similarities_df["dataset"] != dataset_name)
+                ]
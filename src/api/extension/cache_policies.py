@@ -0,0 +1,22 @@
+"""
+The following module contains the policies that control how the Cache stores and evicts its entries.
+"""
+from enum import Enum
+
+
+class EvictionPolicy(Enum):
+    """
+    The order in which cached entries are removed once the cache exceeds its size budget.
+    """
+
+    LRU = "LRU"  # least recently used entries are removed first
+    LFU = "LFU"  # least frequently used entries are removed first
+
+
+class StorageCodec(Enum):
+    """
+    The file format used to store similarity matrices in the cache. Values are the file extensions.
+    """
+
+    NPY = ".npy"
+    NPZ_COMPRESSED = ".npz"
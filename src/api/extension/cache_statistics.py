@@ -0,0 +1,206 @@
+"""
+The following module records how the Cache is used (hits, misses, load and store latencies, and bytes transferred)
+so that one can verify whether caching benefits an experiment. Measurements are broken down by dataset and by
+technique type.
+"""
+import json
+import threading
+from typing import Dict, List, Tuple
+
+LATENCY_BUCKETS = [
+    0.001,
+    0.01,
+    0.1,
+    1,
+    10,
+]  # upper bounds in seconds, last bucket is unbounded
+COUNTER_NAMES = ["hits", "misses", "n_loads", "n_stores", "bytes_read", "bytes_written"]
+HISTOGRAM_NAMES = ["load_latency", "store_latency"]
+
+
+def get_technique_type(technique) -> str:
+    """
+    Returns the type of given technique definition (e.g. Direct, Transitive, Hybrid).
+    :param technique: ITechniqueDefinition
+    :return: str
+    """
+    return type(technique).__name__.replace("TechniqueDefinition", "")
+
+
+def get_bucket_labels() -> List[str]:
+    """
+    Returns the labels of the latency histogram buckets.
+    :return: list of str
+    """
+    return ["<=%gs" % bound for bound in LATENCY_BUCKETS] + [
+        ">%gs" % LATENCY_BUCKETS[-1]
+    ]
+
+
+def get_bucket_index(seconds: float) -> int:
+    """
+    Returns the index of the latency histogram bucket containing given duration.
+    :param seconds: the duration measured
+    :return: int
+    """
+    for bucket_index, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return bucket_index
+    return len(LATENCY_BUCKETS)
+
+
+def create_empty_measurements() -> Dict:
+    """
+    Returns a measurement record with all counters and histogram buckets at zero.
+    :return: dict
+    """
+    measurements = {counter_name: 0 for counter_name in COUNTER_NAMES}
+    for histogram_name in HISTOGRAM_NAMES:
+        measurements[histogram_name] = [0] * (len(LATENCY_BUCKETS) + 1)
+    return measurements
+
+
+def add_measurements(total: Dict, measurements: Dict):
+    """
+    Adds the counters and histograms of given measurements into total.
+    :param total: the record being accumulated into
+    :param measurements: the record to add
+    :return: None
+    """
+    for counter_name in COUNTER_NAMES:
+        total[counter_name] += measurements[counter_name]
+    for histogram_name in HISTOGRAM_NAMES:
+        total[histogram_name] = [
+            a + b for a, b in zip(total[histogram_name], measurements[histogram_name])
+        ]
+
+
+def export_measurements(measurements: Dict) -> Dict:
+    """
+    Returns a JSON-serializable copy of given measurements including the hit rate and labeled histograms.
+    :param measurements: the record to export
+    :return: dict
+    """
+    n_lookups = measurements["hits"] + measurements["misses"]
+    exported = {
+        counter_name: measurements[counter_name] for counter_name in COUNTER_NAMES
+    }
+    exported["hit_rate"] = measurements["hits"] / n_lookups if n_lookups > 0 else None
+    for histogram_name in HISTOGRAM_NAMES:
+        exported[histogram_name] = dict(
+            zip(get_bucket_labels(), measurements[histogram_name])
+        )
+    return exported
+
+
+class CacheStatistics:
+    """
+    Accumulates the measurements of cache operations keyed by dataset name and technique type. Measurements may be
+    recorded and read by concurrent threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.measurements: Dict[Tuple[str, str], Dict] = {}
+
+    def reset(self):
+        """
+        Removes all measurements, e.g. between experiments.
+        :return: None
+        """
+        with self.lock:
+            self.measurements = {}
+
+    def get_measurements(self, dataset_name: str, technique_type: str) -> Dict:
+        """
+        Returns the measurement record for given dataset and technique type, creating it if needed.
+        :param dataset_name: the name of the dataset
+        :param technique_type: the type of technique
+        :return: dict
+        """
+        key = (dataset_name, technique_type)
+        with self.lock:
+            if key not in self.measurements:
+                self.measurements[key] = create_empty_measurements()
+            return self.measurements[key]
+
+    def record_lookup(self, dataset_name: str, technique_type: str, is_hit: bool):
+        """
+        Records whether a lookup in the cache found a stored similarity matrix.
+        :param dataset_name: the name of the dataset looked up
+        :param technique_type: the type of technique looked up
+        :param is_hit: whether the similarity matrix was cached
+        :return: None
+        """
+        counter_name = "hits" if is_hit else "misses"
+        with self.lock:
+            self.get_measurements(dataset_name, technique_type)[counter_name] += 1
+
+    def record_load(
+        self, dataset_name: str, technique_type: str, n_bytes: int, seconds: float
+    ):
+        """
+        Records the reading of a similarity matrix from the cache.
+        :param dataset_name: the name of the dataset
+        :param technique_type: the type of technique
+        :param n_bytes: the size of the file read
+        :param seconds: the time taken to read the file
+        :return: None
+        """
+        with self.lock:
+            measurements = self.get_measurements(dataset_name, technique_type)
+            measurements["n_loads"] += 1
+            measurements["bytes_read"] += n_bytes
+            measurements["load_latency"][get_bucket_index(seconds)] += 1
+
+    def record_store(
+        self, dataset_name: str, technique_type: str, n_bytes: int, seconds: float
+    ):
+        """
+        Records the writing of a similarity matrix to the cache.
+        :param dataset_name: the name of the dataset
+        :param technique_type: the type of technique
+        :param n_bytes: the size of the file written
+        :param seconds: the time taken to write the file
+        :return: None
+        """
+        with self.lock:
+            measurements = self.get_measurements(dataset_name, technique_type)
+            measurements["n_stores"] += 1
+            measurements["bytes_written"] += n_bytes
+            measurements["store_latency"][get_bucket_index(seconds)] += 1
+
+    def to_dict(self) -> Dict:
+        """
+        Returns a snapshot of the measurements containing the totals and their breakdown by dataset and technique type.
+        :return: dict
+        """
+        total = create_empty_measurements()
+        by_dataset, by_technique_type = {}, {}
+        with self.lock:
+            for (
+                dataset_name,
+                technique_type,
+            ), measurements in self.measurements.items():
+                add_measurements(total, measurements)
+                for group, group_key in [
+                    (by_dataset, dataset_name),
+                    (by_technique_type, technique_type),
+                ]:
+                    if group_key not in group:
+                        group[group_key] = create_empty_measurements()
+                    add_measurements(group[group_key], measurements)
+        return {
+            "total": export_measurements(total),
+            "by_dataset": {k: export_measurements(v) for k, v in by_dataset.items()},
+            "by_technique_type": {
+                k: export_measurements(v) for k, v in by_technique_type.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns the snapshot of the measurements as a JSON string.
+        :return: str
+        """
+        return json.dumps(self.to_dict(), indent=4)
@@ -7,6 +7,7 @@ import os
 
 import re
 import shutil
+from typing import List, Optional
 
 DEFAULT_DELIMITERS = ["\n"]
 
@@ -124,3 +125,23 @@ def list_to_string(lst: [str]) -> str:
             elem_str = repr(elem)
         result = "%s %s" % (result, elem_str)
     return "(%s)" % result.strip()
+
+
+def read_technique_names(
+    technique_names: List[str], technique_file: Optional[str]
+) -> List[str]:
+    """
+    Returns the techniques given inline followed by those in the technique file, one definition per line. Empty
+    lines and lines starting with # are ignored.
+    :param technique_names: technique definitions given inline
+    :param technique_file: path to the file of technique definitions, ignored if None
+    :return: list of technique definitions
+    """
+    technique_names = list(technique_names)
+    if technique_file is not None:
+        with open(technique_file, "r") as file:
+            for line in file:
+                line = line.strip()
+                if len(line) > 0 and not line.startswith("#"):
+                    technique_names.append(line)
+    return technique_names
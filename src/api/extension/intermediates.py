@@ -0,0 +1,65 @@
+"""
+The following module defines the types of intermediate values (e.g. vocabularies, document-term matrices) that
+technique pipelines can store in the Cache alongside the final similarity matrices.
+"""
+import json
+from enum import Enum
+from typing import Any
+
+import numpy as np
+from scipy.sparse import load_npz, save_npz
+
+
+class IntermediateType(Enum):
+    """
+    The types of intermediate values that can be stored in the cache. Values are the file extensions.
+    """
+
+    SPARSE_MATRIX = ".sparse.npz"  # e.g. TF-IDF document-term matrices
+    SVD_FACTORS = ".svd.npz"  # named dense matrices (e.g. LSI projections)
+    DENSE_MATRICES = ".dense.npz"  # list of dense matrices (e.g. scaled components)
+    VOCABULARY = ".vocab.json"  # mapping of terms to their column index
+
+
+def save_intermediate(path_to_file: str, value: Any, entry_type: IntermediateType):
+    """
+    Writes given value to path using the storage format of its type.
+    :param path_to_file: where to store the value, must end with the extension of entry_type
+    :param value: the intermediate value to store
+    :param entry_type: the type of the value determining how it is stored
+    :return: None
+    """
+    if entry_type == IntermediateType.SPARSE_MATRIX:
+        save_npz(path_to_file, value)
+    elif entry_type == IntermediateType.SVD_FACTORS:
+        np.savez(path_to_file, **value)
+    elif entry_type == IntermediateType.DENSE_MATRICES:
+        np.savez(path_to_file, *value)
+    elif entry_type == IntermediateType.VOCABULARY:
+        with open(path_to_file, "w") as vocab_file:
+            json.dump({term: int(index) for term, index in value.items()}, vocab_file)
+    else:
+        raise ValueError("Unrecognized intermediate type: %s" % entry_type)
+
+
+def load_intermediate(path_to_file: str, entry_type: IntermediateType) -> Any:
+    """
+    Reads the value stored at given path using the storage format of its type.
+    :param path_to_file: the path to the stored value
+    :param entry_type: the type of the value determining how it was stored
+    :return: the intermediate value
+    """
+    if entry_type == IntermediateType.SPARSE_MATRIX:
+        return load_npz(path_to_file)
+    if entry_type == IntermediateType.SVD_FACTORS:
+        with np.load(path_to_file) as stored_factors:
+            return {name: stored_factors[name] for name in stored_factors.files}
+    if entry_type == IntermediateType.DENSE_MATRICES:
+        with np.load(path_to_file) as stored_matrices:
+            return [
+                stored_matrices["arr_%d" % i] for i in range(len(stored_matrices.files))
+            ]
+    if entry_type == IntermediateType.VOCABULARY:
+        with open(path_to_file, "r") as vocab_file:
+            return json.load(vocab_file)
+    raise ValueError("Unrecognized intermediate type: %s" % entry_type)
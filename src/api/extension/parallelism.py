@@ -0,0 +1,115 @@
+"""
+The Parallelism module coordinates the threads used by sklearn (n_jobs) and the BLAS libraries of numpy and scipy
+with the worker processes of batch runners. By default every library uses all cores of the machine, so a pool of
+worker processes on top of them oversubscribes the machine with threads. Batch runners therefore split the cores
+between worker processes (create_process_pool) and limit the threads of each worker to its share.
+
+The threads of the current process can be limited by calling Parallelism.set_thread_limit(n_threads).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from threadpoolctl import threadpool_limits
+
+DEFAULT_N_JOBS = -1  # sklearn uses every core
+
+
+class Parallelism:
+    """
+    Stores the number of threads the libraries of the current process are allowed to use.
+    """
+
+    N_JOBS = DEFAULT_N_JOBS
+    BLAS_THREADS: Optional[int] = None  # threads of numpy and scipy, unlimited if None
+    thread_limiter: Optional[
+        threadpool_limits
+    ] = None  # restores the limits in place before set_thread_limit
+
+    @staticmethod
+    def get_n_jobs() -> int:
+        """
+        Returns the n_jobs passed to sklearn functions.
+        :return: int
+        """
+        return Parallelism.N_JOBS
+
+    @staticmethod
+    def set_thread_limit(n_threads: Optional[int]):
+        """
+        Limits the threads used by sklearn and the BLAS libraries of the current process.
+        :param n_threads: the maximum number of threads, the limits of the libraries are restored if None
+        :return: None
+        """
+        Parallelism.N_JOBS = DEFAULT_N_JOBS if n_threads is None else n_threads
+        Parallelism.BLAS_THREADS = n_threads
+        if Parallelism.thread_limiter is not None:
+            Parallelism.thread_limiter.restore_original_limits()
+            Parallelism.thread_limiter = None
+        if n_threads is not None:
+            Parallelism.thread_limiter = threadpool_limits(limits=n_threads)
+
+
+def get_n_cores() -> int:
+    """
+    Returns the number of cores the current process may run on.
+    :return: int
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def split_cores(
+    n_workers: Optional[int], n_tasks: int, n_cores: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Splits the cores between worker processes and the threads of each worker. Unless given, there is a worker per
+    core or per task if there are fewer tasks, and the remaining cores are given to the threads of the workers.
+    :param n_workers: the number of worker processes, chosen automatically if None
+    :param n_tasks: the number of tasks the workers will run
+    :param n_cores: the number of cores to split, defaults to the cores available to the current process
+    :return: the number of worker processes and the number of threads per worker
+    """
+    n_cores = get_n_cores() if n_cores is None else n_cores
+    if n_workers is None:
+        n_workers = min(n_cores, n_tasks)
+    n_workers = max(n_workers, 1)
+    return n_workers, max(n_cores // n_workers, 1)
+
+
+def initialize_worker(
+    n_threads: int, initializer: Optional[Callable] = None, initargs: Tuple = ()
+):
+    """
+    Limits the threads of a worker process before running the initializer of its pool.
+    :param n_threads: the number of threads of the worker
+    :param initializer: called with initargs once the threads are limited
+    :param initargs: the arguments of initializer
+    :return: None
+    """
+    Parallelism.set_thread_limit(n_threads)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def create_process_pool(
+    n_workers: Optional[int],
+    n_tasks: int,
+    initializer: Optional[Callable] = None,
+    initargs: Tuple = (),
+) -> ProcessPoolExecutor:
+    """
+    Creates a pool of worker processes whose threads together use the available cores (see split_cores).
+    :param n_workers: the number of worker processes, chosen automatically if None
+    :param n_tasks: the number of tasks submitted to the pool
+    :param initializer: called in each worker once its threads are limited
+    :param initargs: the arguments of initializer
+    :return: ProcessPoolExecutor
+    """
+    n_processes, n_threads = split_cores(n_workers, n_tasks)
+    return ProcessPoolExecutor(
+        max_workers=n_processes,
+        initializer=initialize_worker,
+        initargs=(n_threads, initializer, initargs),
+    )
@@ -0,0 +1,151 @@
+"""
+The following module is responsible for filling the Cache with the direct and transitive components of a grid of
+techniques before running an experiment. Components are computed in parallel so that the experiment itself only
+reads similarity matrices from the cache.
+"""
+from functools import partial
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from api.constants.processing import DATASET_COLNAME
+from api.datasets.dataset import Dataset
+from api.datasets.dataset_registry import DatasetRegistry
+from api.extension.cache import Cache, CacheConfig
+from api.extension.parallelism import create_process_pool
+from api.tables.table import Table
+from api.technique.cost_estimator import DatasetProfile, order_jobs_by_cost
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.definitions.direct.definition import DirectTechniqueDefinition
+from api.technique.definitions.transitive.definition import (
+    TransitiveTechniqueDefinition,
+)
+from api.technique.parser.itechnique import ITechnique
+
+PRECOMPUTE_TECHNIQUE_COLNAME = "technique"
+PRECOMPUTE_STATUS_COLNAME = "status"
+COMPUTED_STATUS = "computed"
+CACHED_STATUS = "cached"
+
+_worker_datasets = DatasetRegistry()  # datasets loaded by each worker process
+
+
+def get_cacheable_components(technique: ITechnique) -> List[ITechnique]:
+    """
+    Returns the technique and all of its nested components that are direct or transitive techniques and whose
+    similarity matrices are cacheable (e.g. non-stochastic).
+    :param technique: the technique whose components are collected
+    :return: list of techniques, may contain duplicates
+    """
+    components = []
+    for component in technique.definition.get_component_techniques():
+        components.extend(get_cacheable_components(component))
+    is_direct_or_transitive = isinstance(
+        technique.definition, (DirectTechniqueDefinition, TransitiveTechniqueDefinition)
+    )
+    if (
+        is_direct_or_transitive
+        and not technique.definition.contains_stochastic_technique()
+    ):
+        components.append(technique)
+    return components
+
+
+def get_unique_components(technique_definitions: List[str]) -> List[List[str]]:
+    """
+    Returns the names of the unique cacheable components in given techniques grouped into phases. The first phase
+    contains the direct techniques and the second the transitive techniques which reuse the former.
+    :param technique_definitions: the technique definitions of the grid
+    :return: list of phases, each a sorted list of technique names
+    """
+    direct_names, transitive_names = set(), set()
+    for technique_definition in technique_definitions:
+        technique = create_technique_from_name(technique_definition)
+        for component in get_cacheable_components(technique):
+            if isinstance(component.definition, DirectTechniqueDefinition):
+                direct_names.add(component.get_name())
+            else:
+                transitive_names.add(component.get_name())
+    return [sorted(direct_names), sorted(transitive_names)]
+
+
+def reload_if_missing_components(dataset: Dataset, technique: ITechnique):
+    """
+    Reloads the cache meta-data if a component of technique is not known to this process, it may have been stored
+    by another worker since.
+    :param dataset: the dataset the technique is calculated on
+    :param technique: the technique whose components are looked up
+    :return: None
+    """
+    components = [c for c in get_cacheable_components(technique) if c is not technique]
+    if any(len(Cache.query(dataset, c.definition)) == 0 for c in components):
+        Cache.reload()
+
+
+def calculate_and_cache_technique(
+    job: Tuple[str, str], cache_config: CacheConfig
+) -> Tuple[str, str]:
+    """
+    Calculates the technique on the dataset, storing the similarity matrix in the cache. Used by worker processes.
+    :param job: tuple containing the dataset name and technique definition
+    :param cache_config: the cache settings of the worker, the cache must be on
+    :return: the given job once completed
+    """
+    dataset_name, technique_name = job
+    dataset = _worker_datasets.get(dataset_name)
+    technique = create_technique_from_name(technique_name)
+    with Cache.use_config(cache_config):
+        reload_if_missing_components(dataset, technique)
+        technique.calculate_technique_data(dataset)
+    return job
+
+
+def precompute_cache(
+    dataset_names: List[str],
+    technique_definitions: List[str],
+    n_workers: Optional[int] = None,
+) -> Table:
+    """
+    Calculates and caches every unique direct and transitive component of the given techniques on every dataset.
+    Components that are already cached are skipped and the components estimated to take longest start first.
+    :param dataset_names: the names of the datasets to precompute
+    :param technique_definitions: the technique definitions of the grid
+    :param n_workers: the number of worker processes, by default the cores are split between workers and their threads
+    :return: Table containing the dataset, technique, and status (computed or cached) of each component
+    """
+    phases = get_unique_components(technique_definitions)
+    cache_config = Cache.get_config().with_cache_on(True)
+    records = []
+    with Cache.use_config(cache_config):
+        datasets = [Dataset(dataset_name) for dataset_name in dataset_names]
+        profiles = {d.name: DatasetProfile.from_dataset(d) for d in datasets}
+        for phase_names in phases:
+            Cache.reload()  # sees components stored by the workers of previous phases
+            jobs = []
+            for dataset in datasets:
+                for technique_name in phase_names:
+                    technique = create_technique_from_name(technique_name)
+                    if Cache.is_cached(dataset, technique.definition):
+                        records.append((dataset.name, technique_name, CACHED_STATUS))
+                    else:
+                        jobs.append((dataset.name, technique_name))
+
+            jobs = order_jobs_by_cost(jobs, profiles)
+            with create_process_pool(n_workers, len(jobs)) as executor:
+                for dataset_name, technique_name in executor.map(
+                    partial(calculate_and_cache_technique, cache_config=cache_config),
+                    jobs,
+                ):
+                    records.append((dataset_name, technique_name, COMPUTED_STATUS))
+        Cache.reload()
+
+    return Table(
+        pd.DataFrame(
+            records,
+            columns=[
+                DATASET_COLNAME,
+                PRECOMPUTE_TECHNIQUE_COLNAME,
+                PRECOMPUTE_STATUS_COLNAME,
+            ],
+        )
+    )
@@ -0,0 +1,50 @@
+"""
+The following module is responsible for coalescing identical computations requested concurrently by several threads
+so that each is calculated once and its result is shared with every thread waiting for it.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+Result = TypeVar("Result")
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time. Threads requesting a key that is already being computed wait for
+    that computation and receive its result (or exception) instead of computing it again. Results are not kept once
+    the computation completes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight: Dict[Hashable, Future] = {}
+
+    def run(self, key: Hashable, calculate: Callable[[], Result]) -> Result:
+        """
+        Returns the result of calculate, sharing the computation with concurrent calls with the same key.
+        :param key: identifies the computation
+        :param calculate: computes the result
+        :return: the result of the computation
+        """
+        with self.lock:
+            future = self.in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self.in_flight[key] = future
+        if not is_leader:
+            return future.result()
+
+        try:
+            future.set_result(calculate())
+        except BaseException as error:  # pylint: disable=broad-except
+            future.set_exception(error)
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+        return future.result()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.in_flight)
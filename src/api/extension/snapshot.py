@@ -0,0 +1,246 @@
+"""
+The following module is responsible for saving the in-memory state of a Tracer (loaded datasets, artifact vectors,
+similarity matrices and tracked techniques) into a snapshot folder and restoring it in another process. Matrices are
+stored as .npy files and memory-mapped on load so restoring a snapshot does not read them until they are used.
+A snapshot is written into a sibling folder and moved into place once complete, so a tracer restored from a
+snapshot can be saved back to the same folder without truncating the files it maps.
+
+Snapshot layout:
+    manifest.json               - the datasets, vectors and matrices stored in the snapshot
+    datasets/<i>/artifacts.pkl  - the artifact levels of the i-th dataset
+    datasets/<i>/<trace id>.npy - the trace matrices of the i-th dataset
+    vectors/<i>_<j>*.npy        - the j-th (upper or lower) artifact vectors of the i-th query cache entry
+    matrices/<i>.npy            - the i-th similarity matrix of the query cache
+    tracked.pkl                 - the tracked techniques of each dataset (see TrackedDataset)
+"""
+import json
+import os
+import pickle
+import shutil
+import uuid
+from typing import Dict, List
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+from api.datasets.dataset import Dataset
+from api.datasets.dataset_registry import DatasetRegistry
+from api.extension.file_operations import create_if_not_exist
+from api.technique.incremental import TrackedDataset
+from api.technique.query import QueryCache
+
+SNAPSHOT_VERSION = 1
+MANIFEST_FILE_NAME = "manifest.json"
+TRACKED_FILE_NAME = "tracked.pkl"
+SPARSE_ARRAYS = ["data", "indices", "indptr"]
+
+
+def save_array(path_to_folder: str, file_name: str, array) -> Dict:
+    """
+    Stores dense or sparse array as .npy files and returns the entry describing it in the manifest.
+    :param path_to_folder: the folder to store the files in
+    :param file_name: the name of the files without extension
+    :param array: numpy array or scipy sparse matrix
+    :return: dict
+    """
+    if issparse(array):
+        array = csr_matrix(array)
+        for name in SPARSE_ARRAYS:
+            np.save(
+                os.path.join(path_to_folder, "%s.%s.npy" % (file_name, name)),
+                getattr(array, name),
+            )
+        return {"file": file_name, "sparse": True, "shape": list(array.shape)}
+    np.save(os.path.join(path_to_folder, file_name + ".npy"), np.asarray(array))
+    return {"file": file_name, "sparse": False}
+
+
+def load_array(path_to_folder: str, entry: Dict):
+    """
+    Memory-maps the array described by a manifest entry.
+    :param path_to_folder: the folder containing the files of the array
+    :param entry: the entry returned when the array was saved
+    :return: read-only numpy array or scipy sparse matrix
+    """
+    file_name = entry["file"]
+    if entry["sparse"]:
+        arrays = [
+            np.load(
+                os.path.join(path_to_folder, "%s.%s.npy" % (file_name, name)),
+                mmap_mode="r",
+            )
+            for name in SPARSE_ARRAYS
+        ]
+        return csr_matrix(tuple(arrays), shape=tuple(entry["shape"]), copy=False)
+    return np.load(os.path.join(path_to_folder, file_name + ".npy"), mmap_mode="r")
+
+
+def save_snapshot(
+    path_to_snapshot: str,
+    datasets: DatasetRegistry,
+    query_cache: QueryCache,
+    tracked_datasets: Dict[str, TrackedDataset],
+):
+    """
+    Writes the datasets, query cache and tracked techniques of a Tracer into a snapshot folder, replacing any
+    previous snapshot in it. The files of the previous snapshot are unlinked rather than overwritten so that
+    arrays memory-mapped from them remain readable.
+    :param path_to_snapshot: the folder to write the snapshot to
+    :param datasets: the loaded datasets, stored in least recently used order
+    :param query_cache: the artifact vectors and similarity matrices to store
+    :param tracked_datasets: the tracked techniques per dataset name
+    :return: None
+    """
+    path_to_snapshot = os.path.abspath(path_to_snapshot)
+    path_to_new_snapshot = "%s.%s.new" % (path_to_snapshot, uuid.uuid4().hex)
+    try:
+        write_snapshot(path_to_new_snapshot, datasets, query_cache, tracked_datasets)
+    except BaseException:
+        shutil.rmtree(path_to_new_snapshot, ignore_errors=True)
+        raise
+
+    path_to_old_snapshot = None
+    if os.path.exists(path_to_snapshot):
+        path_to_old_snapshot = "%s.%s.old" % (path_to_snapshot, uuid.uuid4().hex)
+        os.replace(path_to_snapshot, path_to_old_snapshot)
+    os.replace(path_to_new_snapshot, path_to_snapshot)
+    if path_to_old_snapshot is not None:
+        shutil.rmtree(path_to_old_snapshot, ignore_errors=True)
+
+
+def write_snapshot(
+    path_to_snapshot: str,
+    datasets: DatasetRegistry,
+    query_cache: QueryCache,
+    tracked_datasets: Dict[str, TrackedDataset],
+):
+    """
+    Writes the files of a snapshot into a new folder, see save_snapshot.
+    :param path_to_snapshot: the folder to write the snapshot to, its parent folder must exist
+    :param datasets: the loaded datasets, stored in least recently used order
+    :param query_cache: the artifact vectors and similarity matrices to store
+    :param tracked_datasets: the tracked techniques per dataset name
+    :return: None
+    """
+    folders = {
+        name: os.path.join(path_to_snapshot, name)
+        for name in ["datasets", "vectors", "matrices"]
+    }
+    os.mkdir(path_to_snapshot)
+    for path_to_folder in folders.values():
+        create_if_not_exist(path_to_folder)
+
+    dataset_entries = []
+    with datasets.lock:
+        stored_datasets = list(datasets.datasets.values())
+    with query_cache.lock:
+        stored_vectors = list(query_cache.vectors.items())
+        stored_matrices = list(query_cache.matrices.items())
+    for dataset_index, dataset in enumerate(stored_datasets):
+        path_to_dataset = os.path.join(folders["datasets"], str(dataset_index))
+        create_if_not_exist(path_to_dataset)
+        with open(os.path.join(path_to_dataset, "artifacts.pkl"), "wb") as file:
+            pickle.dump(dataset.artifacts, file, protocol=pickle.HIGHEST_PROTOCOL)
+        for trace_id, matrix in dataset.traced_matrices.items():
+            np.save(os.path.join(path_to_dataset, trace_id + ".npy"), matrix)
+        dataset_entries.append(
+            {
+                "name": dataset.name,
+                "path_to_dataset": dataset.path_to_dataset,
+                "revision": dataset.revision,
+                "trace_ids": list(dataset.traced_matrices.keys()),
+            }
+        )
+
+    vector_entries = []
+    for entry_index, (key, vectors) in enumerate(stored_vectors):
+        vector_entries.append(
+            {
+                "key": list(key),
+                "vectors": [
+                    save_array(
+                        folders["vectors"], "%d_%d" % (entry_index, vector_index), v
+                    )
+                    for vector_index, v in enumerate(vectors)
+                ],
+            }
+        )
+    matrix_entries = [
+        {"key": list(key), **save_array(folders["matrices"], str(entry_index), matrix)}
+        for entry_index, (key, matrix) in enumerate(stored_matrices)
+    ]
+
+    tracked_states = {}
+    for dataset_name, tracked_dataset in tracked_datasets.items():
+        tracked_state = dict(vars(tracked_dataset))
+        del tracked_state["dataset"]  # restored from the stored datasets
+        tracked_states[dataset_name] = tracked_state
+    with open(os.path.join(path_to_snapshot, TRACKED_FILE_NAME), "wb") as file:
+        pickle.dump(tracked_states, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "datasets": dataset_entries,
+        "vectors": vector_entries,
+        "matrices": matrix_entries,
+    }
+    with open(os.path.join(path_to_snapshot, MANIFEST_FILE_NAME), "w") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def load_snapshot(
+    path_to_snapshot: str,
+    datasets: DatasetRegistry,
+    query_cache: QueryCache,
+    tracked_datasets: Dict[str, TrackedDataset],
+):
+    """
+    Restores the contents of a snapshot folder into the datasets, query cache and tracked techniques of a Tracer.
+    Trace matrices, vectors and similarity matrices are read-only memory maps of the snapshot files, so the folder
+    must not be modified while the Tracer is in use.
+    :param path_to_snapshot: the folder containing the snapshot
+    :param datasets: where the stored datasets are registered
+    :param query_cache: where the stored vectors and similarity matrices are kept
+    :param tracked_datasets: where the stored tracked techniques are kept
+    :return: None
+    """
+    with open(os.path.join(path_to_snapshot, MANIFEST_FILE_NAME), "r") as file:
+        manifest = json.load(file)
+    if manifest["version"] != SNAPSHOT_VERSION:
+        raise ValueError("Unsupported snapshot version: %s" % manifest["version"])
+
+    loaded_datasets: List[Dataset] = []
+    for dataset_index, entry in enumerate(manifest["datasets"]):
+        path_to_dataset = os.path.join(path_to_snapshot, "datasets", str(dataset_index))
+        dataset = Dataset.__new__(Dataset)
+        dataset.name = entry["name"]
+        dataset.path_to_dataset = entry["path_to_dataset"]
+        dataset.revision = entry["revision"]
+        with open(os.path.join(path_to_dataset, "artifacts.pkl"), "rb") as file:
+            dataset.artifacts = pickle.load(file)
+        dataset.traced_matrices = {
+            trace_id: np.load(
+                os.path.join(path_to_dataset, trace_id + ".npy"), mmap_mode="r"
+            )
+            for trace_id in entry["trace_ids"]
+        }
+        loaded_datasets.append(dataset)
+        datasets.add(dataset)
+
+    path_to_vectors = os.path.join(path_to_snapshot, "vectors")
+    for entry in manifest["vectors"]:
+        query_cache.vectors[tuple(entry["key"])] = tuple(
+            load_array(path_to_vectors, v_entry) for v_entry in entry["vectors"]
+        )
+    path_to_matrices = os.path.join(path_to_snapshot, "matrices")
+    for entry in manifest["matrices"]:
+        query_cache.matrices[tuple(entry["key"])] = load_array(path_to_matrices, entry)
+
+    with open(os.path.join(path_to_snapshot, TRACKED_FILE_NAME), "rb") as file:
+        tracked_states = pickle.load(file)
+    datasets_by_name = {dataset.name: dataset for dataset in loaded_datasets}
+    for dataset_name, tracked_state in tracked_states.items():
+        tracked_dataset = TrackedDataset.__new__(TrackedDataset)
+        tracked_dataset.__dict__.update(tracked_state)
+        tracked_dataset.dataset = datasets_by_name[dataset_name]
+        tracked_datasets[dataset_name] = tracked_dataset
@@ -0,0 +1,270 @@
+"""
+The following module is responsible for enumerating the variation points of techniques (e.g. algebraic models,
+trace types, aggregation and scaling methods, artifact level paths) into technique definitions and evaluating
+these definitions on datasets in parallel.
+"""
+from concurrent.futures import as_completed
+from functools import partial
+from itertools import product
+from typing import Callable, List, Optional, Tuple
+
+from api.constants.processing import (
+    DATASET_COLNAME,
+    NAME_COLNAME,
+    TECHNIQUE_TYPE_COLNAME,
+)
+from api.datasets.dataset import Dataset
+from api.extension.cache import Cache, CacheConfig
+from api.extension.parallelism import create_process_pool
+from api.tables.metric_table import MetricTable, Metrics
+from api.technique.cost_estimator import (
+    CostConstants,
+    DatasetProfile,
+    order_jobs_by_cost,
+)
+from api.technique.definitions.combined.technique import (
+    HYBRID_COMMAND_SYMBOL,
+    get_technique_type,
+)
+from api.technique.definitions.direct.definition import DIRECT_COMMAND_SYMBOL
+from api.technique.definitions.transitive.definition import (
+    TRANSITIVE_COMMAND_SYMBOL,
+)
+from api.technique.variationpoints.aggregation.aggregation_method import (
+    AggregationMethod,
+)
+from api.technique.variationpoints.algebraicmodel.models import AlgebraicModel
+from api.technique.variationpoints.scalers.scaling_method import ScalingMethod
+from api.technique.variationpoints.tracetype.trace_type import TraceType
+from api.tracer import Tracer
+
+ProgressCallback = Callable[
+    [int, int], None
+]  # called with (number of evaluations completed, total)
+
+_worker_tracer: Optional[
+    Tracer
+] = None  # tracer of each worker process, reused to avoid reloading datasets
+
+
+def create_direct_definition(
+    algebraic_model: AlgebraicModel, trace_type: TraceType, source: int, target: int
+) -> str:
+    """
+    Returns the definition of a direct technique.
+    :param algebraic_model: the model used to compare artifacts
+    :param trace_type: whether traces are used
+    :param source: the index of the source artifact level
+    :param target: the index of the target artifact level
+    :return: str
+    """
+    return "(%s (%s %s) (%d %d))" % (
+        DIRECT_COMMAND_SYMBOL,
+        algebraic_model.value,
+        trace_type.value,
+        source,
+        target,
+    )
+
+
+def create_transitive_definition(
+    aggregation: AggregationMethod,
+    scaling_method: ScalingMethod,
+    algebraic_model: AlgebraicModel,
+    trace_type: TraceType,
+    level_path: List[int],
+) -> str:
+    """
+    Returns the definition of a transitive technique whose components compare each consecutive pair of levels.
+    :param aggregation: the method of aggregating transitive paths
+    :param scaling_method: the method of scaling the component matrices
+    :param algebraic_model: the model used by the components
+    :param trace_type: whether the components use traces
+    :param level_path: the artifact levels visited, containing at least three levels
+    :return: str
+    """
+    components = [
+        create_direct_definition(algebraic_model, trace_type, source, target)
+        for source, target in zip(level_path[:-1], level_path[1:])
+    ]
+    return "(%s (%s %s) (%s))" % (
+        TRANSITIVE_COMMAND_SYMBOL,
+        aggregation.value,
+        scaling_method.value,
+        " ".join(components),
+    )
+
+
+def create_hybrid_definition(aggregation: AggregationMethod, components: List[str]):
+    """
+    Returns the definition of a hybrid technique combining given techniques.
+    :param aggregation: the method of aggregating the component techniques
+    :param components: the definitions of the component techniques
+    :return: str
+    """
+    return "(%s (%s) (%s))" % (
+        HYBRID_COMMAND_SYMBOL,
+        aggregation.value,
+        " ".join(components),
+    )
+
+
+class TechniqueGrid:
+    """
+    The cartesian product of the technique variation points. Level paths of two levels produce direct techniques,
+    longer paths produce transitive techniques. Hybrid techniques combine every direct technique with every
+    transitive technique tracing between the same levels.
+    """
+
+    def __init__(
+        self,
+        level_paths: List[List[int]],
+        algebraic_models: Optional[List[AlgebraicModel]] = None,
+        trace_types: Optional[List[TraceType]] = None,
+        transitive_aggregations: Optional[List[AggregationMethod]] = None,
+        scaling_methods: Optional[List[ScalingMethod]] = None,
+        technique_aggregations: Optional[List[AggregationMethod]] = None,
+    ):
+        self.level_paths = level_paths
+        self.algebraic_models = (
+            list(AlgebraicModel) if algebraic_models is None else algebraic_models
+        )
+        self.trace_types = list(TraceType) if trace_types is None else trace_types
+        self.transitive_aggregations = (
+            list(AggregationMethod)
+            if transitive_aggregations is None
+            else transitive_aggregations
+        )
+        self.scaling_methods = (
+            list(ScalingMethod) if scaling_methods is None else scaling_methods
+        )
+        self.technique_aggregations = (
+            list(AggregationMethod)
+            if technique_aggregations is None
+            else technique_aggregations
+        )
+
+    def get_direct_definitions(self) -> List[Tuple[Tuple[int, int], str]]:
+        """
+        Returns the direct techniques in the grid along with the levels they trace between.
+        :return: list of ((source, target), definition)
+        """
+        direct_paths = [path for path in self.level_paths if len(path) == 2]
+        return [
+            ((path[0], path[-1]), create_direct_definition(model, trace_type, *path))
+            for path, model, trace_type in product(
+                direct_paths, self.algebraic_models, self.trace_types
+            )
+        ]
+
+    def get_transitive_definitions(self) -> List[Tuple[Tuple[int, int], str]]:
+        """
+        Returns the transitive techniques in the grid along with the levels they trace between.
+        :return: list of ((source, target), definition)
+        """
+        transitive_paths = [path for path in self.level_paths if len(path) > 2]
+        return [
+            (
+                (path[0], path[-1]),
+                create_transitive_definition(
+                    aggregation, scaling_method, model, trace_type, path
+                ),
+            )
+            for path, aggregation, scaling_method, model, trace_type in product(
+                transitive_paths,
+                self.transitive_aggregations,
+                self.scaling_methods,
+                self.algebraic_models,
+                self.trace_types,
+            )
+        ]
+
+    def get_hybrid_definitions(self) -> List[str]:
+        """
+        Returns the hybrid techniques in the grid.
+        :return: list of definitions
+        """
+        transitive_definitions = self.get_transitive_definitions()
+        return [
+            create_hybrid_definition(aggregation, [direct, transitive])
+            for (direct_levels, direct), (
+                transitive_levels,
+                transitive,
+            ), aggregation in product(
+                self.get_direct_definitions(),
+                transitive_definitions,
+                self.technique_aggregations,
+            )
+            if direct_levels == transitive_levels
+        ]
+
+    def get_definitions(self) -> List[str]:
+        """
+        Returns every technique definition in the grid: direct, then transitive, then hybrid techniques.
+        :return: list of definitions
+        """
+        return (
+            [definition for _, definition in self.get_direct_definitions()]
+            + [definition for _, definition in self.get_transitive_definitions()]
+            + self.get_hybrid_definitions()
+        )
+
+
+def evaluate_technique(
+    job: Tuple[str, str], cache_config: CacheConfig
+) -> Tuple[str, str, Metrics]:
+    """
+    Calculates the summary metrics of technique on dataset. Used by worker processes.
+    :param job: tuple containing the dataset name and technique definition
+    :param cache_config: the cache settings used during the evaluation
+    :return: the dataset name, technique definition and resulting metrics
+    """
+    global _worker_tracer  # pylint: disable=global-statement
+    if _worker_tracer is None:
+        _worker_tracer = Tracer()
+    dataset_name, technique_definition = job
+    with Cache.use_config(cache_config):
+        metrics = _worker_tracer.get_metrics(dataset_name, technique_definition)[0]
+    return dataset_name, technique_definition, metrics
+
+
+def evaluate_technique_grid(
+    dataset_names: List[str],
+    technique_definitions: List[str],
+    n_workers: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    cost_constants: Optional[CostConstants] = None,
+) -> MetricTable:
+    """
+    Evaluates every technique on every dataset using a pool of worker processes. Metrics are added to the resulting
+    table as evaluations complete. The workers use the cache settings of the calling thread.
+    :param dataset_names: the names of the datasets to evaluate on
+    :param technique_definitions: the technique definitions to evaluate (e.g. TechniqueGrid.get_definitions())
+    :param n_workers: the number of worker processes, by default the cores are split between workers and their threads
+    :param progress_callback: called with the number of completed and total evaluations after each evaluation
+    :param cost_constants: used to start the evaluations estimated to take longest first
+    :return: MetricTable containing dataset, name, technique type, and summary metrics of each evaluation
+    """
+    profiles = {
+        name: DatasetProfile.from_dataset(Dataset(name)) for name in dataset_names
+    }
+    jobs = order_jobs_by_cost(
+        list(product(dataset_names, technique_definitions)), profiles, cost_constants
+    )
+    metric_table = MetricTable()
+    with create_process_pool(n_workers, len(jobs)) as executor:
+        evaluate = partial(evaluate_technique, cache_config=Cache.get_config())
+        futures = [executor.submit(evaluate, job) for job in jobs]
+        for n_completed, future in enumerate(as_completed(futures), start=1):
+            dataset_name, technique_definition, metrics = future.result()
+            metric_table.add(
+                [metrics],
+                other={
+                    DATASET_COLNAME: dataset_name,
+                    NAME_COLNAME: technique_definition,
+                    TECHNIQUE_TYPE_COLNAME: get_technique_type(technique_definition),
+                },
+            )
+            if progress_callback is not None:
+                progress_callback(n_completed, len(jobs))
+    return metric_table
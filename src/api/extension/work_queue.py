@@ -0,0 +1,468 @@
+"""
+The following module implements a work queue of (dataset, technique) evaluations stored as files in a shared
+directory (e.g. an NFS mount) so that workers on several machines can evaluate a technique grid without a broker:
+    python -m api.extension.work_queue enqueue QUEUE --datasets Drone --technique-file techniques.txt
+    python -m api.extension.work_queue work QUEUE            (on every node, as many times as wanted)
+    python -m api.extension.work_queue merge QUEUE metrics.csv
+
+Queue layout:
+    pending/<job id>.json  - jobs waiting for a worker
+    claimed/<job id>.json  - jobs being evaluated along with the owner of the claim and the deadline of its lease
+    results/<job id>.json  - the metric row of each completed job
+    failed/<job id>.json   - the error of each job that raised an exception
+    clocks/<worker>        - touched by each worker to read the clock of the shared directory
+
+Workers claim a job by renaming it from pending to claimed, which succeeds for a single worker. While evaluating,
+the worker renews its lease by moving the deadline in the claimed file. Claims whose lease expired (e.g. their
+worker crashed) are moved back to pending by any worker. A job may therefore be evaluated more than once, but its
+result is written atomically so duplicate evaluations only overwrite it with the same row. Workers only renew and
+remove the claims they own, so a worker whose lease expired does not remove the claim of the worker that took over.
+
+Lease deadlines are measured with the clock of the file server (the modification time of a file just touched by
+the worker) rather than the clock of each node, so clock skew between nodes does not expire leases early or late.
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from api.constants.processing import (
+    DATASET_COLNAME,
+    NAME_COLNAME,
+    TECHNIQUE_TYPE_COLNAME,
+)
+from api.extension.file_operations import read_technique_names
+from api.tables.metric_table import MetricTable, Metrics
+from api.technique.definitions.combined.technique import (
+    get_canonical_name,
+    get_technique_type,
+)
+from api.tracer import Tracer
+
+PENDING_FOLDER = "pending"
+CLAIMED_FOLDER = "claimed"
+RESULTS_FOLDER = "results"
+FAILED_FOLDER = "failed"
+QUEUE_FOLDERS = [PENDING_FOLDER, CLAIMED_FOLDER, RESULTS_FOLDER, FAILED_FOLDER]
+CLOCKS_FOLDER = "clocks"
+JOB_EXTENSION = ".json"
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_POLL_SECONDS = 5
+
+Job = Tuple[str, str]  # dataset name, technique definition
+
+
+def get_job_id(job: Job) -> str:
+    """
+    Returns the identifier of a job, equal for equivalent technique definitions.
+    :param job: tuple containing the dataset name and technique definition
+    :return: str
+    """
+    dataset_name, technique_name = job
+    key = "%s\n%s" % (dataset_name, get_canonical_name(technique_name))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get_worker_name() -> str:
+    """
+    Returns the name identifying the current process across machines.
+    :return: str
+    """
+    return "%s-%d" % (socket.gethostname(), os.getpid())
+
+
+def write_json_atomically(path_to_file: str, content: Dict):
+    """
+    Writes content to a temporary file that is then renamed to path so readers never see a partial file.
+    :param path_to_file: where to write the content
+    :param content: JSON serializable content
+    :return: None
+    """
+    path_to_temp = "%s.%s.tmp" % (path_to_file, get_worker_name())
+    with open(path_to_temp, "w") as file:
+        json.dump(content, file)
+    os.replace(path_to_temp, path_to_file)
+
+
+def read_json(path_to_file: str) -> Dict:
+    """
+    Returns the content of a JSON file.
+    :param path_to_file: the path to the file
+    :return: dict
+    """
+    with open(path_to_file, "r") as file:
+        return json.load(file)
+
+
+class WorkQueue:
+    """
+    Proxy for the files of a work queue in a shared directory.
+    """
+
+    def __init__(
+        self, path_to_queue: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ):
+        """
+        :param path_to_queue: the shared directory containing the queue, created if it does not exist
+        :param lease_seconds: seconds without renewal after which a claimed job is given to another worker
+        """
+        self.path_to_queue = path_to_queue
+        self.lease_seconds = lease_seconds
+        self.owner = "%s-%s" % (get_worker_name(), uuid.uuid4().hex)
+        for folder in QUEUE_FOLDERS + [CLOCKS_FOLDER]:
+            os.makedirs(os.path.join(path_to_queue, folder), exist_ok=True)
+
+    def get_shared_time(self) -> float:
+        """
+        Returns the current time according to the clock of the shared directory by touching a file of this worker.
+        :return: seconds since the epoch
+        """
+        path_to_clock = os.path.join(self.path_to_queue, CLOCKS_FOLDER, self.owner)
+        with open(path_to_clock, "a"):
+            os.utime(path_to_clock)
+        return os.path.getmtime(path_to_clock)
+
+    def write_lease(self, job_id: str, content: Dict):
+        """
+        Writes the claim of a job owned by this worker whose lease ends lease_seconds from now.
+        :param job_id: the identifier of the job
+        :param content: the dataset and technique of the job
+        :return: None
+        """
+        write_json_atomically(
+            self.get_path(CLAIMED_FOLDER, job_id),
+            {
+                "dataset": content["dataset"],
+                "technique": content["technique"],
+                "owner": self.owner,
+                "lease_deadline": self.get_shared_time() + self.lease_seconds,
+            },
+        )
+
+    def is_owner(self, job_id: str) -> bool:
+        """
+        Returns whether the job is claimed by this worker.
+        :param job_id: the identifier of the job
+        :return: bool
+        """
+        try:
+            content = read_json(self.get_path(CLAIMED_FOLDER, job_id))
+        except FileNotFoundError:
+            return False
+        return content.get("owner") == self.owner
+
+    def get_path(self, folder: str, job_id: str) -> str:
+        """
+        Returns the path to the file of a job in a folder of the queue.
+        :param folder: one of QUEUE_FOLDERS
+        :param job_id: the identifier of the job
+        :return: str
+        """
+        return os.path.join(self.path_to_queue, folder, job_id + JOB_EXTENSION)
+
+    def list_job_ids(self, folder: str) -> List[str]:
+        """
+        Returns the identifiers of the jobs in a folder of the queue in sorted order.
+        :param folder: one of QUEUE_FOLDERS
+        :return: list of job ids
+        """
+        return sorted(
+            file_name[: -len(JOB_EXTENSION)]
+            for file_name in os.listdir(os.path.join(self.path_to_queue, folder))
+            if file_name.endswith(JOB_EXTENSION)
+        )
+
+    def enqueue(self, dataset_names: List[str], technique_names: List[str]) -> int:
+        """
+        Adds a job for every technique on every dataset, skipping jobs already in the queue.
+        :param dataset_names: the names of the datasets to evaluate on
+        :param technique_names: the technique definitions to evaluate
+        :return: the number of jobs added
+        """
+        n_added = 0
+        for dataset_name in dataset_names:
+            for technique_name in technique_names:
+                job_id = get_job_id((dataset_name, technique_name))
+                if any(
+                    os.path.exists(self.get_path(folder, job_id))
+                    for folder in QUEUE_FOLDERS
+                ):
+                    continue
+                write_json_atomically(
+                    self.get_path(PENDING_FOLDER, job_id),
+                    {"dataset": dataset_name, "technique": technique_name},
+                )
+                n_added += 1
+        return n_added
+
+    def claim(self) -> Optional[Tuple[str, Job]]:
+        """
+        Claims a pending job, reclaiming expired leases if no job is pending.
+        :return: the job id and job, None if no job could be claimed
+        """
+        for attempt in range(2):
+            for job_id in self.list_job_ids(PENDING_FOLDER):
+                path_to_claim = self.get_path(CLAIMED_FOLDER, job_id)
+                try:
+                    os.rename(self.get_path(PENDING_FOLDER, job_id), path_to_claim)
+                    os.utime(
+                        path_to_claim
+                    )  # covers the claim until the lease is written
+                    content = read_json(path_to_claim)
+                    self.write_lease(job_id, content)
+                except FileNotFoundError:  # claimed by another worker
+                    continue
+                if os.path.exists(self.get_path(RESULTS_FOLDER, job_id)):
+                    self.release(job_id)
+                    continue
+                return job_id, (content["dataset"], content["technique"])
+            if attempt == 0 and len(self.reclaim_expired_leases()) == 0:
+                return None
+        return None
+
+    def renew(self, job_id: str) -> bool:
+        """
+        Extends the lease of a job claimed by this worker.
+        :param job_id: the identifier of the job
+        :return: whether the job is still claimed by this worker
+        """
+        try:
+            content = read_json(self.get_path(CLAIMED_FOLDER, job_id))
+        except FileNotFoundError:
+            return False
+        if content.get("owner") != self.owner:
+            return False
+        self.write_lease(job_id, content)
+        return True
+
+    def release(self, job_id: str):
+        """
+        Removes the claim of a job if it is owned by this worker.
+        :param job_id: the identifier of the job
+        :return: None
+        """
+        if not self.is_owner(job_id):
+            return
+        try:
+            os.remove(self.get_path(CLAIMED_FOLDER, job_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, job_id: str, row: Dict):
+        """
+        Stores the result of a claimed job and removes its claim.
+        :param job_id: the identifier of the job
+        :param row: the metric row of the job
+        :return: None
+        """
+        write_json_atomically(self.get_path(RESULTS_FOLDER, job_id), row)
+        self.release(job_id)
+
+    def fail(self, job_id: str, job: Job, error: str):
+        """
+        Records the error of a claimed job and removes its claim. Failed jobs are not retried.
+        :param job_id: the identifier of the job
+        :param job: the dataset name and technique definition of the job
+        :param error: description of the error
+        :return: None
+        """
+        dataset_name, technique_name = job
+        write_json_atomically(
+            self.get_path(FAILED_FOLDER, job_id),
+            {
+                "dataset": dataset_name,
+                "technique": technique_name,
+                "error": error,
+                "worker": get_worker_name(),
+            },
+        )
+        self.release(job_id)
+
+    def reclaim_expired_leases(self) -> List[str]:
+        """
+        Moves claimed jobs whose lease expired back to pending. The owner and lease are removed from the claim first
+        so that a pending job, and its next claim until the new lease is written, carries neither.
+        :return: the ids of the reclaimed jobs
+        """
+        reclaimed_ids = []
+        current_time = self.get_shared_time()
+        for job_id in self.list_job_ids(CLAIMED_FOLDER):
+            path_to_claim = self.get_path(CLAIMED_FOLDER, job_id)
+            try:
+                content = read_json(path_to_claim)
+                lease_deadline = content.get("lease_deadline")
+                if lease_deadline is None:  # lease not written yet
+                    lease_deadline = (
+                        os.path.getmtime(path_to_claim) + self.lease_seconds
+                    )
+                if lease_deadline >= current_time:
+                    continue
+                write_json_atomically(
+                    path_to_claim,
+                    {"dataset": content["dataset"], "technique": content["technique"]},
+                )
+                os.rename(path_to_claim, self.get_path(PENDING_FOLDER, job_id))
+                reclaimed_ids.append(job_id)
+            except FileNotFoundError:  # completed or reclaimed by another worker
+                continue
+        return reclaimed_ids
+
+    def get_status(self) -> Dict[str, int]:
+        """
+        Returns the number of jobs in each folder of the queue.
+        :return: dict
+        """
+        return {folder: len(self.list_job_ids(folder)) for folder in QUEUE_FOLDERS}
+
+    def is_finished(self) -> bool:
+        """
+        Returns whether no job is pending or claimed.
+        :return: bool
+        """
+        status = self.get_status()
+        return status[PENDING_FOLDER] == 0 and status[CLAIMED_FOLDER] == 0
+
+    def merge(self) -> MetricTable:
+        """
+        Collects the results of completed jobs into a table.
+        :return: MetricTable containing dataset, name, technique type, and summary metrics of each job
+        """
+        metric_table = MetricTable()
+        for job_id in self.list_job_ids(RESULTS_FOLDER):
+            row = read_json(self.get_path(RESULTS_FOLDER, job_id))
+            metric_table.add(
+                [Metrics(ap=row["ap"], auc=row["auc"], lag=row["lag"])],
+                other={
+                    DATASET_COLNAME: row["dataset"],
+                    NAME_COLNAME: row["technique"],
+                    TECHNIQUE_TYPE_COLNAME: row["technique_type"],
+                },
+            )
+        return metric_table
+
+
+@contextmanager
+def keep_lease(queue: WorkQueue, job_id: str):
+    """
+    Renews the lease of a job on a background thread until the block exits.
+    :param queue: the queue containing the job
+    :param job_id: the identifier of the claimed job
+    :return: None
+    """
+    stopped = threading.Event()
+
+    def renew_until_stopped():
+        while not stopped.wait(queue.lease_seconds / 3):
+            if not queue.renew(job_id):
+                return
+
+    renewer = threading.Thread(target=renew_until_stopped, daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        renewer.join()
+
+
+def evaluate_job(tracer: Tracer, job: Job) -> Dict:
+    """
+    Returns the metric row of a job.
+    :param tracer: the tracer evaluating the job
+    :param job: tuple containing the dataset name and technique definition
+    :return: dict
+    """
+    dataset_name, technique_name = job
+    start = time.perf_counter()
+    metrics = tracer.get_metrics(dataset_name, technique_name)[0]
+    return {
+        "dataset": dataset_name,
+        "technique": technique_name,
+        "technique_type": get_technique_type(technique_name),
+        "ap": metrics.ap,
+        "auc": metrics.auc,
+        "lag": metrics.lag,
+        "seconds": time.perf_counter() - start,
+        "worker": get_worker_name(),
+    }
+
+
+def run_worker(
+    queue: WorkQueue,
+    wait_until_finished: bool = False,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    max_jobs: Optional[int] = None,
+) -> int:
+    """
+    Claims and evaluates jobs until none is left.
+    :param queue: the queue to take jobs from
+    :param wait_until_finished: whether to keep polling while other workers hold claims that may expire
+    :param poll_seconds: seconds between polls while waiting
+    :param max_jobs: the maximum number of jobs to evaluate, unbounded if None
+    :return: the number of jobs completed by this worker
+    """
+    tracer = Tracer()
+    n_completed = 0
+    while max_jobs is None or n_completed < max_jobs:
+        claim = queue.claim()
+        if claim is None:
+            if wait_until_finished and not queue.is_finished():
+                time.sleep(poll_seconds)
+                continue
+            break
+        job_id, job = claim
+        try:
+            with keep_lease(queue, job_id):
+                row = evaluate_job(tracer, job)
+        except Exception as error:  # pylint: disable=broad-except
+            queue.fail(job_id, job, repr(error))
+            continue
+        queue.complete(job_id, row)
+        n_completed += 1
+    return n_completed
+
+
+def main(arguments: Optional[List[str]] = None):
+    """
+    Runs a command of the work queue: enqueue, work, status or merge.
+    :param arguments: the command line arguments, read from sys.argv if None
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m api.extension.work_queue",
+        description="Evaluates a technique grid through a queue in a shared directory.",
+    )
+    parser.add_argument("command", choices=["enqueue", "work", "status", "merge"])
+    parser.add_argument("queue", help="shared directory of the queue")
+    parser.add_argument("export_path", nargs="?", help="csv written by merge")
+    parser.add_argument("--datasets", nargs="*", default=[])
+    parser.add_argument("--techniques", nargs="*", default=[])
+    parser.add_argument("--technique-file", default=None)
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument(
+        "--wait", action="store_true", help="work until no job is pending or claimed"
+    )
+    args = parser.parse_args(arguments)
+    queue = WorkQueue(args.queue, args.lease_seconds)
+
+    if args.command == "enqueue":
+        technique_names = read_technique_names(args.techniques, args.technique_file)
+        print("Added %d jobs" % queue.enqueue(args.datasets, technique_names))
+    elif args.command == "work":
+        print("Completed %d jobs" % run_worker(queue, wait_until_finished=args.wait))
+    elif args.command == "status":
+        print(json.dumps(queue.get_status()))
+    else:
+        if args.export_path is None:
+            parser.error("merge requires export_path")
+        queue.merge().save(args.export_path)
+
+
+if __name__ == "__main__":
+    main()
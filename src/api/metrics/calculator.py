@@ -1,6 +1,8 @@
 """
 TODO
 """
+from typing import Iterator, Optional
+
 import numpy as np
 import pandas as pd
 from sklearn.metrics import auc, average_precision_score, roc_curve
@@ -119,18 +121,47 @@ def calculate_metrics_for_scoring_table(
         )
         m_entries.append(m_entry)
     else:
-        for query_index in range(n_queries):
-            query_y_true, query_y_pred = get_query_values(query_index, query_length)
+        y_pred_rows = y_pred.reshape(n_queries, query_length)
+        y_true_rows = y_true.reshape(n_queries, query_length)
+        m_entries.extend(iterate_query_metrics(y_pred_rows, y_true_rows))
+    return m_entries
 
-            if 1 not in query_y_true:
-                continue
 
-            m_entry = Metrics(
-                ap=calculate_ap(query_y_true, query_y_pred),
-                auc=calculate_auc(query_y_true, query_y_pred),
-                lag=calculate_lag(query_y_true, query_y_pred),
-                query_id=query_index,
-            )
+def calculate_query_metrics(
+    query_y_true: np.ndarray, query_y_pred: np.ndarray, query_id: int
+) -> Optional[Metrics]:
+    """
+    Returns the metrics of a single query.
+    :param query_y_true: the oracle values of the query
+    :param query_y_pred: the predicted values of the query
+    :param query_id: the index of the query
+    :return: Metrics of query or None if the query has no traced targets
+    """
+    if 1 not in query_y_true:
+        return None
+    return Metrics(
+        ap=calculate_ap(query_y_true, query_y_pred),
+        auc=calculate_auc(query_y_true, query_y_pred),
+        lag=calculate_lag(query_y_true, query_y_pred),
+        query_id=query_id,
+    )
+
 
-            m_entries.append(m_entry)
-    return m_entries
+def iterate_query_metrics(
+    y_pred_rows: np.ndarray, y_true_rows: np.ndarray, first_query_id: int = 0
+) -> Iterator[Metrics]:
+    """
+    Yields the metrics of each query in a block of queries, skipping queries without traced targets.
+    :param y_pred_rows: the predicted values with a row per query
+    :param y_true_rows: the oracle values with a row per query
+    :param first_query_id: the index of the query in the first row
+    :return: Metrics per query
+    """
+    for row_index, (query_y_pred, query_y_true) in enumerate(
+        zip(y_pred_rows, y_true_rows)
+    ):
+        m_entry = calculate_query_metrics(
+            query_y_true, query_y_pred, first_query_id + row_index
+        )
+        if m_entry is not None:
+            yield m_entry
@@ -0,0 +1,46 @@
+"""
+Starts the trace-link service, e.g.
+    python -m api.server --port 8000 --workers 8 --warm Drone --techniques "(. (VSM NT) (0 2))"
+"""
+import argparse
+
+from api.server.service import DEFAULT_HOST, DEFAULT_PORT, TraceLinkServer
+
+
+def main():
+    """
+    Parses the command line arguments and serves requests until interrupted.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Serves trace links over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--memory-budget", type=int, default=None, help="bytes of datasets kept loaded"
+    )
+    parser.add_argument("--warm", nargs="*", default=[], help="datasets to preload")
+    parser.add_argument(
+        "--techniques",
+        nargs="*",
+        default=[],
+        help="techniques to prepare on warm datasets",
+    )
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = TraceLinkServer(
+        (args.host, args.port), args.workers, args.memory_budget, args.verbose
+    )
+    server.warm(args.warm, args.techniques)
+    print("Serving trace links on http://%s:%d" % server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Drives a running trace-link service with concurrent requests and reports its throughput and latencies, e.g.
+    python -m api.server.load_test --dataset Drone --technique "(. (VSM NT) (0 2))" --requests 500
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+
+from api.server.service import DEFAULT_HOST, DEFAULT_PORT
+from api.technique.definitions.combined.technique import create_technique_from_name
+
+LATENCY_PERCENTILES = [50, 95, 99]
+
+
+def send_request(url: str) -> Tuple[bool, float]:
+    """
+    Sends GET request to url.
+    :param url: the url to request
+    :return: whether the request succeeded and its latency in seconds
+    """
+    start = time.perf_counter()
+    try:
+        with urlopen(url) as response:
+            response.read()
+            is_success = response.status == 200
+    except HTTPError:
+        is_success = False
+    return is_success, time.perf_counter() - start
+
+
+def get_json(url: str) -> Dict:
+    """
+    Returns the JSON body of GET request to url.
+    :param url: the url to request
+    :return: dict
+    """
+    with urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def create_link_urls(base_url: str, dataset_name: str, technique_name: str, k: int):
+    """
+    Returns a links request for every source artifact of technique.
+    :param base_url: the url of the service
+    :param dataset_name: the dataset to query
+    :param technique_name: the technique ranking the links
+    :param k: the number of links per request
+    :return: list of urls
+    """
+    source_level = create_technique_from_name(technique_name).definition.source_level
+    artifacts_query = urlencode({"dataset": dataset_name, "level": source_level})
+    source_ids = get_json("%s/artifacts?%s" % (base_url, artifacts_query))["ids"]
+    return [
+        "%s/links?%s"
+        % (
+            base_url,
+            urlencode(
+                {
+                    "dataset": dataset_name,
+                    "technique": technique_name,
+                    "source": source_id,
+                    "k": k,
+                }
+            ),
+        )
+        for source_id in source_ids
+    ]
+
+
+def run_load_test(urls: List[str], n_requests: int, concurrency: int) -> Dict:
+    """
+    Sends n_requests cycling through urls from concurrency threads.
+    :param urls: the urls to request
+    :param n_requests: the total number of requests
+    :param concurrency: the number of requests in flight at once
+    :return: dict containing the number of requests, errors, throughput and latency percentiles in seconds
+    """
+    request_urls = [urls[i % len(urls)] for i in range(n_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send_request, request_urls))
+    duration = time.perf_counter() - start
+
+    latencies = np.array([latency for _, latency in results])
+    report = {
+        "n_requests": n_requests,
+        "n_errors": sum(1 for is_success, _ in results if not is_success),
+        "seconds": duration,
+        "requests_per_second": n_requests / duration if duration > 0 else 0.0,
+        "max_latency": float(latencies.max()) if n_requests > 0 else 0.0,
+    }
+    for percentile in LATENCY_PERCENTILES:
+        report["p%d_latency" % percentile] = (
+            float(np.percentile(latencies, percentile)) if n_requests > 0 else 0.0
+        )
+    return report
+
+
+def main():
+    """
+    Parses the command line arguments, runs the load test, and prints its report.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Load tests the trace-link service.")
+    parser.add_argument("--url", default="http://%s:%d" % (DEFAULT_HOST, DEFAULT_PORT))
+    parser.add_argument("--dataset", required=True)
+    parser.add_argument("--technique", required=True)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    urls = create_link_urls(args.url, args.dataset, args.technique, args.k)
+    report = run_load_test(urls, args.requests, args.concurrency)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+The following module defines an HTTP service exposing a long-lived Tracer so that the datasets, artifact vectors
+and similarity matrices it calculates stay in memory between requests.
+
+Endpoints (GET, responses are JSON):
+    /health                                         - liveness check
+    /artifacts?dataset=D&level=L                    - ids of the artifacts in level L
+    /links?dataset=D&technique=T&source=ID&k=20     - top k target artifacts of source (or &level=L&index=I)
+    /metrics?dataset=D&technique=T&summary=true     - metrics of technique on dataset
+    /cache                                          - cache statistics and the data kept in memory
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from api.extension.cache import Cache
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.tracer import Tracer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_K = 20
+
+Parameters = Dict[str, str]  # query string of a request, one value per parameter
+Endpoint = Callable[["TraceLinkServer", Parameters], Dict]
+
+
+class RequestError(Exception):
+    """
+    Raised when a request is missing or contains invalid parameters.
+    """
+
+
+def get_parameter(params: Parameters, name: str, default: Optional[str] = None) -> str:
+    """
+    Returns the value of parameter in request.
+    :param params: the parameters of the request
+    :param name: the name of the parameter
+    :param default: returned if the parameter is missing, parameter is required if None
+    :return: str
+    """
+    if name in params:
+        return params[name]
+    if default is None:
+        raise RequestError("Missing parameter: %s" % name)
+    return default
+
+
+def get_int_parameter(
+    params: Parameters, name: str, default: Optional[int] = None
+) -> int:
+    """
+    Returns the value of integer parameter in request.
+    :param params: the parameters of the request
+    :param name: the name of the parameter
+    :param default: returned if the parameter is missing, parameter is required if None
+    :return: int
+    """
+    value = get_parameter(params, name, None if default is None else str(default))
+    try:
+        return int(value)
+    except ValueError as error:
+        raise RequestError(
+            "Parameter %s must be an integer: %s" % (name, value)
+        ) from error
+
+
+def get_health(_server: "TraceLinkServer", _params: Parameters) -> Dict:
+    """
+    Returns that the service is running.
+    :param _server: the server handling the request
+    :param _params: the parameters of the request
+    :return: dict
+    """
+    return {"status": "ok"}
+
+
+def get_artifacts(server: "TraceLinkServer", params: Parameters) -> Dict:
+    """
+    Returns the ids of the artifacts in a level of dataset.
+    :param server: the server handling the request
+    :param params: dataset and level
+    :return: dict
+    """
+    dataset_name = get_parameter(params, "dataset")
+    level_index = get_int_parameter(params, "level")
+    dataset = server.tracer.get_dataset(dataset_name)
+    if not 0 <= level_index < len(dataset.artifacts):
+        raise RequestError("Level does not exist: %d" % level_index)
+    artifact_ids = [str(a_id) for a_id in dataset.artifacts[level_index]["id"]]
+    return {"dataset": dataset_name, "level": level_index, "ids": artifact_ids}
+
+
+def get_links(server: "TraceLinkServer", params: Parameters) -> Dict:
+    """
+    Returns the target artifacts most similar to a source artifact.
+    :param server: the server handling the request
+    :param params: dataset, technique, k and either source or level and index
+    :return: dict
+    """
+    dataset_name = get_parameter(params, "dataset")
+    technique_name = get_parameter(params, "technique")
+    k = get_int_parameter(params, "k", DEFAULT_K)
+    if "source" in params:
+        source = params["source"]
+    else:
+        source = (
+            get_int_parameter(params, "level"),
+            get_int_parameter(params, "index"),
+        )
+    ranked_targets = server.tracer.get_top_k_targets(
+        dataset_name, technique_name, source, k
+    )
+    return {
+        "dataset": dataset_name,
+        "technique": technique_name,
+        "source": source if isinstance(source, str) else list(source),
+        "links": [
+            {"id": str(target_id), "score": score}
+            for target_id, score in ranked_targets
+        ],
+    }
+
+
+def get_metrics(server: "TraceLinkServer", params: Parameters) -> Dict:
+    """
+    Returns the metrics of a technique on dataset.
+    :param server: the server handling the request
+    :param params: dataset, technique and whether to summarize queries
+    :return: dict
+    """
+    dataset_name = get_parameter(params, "dataset")
+    technique_name = get_parameter(params, "technique")
+    summary_metrics = get_parameter(params, "summary", "true").lower() == "true"
+    metrics = server.tracer.get_metrics(
+        dataset_name, technique_name, summary_metrics=summary_metrics
+    )
+    return {
+        "dataset": dataset_name,
+        "technique": technique_name,
+        "metrics": [vars(query_metrics) for query_metrics in metrics],
+    }
+
+
+def get_cache_status(server: "TraceLinkServer", _params: Parameters) -> Dict:
+    """
+    Returns the statistics of the cache and the data the tracer keeps in memory.
+    :param server: the server handling the request
+    :param _params: the parameters of the request
+    :return: dict
+    """
+    registry = server.tracer.datasets
+    query_cache = server.tracer.query_cache
+    with Cache.use_config(server.tracer.cache_config):
+        cache_on = Cache.get_config().cache_on
+    with query_cache.lock:
+        n_query_vectors = len(query_cache.vectors)
+        n_query_matrices = len(query_cache.matrices)
+    return {
+        "cache_on": cache_on,
+        "cache_bytes": Cache.get_size(),
+        "statistics": Cache.statistics.to_dict(),
+        "datasets": registry.get_names(),
+        "dataset_bytes": registry.get_total_bytes(),
+        "n_query_vectors": n_query_vectors,
+        "n_query_matrices": n_query_matrices,
+    }
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    "/health": get_health,
+    "/artifacts": get_artifacts,
+    "/links": get_links,
+    "/metrics": get_metrics,
+    "/cache": get_cache_status,
+}
+
+
+class TraceLinkRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes GET requests to their endpoint and writes the result as JSON.
+    """
+
+    server: "TraceLinkServer"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Responds to a GET request.
+        :return: None
+        """
+        url = urlparse(self.path)
+        if url.path not in ENDPOINTS:
+            self.send_json(404, {"error": "Unknown endpoint: %s" % url.path})
+            return
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            body = ENDPOINTS[url.path](self.server, params)
+        except (RequestError, ValueError) as error:
+            self.send_json(400, {"error": str(error)})
+            return
+        except Exception as error:  # pylint: disable=broad-except
+            self.send_json(500, {"error": str(error)})
+            return
+        self.send_json(200, body)
+
+    def send_json(self, status: int, body: Dict):
+        """
+        Writes response containing body as JSON.
+        :param status: the HTTP status code
+        :param body: the content of the response
+        :return: None
+        """
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class TraceLinkServer(HTTPServer):
+    """
+    HTTP server handling requests on a pool of worker threads with a single Tracer shared between them. The Tracer
+    is thread-safe, so requests are evaluated concurrently and identical requests arriving together are calculated
+    once.
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        n_workers: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+        verbose: bool = False,
+    ):
+        """
+        :param address: the host and port to listen on, port 0 selects any free port
+        :param n_workers: the number of threads handling requests
+        :param memory_budget: bytes of datasets kept in memory, see Tracer
+        :param verbose: whether to log every request
+        """
+        super().__init__(address, TraceLinkRequestHandler)
+        self.tracer = Tracer(memory_budget)
+        self.executor = ThreadPoolExecutor(max_workers=n_workers)
+        self.verbose = verbose
+
+    def warm(self, dataset_names: List[str], technique_names: List[str]):
+        """
+        Loads datasets and answers a query of each technique ahead of the first request so that the artifact
+        vectors and component matrices of the techniques are kept in memory.
+        :param dataset_names: names of datasets to load
+        :param technique_names: techniques to prepare on each dataset
+        :return: None
+        """
+        for dataset_name in dataset_names:
+            dataset = self.tracer.get_dataset(dataset_name)
+            for technique_name in technique_names:
+                source_level = create_technique_from_name(
+                    technique_name
+                ).definition.source_level
+                if dataset.get_n_artifacts(source_level) > 0:
+                    self.tracer.get_top_k_targets(
+                        dataset_name, technique_name, (source_level, 0), k=1
+                    )
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_in_worker, request, client_address)
+
+    def process_request_in_worker(self, request, client_address):
+        """
+        Handles request on a worker thread.
+        :param request: the socket of the request
+        :param client_address: the address of the client
+        :return: None
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # pylint: disable=broad-except
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
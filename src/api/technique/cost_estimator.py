@@ -0,0 +1,596 @@
+"""
+The following module is responsible for estimating the cost of calculating techniques before running them.
+Each pipeline step of a technique is assigned an estimated number of floating point operations (vectorized
+numpy work), python-level operations (element-wise loops), tokens vectorized, and peak bytes held. The seconds
+per operation are machine dependent. They are measured by micro-benchmarks (calibrate_cost_constants), optionally
+refined by timing techniques on datasets (fit_cost_constants), and saved to PATH_TO_COST_CONSTANTS where they are
+used by default when ordering jobs:
+    python -m api.technique.cost_estimator
+    python -m api.technique.cost_estimator --datasets Drone --technique-file techniques.txt
+"""
+import argparse
+import json
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import nnls
+
+from api.constants.paths import PATH_TO_COST_CONSTANTS
+from api.datasets.dataset import Dataset
+from api.extension.cache import Cache
+from api.extension.file_operations import read_technique_names
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.definitions.direct.definition import DirectTechniqueDefinition
+from api.technique.parser.itechnique import ITechnique
+from api.technique.variationpoints.aggregation.aggregation_functions import (
+    arithmetic_aggregation_functions,
+)
+from api.technique.variationpoints.aggregation.aggregation_method import (
+    AggregationMethod,
+)
+from api.technique.variationpoints.aggregation.transitive_path_aggregation import (
+    dot_product_with_aggregation,
+)
+from api.technique.variationpoints.algebraicmodel.calculate_similarity_matrix import (
+    create_term_frequency_matrix,
+)
+from api.technique.variationpoints.algebraicmodel.models import (
+    AlgebraicModel,
+    SimilarityMatrices,
+)
+from api.technique.variationpoints.tracetype.trace_type import TraceType
+
+BYTES_PER_VALUE = 8  # float64 matrices
+BYTES_PER_SPARSE_VALUE = 12  # value and column index of sparse matrices
+BYTES_PER_VOCABULARY_TERM = 100  # entry in the vocabulary dictionary
+MAX_LSI_COMPONENTS = 100
+N_SVD_ITERATIONS = 10  # approximate number of sparse products performed by arpack
+
+
+class CostConstants:
+    """
+    The machine dependent seconds taken per operation of each kind.
+    """
+
+    def __init__(
+        self,
+        seconds_per_flop: float = 1e-9,
+        seconds_per_python_op: float = 2e-7,
+        seconds_per_token: float = 2e-6,
+    ):
+        self.seconds_per_flop = seconds_per_flop
+        self.seconds_per_python_op = seconds_per_python_op
+        self.seconds_per_token = seconds_per_token
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Returns the constants as a dictionary.
+        :return: dict
+        """
+        return vars(self).copy()
+
+    def save(self, path_to_file: str):
+        """
+        Writes the constants to given JSON file.
+        :param path_to_file: where to write the constants
+        :return: None
+        """
+        with open(path_to_file, "w") as constants_file:
+            json.dump(self.to_dict(), constants_file, indent=4)
+
+    @staticmethod
+    def load(path_to_file: str) -> "CostConstants":
+        """
+        Reads the constants stored in given JSON file.
+        :param path_to_file: path to file created by save
+        :return: CostConstants
+        """
+        with open(path_to_file) as constants_file:
+            return CostConstants(**json.load(constants_file))
+
+    @staticmethod
+    def load_default() -> "CostConstants":
+        """
+        Returns the constants saved to PATH_TO_COST_CONSTANTS by calibration, the built-in defaults if none were saved.
+        :return: CostConstants
+        """
+        if os.path.isfile(PATH_TO_COST_CONSTANTS):
+            return CostConstants.load(PATH_TO_COST_CONSTANTS)
+        return CostConstants()
+
+
+class DatasetProfile:
+    """
+    The sizes of a dataset determining the cost of techniques.
+    """
+
+    def __init__(
+        self, level_sizes: List[int], vocabulary_size: int, average_tokens: float
+    ):
+        self.level_sizes = level_sizes
+        self.vocabulary_size = vocabulary_size
+        self.average_tokens = average_tokens  # tokens per artifact
+
+    @staticmethod
+    def from_dataset(dataset: Dataset) -> "DatasetProfile":
+        """
+        Returns the profile of given dataset. The vocabulary is approximated by the unique whitespace delimited
+        tokens across all levels.
+        :param dataset: the dataset to profile
+        :return: DatasetProfile
+        """
+        level_sizes = [len(level) for level in dataset.artifacts]
+        texts = pd.concat([level["text"] for level in dataset.artifacts]).astype(str)
+        tokens = texts.str.lower().str.split()
+        vocabulary = set(token for artifact in tokens for token in artifact)
+        average_tokens = float(tokens.map(len).mean()) if len(tokens) > 0 else 0.0
+        return DatasetProfile(level_sizes, len(vocabulary), average_tokens)
+
+
+class StepCost:
+    """
+    The estimated cost of a single pipeline step.
+    """
+
+    def __init__(
+        self,
+        step: str,
+        flops: float = 0,
+        python_ops: float = 0,
+        tokens: float = 0,
+        peak_bytes: float = 0,
+    ):
+        self.step = step
+        self.flops = flops
+        self.python_ops = python_ops
+        self.tokens = tokens
+        self.peak_bytes = peak_bytes
+
+    def get_seconds(self, constants: CostConstants) -> float:
+        """
+        Returns the estimated runtime of the step.
+        :param constants: the seconds per operation of the machine
+        :return: float
+        """
+        return (
+            self.flops * constants.seconds_per_flop
+            + self.python_ops * constants.seconds_per_python_op
+            + self.tokens * constants.seconds_per_token
+        )
+
+
+class TechniqueCost:
+    """
+    The estimated cost of each pipeline step of a technique.
+    """
+
+    def __init__(self, technique_name: str, steps: List[StepCost]):
+        self.technique_name = technique_name
+        self.steps = steps
+
+    def get_flops(self) -> float:
+        """
+        Returns the total floating point operations of all steps.
+        :return: float
+        """
+        return sum(step.flops for step in self.steps)
+
+    def get_peak_bytes(self) -> float:
+        """
+        Returns the largest peak bytes of any step.
+        :return: float
+        """
+        return max([step.peak_bytes for step in self.steps] + [0])
+
+    def get_seconds(self, constants: CostConstants) -> float:
+        """
+        Returns the estimated runtime of the technique.
+        :param constants: the seconds per operation of the machine
+        :return: float
+        """
+        return sum(step.get_seconds(constants) for step in self.steps)
+
+    def to_dict(self, constants: CostConstants) -> Dict:
+        """
+        Returns the estimated cost of the technique and each of its steps.
+        :param constants: the seconds per operation of the machine
+        :return: dict
+        """
+        return {
+            "technique": self.technique_name,
+            "seconds": self.get_seconds(constants),
+            "flops": self.get_flops(),
+            "peak_bytes": self.get_peak_bytes(),
+            "steps": [
+                dict(vars(step), seconds=step.get_seconds(constants))
+                for step in self.steps
+            ],
+        }
+
+
+def get_matrix_shapes(definition, profile: DatasetProfile) -> List[tuple]:
+    """
+    Returns the shape of each component similarity matrix of a transitive technique.
+    :param definition: TransitiveTechniqueDefinition
+    :param profile: the sizes of the dataset
+    :return: list of (n_rows, n_cols)
+    """
+    return [
+        (
+            profile.level_sizes[component.definition.source_level],
+            profile.level_sizes[component.definition.target_level],
+        )
+        for component in definition.get_component_techniques()
+    ]
+
+
+def get_matrices_bytes(shapes: List[tuple]) -> float:
+    """
+    Returns the bytes held by dense matrices with given shapes.
+    :param shapes: list of (n_rows, n_cols)
+    :return: float
+    """
+    return sum(n_rows * n_cols * BYTES_PER_VALUE for n_rows, n_cols in shapes)
+
+
+def estimate_direct_model(
+    definition: DirectTechniqueDefinition, profile: DatasetProfile
+) -> StepCost:
+    """
+    Estimates calculating the similarity matrix between the levels of a direct technique.
+    :param definition: the direct technique
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    n_rows = profile.level_sizes[definition.source_level]
+    n_cols = profile.level_sizes[definition.target_level]
+    output_bytes = n_rows * n_cols * BYTES_PER_VALUE
+    step = StepCost("create_direct_algebraic_model", peak_bytes=output_bytes)
+    if definition.trace_type == TraceType.TRACED:
+        return step
+
+    n_document_terms = (n_rows + n_cols) * profile.average_tokens
+    step.tokens = n_document_terms
+    step.peak_bytes += (
+        n_document_terms * BYTES_PER_SPARSE_VALUE
+        + profile.vocabulary_size * BYTES_PER_VOCABULARY_TERM
+    )
+    if definition.algebraic_model == AlgebraicModel.LSI:
+        n_components = min(n_rows, n_cols, MAX_LSI_COMPONENTS)
+        step.flops = (
+            2 * n_document_terms * n_components * N_SVD_ITERATIONS
+            + 2 * n_rows * n_cols * n_components
+        )
+        step.peak_bytes += (n_rows + n_cols) * n_components * BYTES_PER_VALUE
+    else:
+        step.flops = 2 * n_rows * n_cols * profile.average_tokens
+    return step
+
+
+def estimate_component_matrices(definition, profile: DatasetProfile) -> StepCost:
+    """
+    Estimates calculating the direct component matrices of a transitive technique.
+    :param definition: the technique whose step is estimated
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    component_steps = [
+        estimate_direct_model(component.definition, profile)
+        for component in definition.get_component_techniques()
+    ]
+    shapes = get_matrix_shapes(definition, profile)
+    return StepCost(
+        "append_direct_component_matrices",
+        flops=sum(step.flops for step in component_steps),
+        tokens=sum(step.tokens for step in component_steps),
+        peak_bytes=max(step.peak_bytes for step in component_steps)
+        + get_matrices_bytes(shapes),
+    )
+
+
+def estimate_scaling(definition, profile: DatasetProfile) -> StepCost:
+    """
+    Estimates scaling the component matrices into new matrices.
+    :param definition: the technique whose step is estimated
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    shapes = get_matrix_shapes(definition, profile)
+    n_values = sum(n_rows * n_cols for n_rows, n_cols in shapes)
+    return StepCost(
+        "scale_transitive_matrices",
+        flops=4 * n_values,
+        peak_bytes=3 * get_matrices_bytes(shapes),  # originals, concatenation, copies
+    )
+
+
+def estimate_sampling(definition, profile: DatasetProfile) -> StepCost:
+    """
+    Estimates sampling the component matrices (artifacts or traces).
+    :param definition: the technique whose step is estimated
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    shapes = get_matrix_shapes(definition, profile)
+    n_values = sum(n_rows * n_cols for n_rows, n_cols in shapes)
+    return StepCost(
+        "sample_matrices",
+        python_ops=n_values,
+        peak_bytes=2 * get_matrices_bytes(shapes),
+    )
+
+
+def estimate_transitive_aggregation(definition, profile: DatasetProfile) -> StepCost:
+    """
+    Estimates aggregating the component matrices pair by pair using an element-wise loop (SUM, MAX) or PCA.
+    :param definition: the technique whose step is estimated
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    shapes = get_matrix_shapes(definition, profile)
+    step = StepCost(
+        "perform_transitive_aggregation", peak_bytes=get_matrices_bytes(shapes)
+    )
+    n_rows, n_middle = shapes[0]
+    is_pca = definition.transitive_aggregation == AggregationMethod.PCA
+    extra_bytes = 0
+    for _, n_cols in shapes[1:]:
+        n_products = n_rows * n_middle * n_cols
+        if is_pca:
+            step.flops += n_products * n_middle
+            extra_bytes = max(extra_bytes, 2 * n_products * BYTES_PER_VALUE)
+        else:
+            step.flops += n_products
+            step.python_ops += n_products
+        n_middle = n_cols
+    step.peak_bytes += extra_bytes + n_rows * n_middle * BYTES_PER_VALUE
+    return step
+
+
+def estimate_scaled_transitive_aggregation(
+    definition, profile: DatasetProfile
+) -> StepCost:
+    """
+    Estimates scaling and aggregating the component matrices in a single vectorized pass.
+    :param definition: the technique whose step is estimated
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    shapes = get_matrix_shapes(definition, profile)
+    step = StepCost(
+        "perform_scaled_transitive_aggregation", peak_bytes=get_matrices_bytes(shapes)
+    )
+    n_rows, n_middle = shapes[0]
+    extra_bytes = 0
+    for _, n_cols in shapes[1:]:
+        step.flops += 3 * n_rows * n_middle * n_cols
+        extra_bytes = max(extra_bytes, 2 * n_middle * n_cols * BYTES_PER_VALUE)
+        n_middle = n_cols
+    step.peak_bytes += extra_bytes + n_rows * n_middle * BYTES_PER_VALUE
+    return step
+
+
+def estimate_technique_aggregation(definition, profile: DatasetProfile) -> StepCost:
+    """
+    Estimates calculating the components of a hybrid technique and aggregating them.
+    :param definition: the technique whose step is estimated
+    :param profile: the sizes of the dataset
+    :return: StepCost
+    """
+    component_costs = [
+        estimate_technique_cost(component, profile)
+        for component in definition.get_component_techniques()
+    ]
+    n_rows = profile.level_sizes[definition.source_level]
+    n_cols = profile.level_sizes[definition.target_level]
+    matrices_bytes = len(component_costs) * n_rows * n_cols * BYTES_PER_VALUE
+    step = StepCost(
+        "perform_technique_aggregation",
+        flops=sum(cost.get_flops() for cost in component_costs),
+        python_ops=n_rows * n_cols,  # aggregation is applied per row
+        tokens=sum(s.tokens for cost in component_costs for s in cost.steps),
+        peak_bytes=max(cost.get_peak_bytes() for cost in component_costs)
+        + 2 * matrices_bytes,
+    )
+    step.python_ops += sum(s.python_ops for cost in component_costs for s in cost.steps)
+    step.flops += len(component_costs) * n_rows * n_cols
+    return step
+
+
+STEP_ESTIMATORS: Dict[str, Callable] = {
+    "create_direct_algebraic_model": estimate_direct_model,
+    "append_direct_component_matrices": estimate_component_matrices,
+    "scale_transitive_matrices": estimate_scaling,
+    "sample_matrices": estimate_sampling,
+    "sample_transitive_matrices": estimate_sampling,
+    "perform_transitive_aggregation": estimate_transitive_aggregation,
+    "perform_scaled_transitive_aggregation": estimate_scaled_transitive_aggregation,
+    "perform_technique_aggregation": estimate_technique_aggregation,
+}
+
+
+def estimate_technique_cost(
+    technique: ITechnique, profile: DatasetProfile
+) -> TechniqueCost:
+    """
+    Estimates the cost of each pipeline step of given technique on a dataset with given profile. Steps without
+    an estimator are estimated to be free.
+    :param technique: the parsed technique
+    :param profile: the sizes of the dataset, see DatasetProfile.from_dataset
+    :return: TechniqueCost
+    """
+    steps = []
+    for p_func in technique.calculator.pipeline:
+        step_name = p_func.__name__
+        if step_name in STEP_ESTIMATORS:
+            step = STEP_ESTIMATORS[step_name](technique.definition, profile)
+            step.step = step_name
+        else:
+            step = StepCost(step_name)
+        steps.append(step)
+    return TechniqueCost(technique.get_name(), steps)
+
+
+def time_function(function: Callable[[], None], n_repeats: int = 3) -> float:
+    """
+    Returns the fastest runtime of given function in seconds.
+    :param function: the function to time
+    :param n_repeats: the number of times to run the function
+    :return: float
+    """
+    runtimes = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        function()
+        runtimes.append(time.perf_counter() - start)
+    return min(runtimes)
+
+
+def calibrate_cost_constants(
+    matrix_size: int = 300, loop_size: int = 25, n_documents: int = 200
+) -> CostConstants:
+    """
+    Fits the seconds per operation of this machine using micro-benchmarks: a matrix product for vectorized
+    operations, the element-wise aggregation loop for python operations, and TF-IDF vectorization for tokens.
+    :param matrix_size: the size of the square matrices multiplied
+    :param loop_size: the size of the square matrices aggregated element-wise
+    :param n_documents: the number of synthetic documents vectorized
+    :return: CostConstants
+    """
+    random_state = np.random.RandomState(0)
+    matrix = random_state.rand(matrix_size, matrix_size)
+    seconds_per_flop = time_function(lambda: matrix @ matrix) / (2 * matrix_size**3)
+
+    loop_matrix = random_state.rand(loop_size, loop_size)
+    loop_matrices = SimilarityMatrices(loop_matrix, loop_matrix)
+    aggregation_function = arithmetic_aggregation_functions[AggregationMethod.SUM]
+    seconds_per_python_op = time_function(
+        lambda: dot_product_with_aggregation(loop_matrices, aggregation_function)
+    ) / (loop_size**3)
+
+    words = ["term%d" % i for i in range(1000)]
+    n_tokens_per_document = 50
+    documents = pd.Series(
+        [
+            " ".join(random_state.choice(words, n_tokens_per_document))
+            for _ in range(n_documents)
+        ]
+    )
+    seconds_per_token = time_function(
+        lambda: create_term_frequency_matrix(documents, documents)
+    ) / (2 * n_documents * n_tokens_per_document)
+
+    return CostConstants(seconds_per_flop, seconds_per_python_op, seconds_per_token)
+
+
+def fit_cost_constants(
+    datasets: List[Dataset],
+    technique_names: List[str],
+    initial_constants: Optional[CostConstants] = None,
+) -> CostConstants:
+    """
+    Fits the seconds per operation to the runtimes of techniques calculated on datasets (without the cache) using
+    non-negative least squares on their estimated operations. Constants of operations the techniques do not
+    exercise keep their initial value.
+    :param datasets: the datasets to time the techniques on
+    :param technique_names: the technique definitions to time
+    :param initial_constants: the constants kept for unexercised operations, defaults to CostConstants()
+    :return: CostConstants
+    """
+    constants = CostConstants() if initial_constants is None else initial_constants
+    operations, runtimes = [], []
+    with Cache.use_config(Cache.get_config().with_cache_on(False)):
+        for dataset in datasets:
+            profile = DatasetProfile.from_dataset(dataset)
+            for technique_name in technique_names:
+                technique = create_technique_from_name(technique_name)
+                steps = estimate_technique_cost(technique, profile).steps
+                operations.append(
+                    [
+                        sum(step.flops for step in steps),
+                        sum(step.python_ops for step in steps),
+                        sum(step.tokens for step in steps),
+                    ]
+                )
+                runtimes.append(
+                    time_function(
+                        partial(technique.calculate_technique_data, dataset), 1
+                    )
+                )
+
+    fitted_seconds, _ = nnls(np.array(operations), np.array(runtimes))
+    initial_seconds = [
+        constants.seconds_per_flop,
+        constants.seconds_per_python_op,
+        constants.seconds_per_token,
+    ]
+    return CostConstants(
+        *[
+            fitted if fitted > 0 else initial
+            for fitted, initial in zip(fitted_seconds, initial_seconds)
+        ]
+    )
+
+
+def order_jobs_by_cost(
+    jobs: List[Tuple[str, str]],
+    profiles: Dict[str, DatasetProfile],
+    constants: Optional[CostConstants] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Returns the jobs ordered by decreasing estimated runtime so that a pool of workers starts the longest jobs
+    first and packs the shorter ones around them.
+    :param jobs: list of (dataset name, technique definition)
+    :param profiles: the profile of each dataset in jobs
+    :param constants: the seconds per operation of the machine, defaults to CostConstants.load_default()
+    :return: list of jobs
+    """
+    constants = CostConstants.load_default() if constants is None else constants
+
+    def get_job_seconds(job: Tuple[str, str]) -> float:
+        dataset_name, technique_definition = job
+        technique = create_technique_from_name(technique_definition)
+        technique_cost = estimate_technique_cost(technique, profiles[dataset_name])
+        return technique_cost.get_seconds(constants)
+
+    return sorted(jobs, key=get_job_seconds, reverse=True)
+
+
+def main(arguments: Optional[List[str]] = None):
+    """
+    Calibrates the cost constants of this machine and saves them, see module documentation.
+    :param arguments: the command line arguments, read from sys.argv if None
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m api.technique.cost_estimator",
+        description="Calibrates the seconds per operation used to estimate the cost of techniques.",
+    )
+    parser.add_argument(
+        "--datasets", nargs="*", default=[], help="datasets to fit the constants on"
+    )
+    parser.add_argument("--techniques", nargs="*", default=[])
+    parser.add_argument("--technique-file", default=None)
+    parser.add_argument("--output", default=PATH_TO_COST_CONSTANTS)
+    args = parser.parse_args(arguments)
+
+    constants = calibrate_cost_constants()
+    technique_names = read_technique_names(args.techniques, args.technique_file)
+    if len(args.datasets) > 0:
+        if len(technique_names) == 0:
+            parser.error(
+                "fitting on datasets requires --techniques or --technique-file"
+            )
+        datasets = [Dataset(dataset_name) for dataset_name in args.datasets]
+        constants = fit_cost_constants(datasets, technique_names, constants)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    constants.save(args.output)
+    print(json.dumps(constants.to_dict()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ from typing import List
 
 import numpy as np
 
+from api.constants.techniques import DIRECT_ID, HYBRID_ID, TRANSITIVE_ID
 from api.datasets.dataset import Dataset
+from api.extension.file_operations import list_to_string
+from api.technique.definitions.direct.definition import DIRECT_COMMAND_SYMBOL
 from api.technique.definitions.direct.technique import DirectTechnique
 from api.technique.definitions.sampled.artifacts.technique import (
     SampledIntermediateTechnique,
@@ -13,12 +16,13 @@ from api.technique.definitions.sampled.artifacts.technique import (
 from api.technique.definitions.sampled.traces.technique import SampledTracesTechnique
 from api.technique.definitions.transitive.technique import TransitiveTechnique
 from api.technique.parser.data import TechniqueData
-from api.technique.parser.definition_parser import parse_technique_definition
+from api.technique.parser.definition_parser import Exp, parse_technique_definition
 from api.technique.parser.itechnique import ITechnique
 from api.technique.parser.itechnique_calculator import ITechniqueCalculator
 from api.technique.parser.itechnique_definition import ITechniqueDefinition
 from api.technique.variationpoints.aggregation.aggregation_method import (
     AggregationMethod,
+    COMMUTATIVE_AGGREGATIONS,
 )
 from api.technique.variationpoints.aggregation.technique_aggregation_calculator import (
     aggregate_techniques,
@@ -97,11 +101,12 @@ class HybridTechniqueDefinition(ITechniqueDefinition):
 
 def create_technique_from_name(name: str) -> ITechnique:
     """
-    TODO
-    :param name:
-    :return:
+    Parses given technique definition into its canonical form and returns the technique it describes. The names of
+    the created technique and its components (used e.g. as cache keys) are thus identical for equivalent definitions.
+    :param name: the technique definition
+    :return: ITechnique
     """
-    technique_expressions = parse_technique_definition(name)
+    technique_expressions = canonicalize_expression(parse_technique_definition(name))
 
     assert (
         len(technique_expressions) == 3
@@ -112,6 +117,41 @@ def create_technique_from_name(name: str) -> ITechnique:
     return create_technique(command, parameters, components)
 
 
+def canonicalize_expression(expression: Exp) -> Exp:
+    """
+    Returns the canonical form of given technique expression. Parameters are upper-cased, components are
+    canonicalized recursively and the components of hybrid techniques using a commutative aggregation are sorted.
+    Whitespace is normalized by the parser.
+    :param expression: the parsed technique definition
+    :return: the canonical expression
+    """
+    if not isinstance(expression, list) or len(expression) != 3:
+        return expression
+    command, parameters, components = expression
+    parameters = [parameter.upper() for parameter in parameters]
+    if command == DIRECT_COMMAND_SYMBOL:
+        return [command, parameters, components]
+
+    components = [canonicalize_expression(component) for component in components]
+    is_commutative = (
+        command == HYBRID_COMMAND_SYMBOL
+        and len(parameters) == 1
+        and parameters[0] in [agg.value for agg in COMMUTATIVE_AGGREGATIONS]
+    )
+    if is_commutative:
+        components = sorted(components, key=list_to_string)
+    return [command, parameters, components]
+
+
+def get_canonical_name(name: str) -> str:
+    """
+    Returns the name of the technique defined by given definition in its canonical form.
+    :param name: the technique definition
+    :return: str
+    """
+    return create_technique_from_name(name).get_name()
+
+
 class CombinedTechniqueData(TechniqueData):
     """
     TODO
@@ -121,6 +161,20 @@ class CombinedTechniqueData(TechniqueData):
         super().__init__(dataset, technique)
 
 
+def get_technique_type(technique_definition: str) -> str:
+    """
+    Returns the type identifier (e.g. DIRECT) of given technique definition.
+    :param technique_definition: the technique definition
+    :return: str
+    """
+    command = technique_definition.strip().lstrip("(").split()[0]
+    if command == DIRECT_COMMAND_SYMBOL:
+        return DIRECT_ID
+    if command == HYBRID_COMMAND_SYMBOL:
+        return HYBRID_ID
+    return TRANSITIVE_ID
+
+
 def perform_technique_aggregation(data: CombinedTechniqueData):
     """
     TODO
@@ -2,14 +2,27 @@
 TODO
 """
 from api.datasets.dataset import Dataset
+from api.extension.cache import Cache
+from api.extension.intermediates import IntermediateType
 from api.technique.definitions.direct.definition import DirectTechniqueDefinition
 from api.technique.parser.data import TechniqueData
 from api.technique.parser.itechnique_calculator import ITechniqueCalculator
 from api.technique.variationpoints.algebraicmodel.calculate_similarity_matrix import (
-    calculate_similarity_matrix_for_nlp_technique,
+    DocumentTermMatrix,
+    calculate_lsi_projections,
+    calculate_similarity_matrix_from_term_frequencies,
+    create_term_frequency_matrix,
+)
+from api.technique.variationpoints.algebraicmodel.models import (
+    AlgebraicModel,
+    SimilarityMatrix,
 )
 from api.technique.variationpoints.tracetype.trace_type import TraceType
 
+VOCABULARY_STEP = "vocabulary"
+DOCUMENT_TERMS_STEP = "document_terms"
+LSI_STEP = "lsi"
+
 
 class DirectTechniqueData(TechniqueData):
     """
@@ -33,12 +46,106 @@ def create_direct_algebraic_model(data: DirectTechniqueData):
         data.similarity_matrix = data.dataset.traced_matrices[trace_id]
     else:
         upper_level_index, lower_level_index = data.technique.artifact_paths
-        upper_artifacts = data.dataset.artifacts[upper_level_index]
-        lower_artifacts = data.dataset.artifacts[lower_level_index]
-        similarity_matrix = calculate_similarity_matrix_for_nlp_technique(
-            data.technique.algebraic_model, upper_artifacts, lower_artifacts
+        data.similarity_matrix = calculate_similarity_matrix_between_levels(
+            data.dataset,
+            data.technique.algebraic_model,
+            upper_level_index,
+            lower_level_index,
+        )
+
+
+def calculate_similarity_matrix_between_levels(
+    dataset: Dataset,
+    algebraic_model: AlgebraicModel,
+    upper_level_index: int,
+    lower_level_index: int,
+) -> SimilarityMatrix:
+    """
+    Compares the artifacts of the given levels using the algebraic model. Intermediate models are read from the
+    cache when available and stored otherwise.
+    :param dataset: the dataset containing the artifact levels
+    :param algebraic_model: the vectorization method for the artifacts
+    :param upper_level_index: the index of the level representing the rows of the similarity matrix
+    :param lower_level_index: the index of the level representing the cols of the similarity matrix
+    :return: SimilarityMatrix between upper and lower level
+    """
+    if algebraic_model == AlgebraicModel.LSI:
+        upper_vectors, lower_vectors = get_lsi_projections(
+            dataset, upper_level_index, lower_level_index
+        )
+    else:
+        upper_vectors, lower_vectors = get_document_term_matrices(
+            dataset, upper_level_index, lower_level_index
+        )
+    return calculate_similarity_matrix_from_term_frequencies(
+        upper_vectors, lower_vectors
+    )
+
+
+def get_document_term_matrices(
+    dataset: Dataset, upper_level_index: int, lower_level_index: int
+) -> (DocumentTermMatrix, DocumentTermMatrix):
+    """
+    Returns the TF-IDF document-term matrices of both levels whose vocabulary is fitted on both of them.
+    :param dataset: the dataset containing the artifact levels
+    :param upper_level_index: the index of the first level
+    :param lower_level_index: the index of the second level
+    :return: document-term matrix for upper and lower level
+    """
+    levels_key = "%d-%d" % (upper_level_index, lower_level_index)
+    upper_key, lower_key = levels_key + "-upper", levels_key + "-lower"
+    entry_type = IntermediateType.SPARSE_MATRIX
+    if Cache.is_intermediate_cached(
+        dataset, DOCUMENT_TERMS_STEP, upper_key, entry_type
+    ) and Cache.is_intermediate_cached(
+        dataset, DOCUMENT_TERMS_STEP, lower_key, entry_type
+    ):
+        return (
+            Cache.get_intermediate(dataset, DOCUMENT_TERMS_STEP, upper_key, entry_type),
+            Cache.get_intermediate(dataset, DOCUMENT_TERMS_STEP, lower_key, entry_type),
         )
-        data.similarity_matrix = similarity_matrix
+
+    upper_matrix, lower_matrix, vocab = create_term_frequency_matrix(
+        dataset.artifacts[upper_level_index]["text"],
+        dataset.artifacts[lower_level_index]["text"],
+    )
+    Cache.store_intermediate(
+        dataset, VOCABULARY_STEP, levels_key, vocab, IntermediateType.VOCABULARY
+    )
+    Cache.store_intermediate(
+        dataset, DOCUMENT_TERMS_STEP, upper_key, upper_matrix, entry_type
+    )
+    Cache.store_intermediate(
+        dataset, DOCUMENT_TERMS_STEP, lower_key, lower_matrix, entry_type
+    )
+    return upper_matrix, lower_matrix
+
+
+def get_lsi_projections(
+    dataset: Dataset, upper_level_index: int, lower_level_index: int
+):
+    """
+    Returns the LSI projections of the artifacts in both levels.
+    :param dataset: the dataset containing the artifact levels
+    :param upper_level_index: the index of the first level
+    :param lower_level_index: the index of the second level
+    :return: LSI projection of upper and lower level
+    """
+    levels_key = "%d-%d" % (upper_level_index, lower_level_index)
+    entry_type = IntermediateType.SVD_FACTORS
+    if Cache.is_intermediate_cached(dataset, LSI_STEP, levels_key, entry_type):
+        factors = Cache.get_intermediate(dataset, LSI_STEP, levels_key, entry_type)
+        return factors["upper"], factors["lower"]
+
+    upper_matrix, lower_matrix = get_document_term_matrices(
+        dataset, upper_level_index, lower_level_index
+    )
+    upper_projection, lower_projection = calculate_lsi_projections(
+        upper_matrix, lower_matrix
+    )
+    factors = {"upper": upper_projection, "lower": lower_projection}
+    Cache.store_intermediate(dataset, LSI_STEP, levels_key, factors, entry_type)
+    return upper_projection, lower_projection
 
 
 DIRECT_TECHNIQUE_PIPELINE = [create_direct_algebraic_model]
@@ -22,7 +22,7 @@ def sample_matrices(data: SampledTechniqueData):
         # sample percentage of intermediate indices
         n_transitive_artifacts = matrix.shape[1]
         indices_to_keep = sample_indices(
-            n_transitive_artifacts, data.technique.sample_percentage
+            n_transitive_artifacts, data.technique.sample_percentage, data.random_state
         )
         indices_to_keep_agg.append(indices_to_keep)
 
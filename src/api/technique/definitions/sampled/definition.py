@@ -1,6 +1,8 @@
 """
 TODO
 """
+from typing import Optional
+
 from api.technique.definitions.transitive.definition import (
     TransitiveTechniqueDefinition,
 )
@@ -15,16 +17,20 @@ class SampledTechniqueDefinition(TransitiveTechniqueDefinition):
 
     def __init__(self, parameters: [str], components: [str]):
         self.sample_percentage = None
+        self.seed: Optional[int] = None
         super().__init__(parameters, components)
-        self._is_stochastic = True
+        # seeded samples are reproducible and can therefore be cached
+        self._is_stochastic = self.seed is None
 
     def parse(self):
         """
-        TODO
-        :return:
+        Parses the transitive parameters followed by the sample percentage and an optional random seed.
+        :return: None
         """
         super().parse()
         self.sample_percentage = float(self.parameters[2])
+        if len(self.parameters) > 3:
+            self.seed = int(self.parameters[3])
 
     def validate(self):
         """
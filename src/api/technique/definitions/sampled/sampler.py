@@ -2,20 +2,24 @@
 TODO
 """
 import math
-from typing import List
+from typing import List, Optional
 
-from numpy.random.mtrand import choice
+from numpy.random.mtrand import RandomState, choice
 
 
-def sample_indices(n_indices: int, percent: float) -> List[int]:
+def sample_indices(
+    n_indices: int, percent: float, random_state: Optional[RandomState] = None
+) -> List[int]:
     """
-    TODO
-    :param n_indices:
-    :param percent:
-    :return:
+    Returns a random selection, without replacement, of the given percentage of indices.
+    :param n_indices: the number of indices to select from
+    :param percent: the percentage of indices to select
+    :param random_state: the generator used for sampling, numpy's global generator is used if None
+    :return: the selected indices
     """
     n_indices_to_select = math.floor(percent * n_indices)
-    selected_indices = choice(
+    choice_func = choice if random_state is None else random_state.choice
+    selected_indices = choice_func(
         range(0, n_indices), size=n_indices_to_select, replace=False
     )
     return selected_indices
@@ -1,6 +1,10 @@
 """
 TODO
 """
+from typing import Optional
+
+from numpy.random.mtrand import RandomState
+
 from api.datasets.dataset import Dataset
 from api.technique.definitions.sampled.definition import SampledTechniqueDefinition
 from api.technique.definitions.transitive.calculator import TransitiveTechniqueData
@@ -14,3 +18,6 @@ class SampledTechniqueData(TransitiveTechniqueData):
     def __init__(self, dataset: Dataset, definition: SampledTechniqueDefinition):
         super().__init__(dataset, definition)
         self.technique = definition
+        self.random_state: Optional[RandomState] = (
+            None if definition.seed is None else RandomState(definition.seed)
+        )
@@ -83,7 +83,9 @@ def sample_transitive_matrices(technique_data: SampledTechniqueData):
     """
     n_values = get_n_values_in_matrices(technique_data.transitive_matrices)
     selected_indices = sample_indices(
-        n_values, technique_data.technique.sample_percentage
+        n_values,
+        technique_data.technique.sample_percentage,
+        technique_data.random_state,
     )
 
     sources = []
@@ -0,0 +1,21 @@
+"""
+TODO
+"""
+from api.technique.definitions.sampled.definition import SampledTechniqueDefinition
+
+SAMPLED_TRACED_COMMAND_SYMBOL = "$"
+
+
+class SampledTracesTechniqueDefinition(SampledTechniqueDefinition):
+    """
+    Definition of a sampled technique whose sampled values are replaced with traced values. It differs from
+    SampledTechniqueDefinition only in its symbol so that both sampling methods are named (and cached) separately.
+    """
+
+    @staticmethod
+    def get_symbol() -> str:
+        """
+        TODO
+        :return:
+        """
+        return SAMPLED_TRACED_COMMAND_SYMBOL
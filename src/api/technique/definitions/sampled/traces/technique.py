@@ -4,14 +4,15 @@ TODO
 from api.technique.definitions.sampled.artifacts.calculator import (
     SampledArtifactsTechniqueCalculator,
 )
-from api.technique.definitions.sampled.definition import SampledTechniqueDefinition
 from api.technique.definitions.sampled.traces.calculator import (
     SampledTracesTechniqueCalculator,
 )
+from api.technique.definitions.sampled.traces.definition import (
+    SAMPLED_TRACED_COMMAND_SYMBOL,
+    SampledTracesTechniqueDefinition,
+)
 from api.technique.parser.itechnique import ITechnique
 
-SAMPLED_TRACED_COMMAND_SYMBOL = "$"
-
 
 class SampledTracesTechnique(ITechnique):
     """
@@ -20,14 +21,14 @@ class SampledTracesTechnique(ITechnique):
 
     def create_definition(
         self, parameters: [str], components: [str]
-    ) -> SampledTechniqueDefinition:
+    ) -> SampledTracesTechniqueDefinition:
         """
         TODO
         :param parameters:
         :param components:
         :return:
         """
-        return SampledTechniqueDefinition(parameters, components)
+        return SampledTracesTechniqueDefinition(parameters, components)
 
     def create_calculator(self) -> SampledArtifactsTechniqueCalculator:
         """
@@ -3,7 +3,8 @@ TODO
 """
 
 from api.datasets.dataset import Dataset
-from api.technique.definitions.direct.calculator import DirectTechniqueCalculator
+from api.extension.cache import Cache
+from api.extension.intermediates import IntermediateType
 from api.technique.definitions.transitive.definition import (
     TransitiveTechniqueDefinition,
 )
@@ -13,6 +14,7 @@ from api.technique.variationpoints.aggregation.aggregation_method import (
     AggregationMethod,
 )
 from api.technique.variationpoints.aggregation.transitive_path_aggregation import (
+    aggregate_with_scaling_transforms,
     apply_transitive_aggregation,
 )
 from api.technique.variationpoints.algebraicmodel.models import (
@@ -20,8 +22,15 @@ from api.technique.variationpoints.algebraicmodel.models import (
     SimilarityMatrix,
 )
 from api.technique.variationpoints.scalers.scalers import (
+    ScalingTransform,
+    get_scaling_transforms,
     scale_with_technique,
 )
+from api.technique.variationpoints.scalers.scaling_method import ScalingMethod
+
+SCALED_COMPONENTS_STEP = "scaled_components"
+FUSABLE_AGGREGATIONS = [AggregationMethod.SUM, AggregationMethod.MAX]
+IDENTITY_TRANSFORM = (1.0, 0.0)  # aggregated matrices are not rescaled
 
 
 class TransitiveTechniqueData(TechniqueData):
@@ -34,6 +43,13 @@ class TransitiveTechniqueData(TechniqueData):
         self.transitive_matrices: [SimilarityMatrix] = []
         self.technique: TransitiveTechniqueDefinition = technique
 
+    def release_intermediates(self):
+        """
+        Removes the component matrices once they have been aggregated.
+        :return: None
+        """
+        self.transitive_matrices = []
+
 
 def append_direct_component_matrices(technique_data: TransitiveTechniqueData):
     """
@@ -44,8 +60,7 @@ def append_direct_component_matrices(technique_data: TransitiveTechniqueData):
     :return: None - the technique technique_data `transitive_matrices` is modified.
     """
     for technique in technique_data.technique.get_component_techniques():
-        direct_calculator = DirectTechniqueCalculator(technique.definition)
-        similarity_matrix = direct_calculator.calculate_technique_data(
+        similarity_matrix = technique.calculate_technique_data(
             technique_data.dataset
         ).similarity_matrix
         technique_data.transitive_matrices.append(similarity_matrix)
@@ -64,13 +79,48 @@ def perform_transitive_aggregation(data: TransitiveTechniqueData):
 
 def scale_transitive_matrices(data: TransitiveTechniqueData):
     """
-    TODO
-    :param data:
-    :return:
+    Scales the component matrices using the scaling method of the technique. The scaled matrices are read from
+    the cache when available, stochastic techniques are always rescaled since their components are sampled.
+    :param data: the technique_data associated with some transitive technique.
+    :return: None - `transitive_matrices` are replaced with their scaled versions
     """
+    is_cacheable = not data.technique.contains_stochastic_technique()
+    scaling_key = create_scaled_components_key(data.technique)
+    entry_type = IntermediateType.DENSE_MATRICES
+    if is_cacheable and Cache.is_intermediate_cached(
+        data.dataset, SCALED_COMPONENTS_STEP, scaling_key, entry_type
+    ):
+        data.transitive_matrices = Cache.get_intermediate(
+            data.dataset, SCALED_COMPONENTS_STEP, scaling_key, entry_type
+        )
+        return
+
     data.transitive_matrices = scale_with_technique(
         data.technique.scaling_method, data.transitive_matrices
     )
+    if is_cacheable:
+        Cache.store_intermediate(
+            data.dataset,
+            SCALED_COMPONENTS_STEP,
+            scaling_key,
+            data.transitive_matrices,
+            entry_type,
+        )
+
+
+def create_scaled_components_key(technique: TransitiveTechniqueDefinition) -> str:
+    """
+    Returns the key identifying the inputs of the scaling step: the technique symbol, every parameter except
+    the path aggregation (e.g. scaling method, sampling percentage and seed) and the component techniques.
+    :param technique: the transitive technique whose components are scaled
+    :return: str - the key
+    """
+    component_names = [
+        component.get_name() for component in technique.get_component_techniques()
+    ]
+    return " ".join(
+        [technique.get_symbol()] + technique.parameters[1:] + component_names
+    )
 
 
 def perform_transitive_aggregation_on_component_techniques(
@@ -92,12 +142,69 @@ def perform_transitive_aggregation_on_component_techniques(
     return aggregate_matrix
 
 
+def perform_scaled_transitive_aggregation(data: TransitiveTechniqueData):
+    """
+    Scales and aggregates the component matrices in a single pass equivalent to scale_transitive_matrices
+    followed by perform_transitive_aggregation. The scaling is applied inside the aggregation as an affine
+    transform so no scaled copies of the component matrices are created.
+    :param data: the technique_data associated with some transitive technique.
+    :return: None
+    """
+    matrices = data.transitive_matrices
+    transforms = get_scaling_transforms(data.technique.scaling_method, matrices)
+    data.similarity_matrix = aggregate_scaled_matrices(
+        matrices, transforms, data.technique.transitive_aggregation
+    )
+
+
+def aggregate_scaled_matrices(
+    matrices: [SimilarityMatrix],
+    transforms: [ScalingTransform],
+    aggregation_type: AggregationMethod,
+) -> SimilarityMatrix:
+    """
+    Aggregates the component matrices of a transitive technique after applying their scaling transforms. The
+    first matrix may contain a subset of the rows of its component as each row is aggregated independently.
+    :param matrices: the component matrices from the top to the bottom level
+    :param transforms: the (scale, offset) of each component matrix
+    :param aggregation_type: SUM or MAX
+    :return: SimilarityMatrix between the top and bottom levels
+    """
+    aggregate_matrix = aggregate_with_scaling_transforms(
+        matrices[0], transforms[0], matrices[1], transforms[1], aggregation_type
+    )
+    for matrix, transform in zip(matrices[2:], transforms[2:]):
+        aggregate_matrix = aggregate_with_scaling_transforms(
+            aggregate_matrix, IDENTITY_TRANSFORM, matrix, transform, aggregation_type
+        )
+    return aggregate_matrix
+
+
+def can_fuse_scaling(technique: TransitiveTechniqueDefinition) -> bool:
+    """
+    Returns whether the scaling of the technique can be fused into its aggregation with identical results.
+    Global scaling of more than two components is excluded as scale_transitive_matrices reads the values of
+    the third and later components from offsets that do not correspond to them.
+    :param technique: the transitive technique
+    :return: bool
+    """
+    is_arithmetic = technique.transitive_aggregation in FUSABLE_AGGREGATIONS
+    n_components = len(technique.get_component_techniques())
+    is_global = technique.scaling_method == ScalingMethod.GLOBAL
+    return is_arithmetic and (n_components == 2 or not is_global)
+
+
 TRANSITIVE_TECHNIQUE_PIPELINE = [
     append_direct_component_matrices,
     scale_transitive_matrices,
     perform_transitive_aggregation,
 ]
 
+FUSED_TRANSITIVE_TECHNIQUE_PIPELINE = [
+    append_direct_component_matrices,
+    perform_scaled_transitive_aggregation,
+]
+
 
 class TransitiveTechniqueCalculator(ITechniqueCalculator[TransitiveTechniqueData]):
     """
@@ -112,7 +219,11 @@ class TransitiveTechniqueCalculator(ITechniqueCalculator[TransitiveTechniqueData
     ):
         super().__init__(technique_definition, pipeline)
         if pipeline is None:
-            pipeline = TRANSITIVE_TECHNIQUE_PIPELINE
+            pipeline = (
+                FUSED_TRANSITIVE_TECHNIQUE_PIPELINE
+                if can_fuse_scaling(technique_definition)
+                else TRANSITIVE_TECHNIQUE_PIPELINE
+            )
         self.pipeline = pipeline
 
     def create_pipeline_data(self, dataset: Dataset) -> TransitiveTechniqueData:
@@ -0,0 +1,449 @@
+"""
+The following module is responsible for keeping the similarity matrices and per-query metrics of techniques up to
+date with change sets applied to their dataset, recalculating only the rows and columns affected by each change.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import vstack
+
+from api.datasets.change_set import DatasetChanges, LevelChanges, reindex_matrix
+from api.datasets.dataset import Dataset
+from api.metrics.calculator import calculate_query_metrics
+from api.tables.metric_table import Metrics
+from api.technique.definitions.combined.technique import HybridTechniqueDefinition
+from api.technique.definitions.direct.definition import DirectTechniqueDefinition
+from api.technique.definitions.transitive.calculator import (
+    aggregate_scaled_matrices,
+    can_fuse_scaling,
+)
+from api.technique.definitions.transitive.definition import (
+    TransitiveTechniqueDefinition,
+)
+from api.technique.parser.itechnique import ITechnique
+from api.technique.parser.itechnique_definition import ITechniqueDefinition
+from api.technique.variationpoints.aggregation.technique_aggregation_calculator import (
+    aggregate_techniques,
+)
+from api.technique.variationpoints.algebraicmodel.calculate_similarity_matrix import (
+    DocumentTermMatrix,
+    calculate_similarity_matrix_from_term_frequencies,
+    fit_term_frequency_model,
+)
+from api.technique.variationpoints.algebraicmodel.models import (
+    AlgebraicModel,
+    SimilarityMatrix,
+)
+from api.technique.variationpoints.scalers.scalers import (
+    ScalingTransform,
+    get_scaling_transforms,
+)
+from api.technique.variationpoints.tracetype.trace_type import TraceType
+
+TermModel = Tuple[
+    object, DocumentTermMatrix, DocumentTermMatrix
+]  # fitted vectorizer, upper and lower document-term matrices
+
+
+class MatrixChanges:  # pylint: disable=too-few-public-methods
+    """
+    The rows and columns of a similarity matrix whose values changed, in current indices.
+    """
+
+    def __init__(self, rows: Set[int], cols: Set[int]):
+        self.rows = rows
+        self.cols = cols
+
+
+def find_matrix_changes(
+    matrix: SimilarityMatrix,
+    previous_matrix: SimilarityMatrix,
+    row_changes: LevelChanges,
+    col_changes: LevelChanges,
+) -> MatrixChanges:
+    """
+    Returns the rows and columns of matrix that differ from the previous matrix or belong to added artifacts.
+    :param matrix: the current similarity matrix
+    :param previous_matrix: the similarity matrix before the change
+    :param row_changes: the changes of the level represented by the rows
+    :param col_changes: the changes of the level represented by the columns
+    :return: MatrixChanges
+    """
+    differs = matrix != reindex_matrix(previous_matrix, row_changes, col_changes)
+    rows = set(np.flatnonzero(differs.any(axis=1))) | set(
+        np.flatnonzero(row_changes.previous_indices < 0)
+    )
+    cols = set(np.flatnonzero(differs.any(axis=0))) | set(
+        np.flatnonzero(col_changes.previous_indices < 0)
+    )
+    return MatrixChanges({int(i) for i in rows}, {int(i) for i in cols})
+
+
+def update_term_vectors(
+    model, vectors: DocumentTermMatrix, texts: pd.Series, level_changes: LevelChanges
+) -> DocumentTermMatrix:
+    """
+    Returns the document-term matrix of a level after its change, vectorizing only added and modified artifacts.
+    :param model: the fitted vectorizer
+    :param vectors: the document-term matrix before the change
+    :param texts: the texts of the artifacts after the change
+    :param level_changes: the changes of the level
+    :return: DocumentTermMatrix
+    """
+    current_kept, previous_kept = level_changes.get_kept_indices()
+    changed_indices = sorted(level_changes.changed_indices)
+    stacked_vectors = vectors[previous_kept]
+    if len(changed_indices) > 0:
+        changed_vectors = model.transform(texts.iloc[changed_indices])
+        stacked_vectors = vstack([stacked_vectors, changed_vectors]).tocsr()
+
+    selected_rows = np.zeros(len(level_changes.previous_indices), dtype=int)
+    selected_rows[current_kept] = np.arange(len(current_kept))
+    selected_rows[changed_indices] = len(current_kept) + np.arange(len(changed_indices))
+    return stacked_vectors[selected_rows]
+
+
+def is_vsm_technique(definition: ITechniqueDefinition) -> bool:
+    """
+    Returns whether technique directly compares artifacts using their TF-IDF vectors.
+    :param definition: the definition of the technique
+    :return: bool
+    """
+    return (
+        isinstance(definition, DirectTechniqueDefinition)
+        and definition.trace_type == TraceType.NOT_TRACED
+        and definition.algebraic_model == AlgebraicModel.VSM
+    )
+
+
+def is_fusable_transitive_technique(definition: ITechniqueDefinition) -> bool:
+    """
+    Returns whether technique is a deterministic transitive technique whose rows and columns can be aggregated
+    independently.
+    :param definition: the definition of the technique
+    :return: bool
+    """
+    return (
+        isinstance(definition, TransitiveTechniqueDefinition)
+        and not definition.contains_stochastic_technique()
+        and can_fuse_scaling(definition)
+    )
+
+
+class TrackedDataset:
+    """
+    Keeps the similarity matrices of techniques (and their components) calculated on a dataset along with the
+    per-query metrics of techniques that were evaluated. Applying the changes of a change set updates them:
+    - VSM techniques keep their fitted vectorizer and only vectorize and compare added or modified artifacts.
+      The vocabulary and weights of the vectorizer are therefore those of the dataset when it was first tracked.
+    - Transitive techniques re-aggregate only the changed source rows and target columns while the scaling of
+      their components and the middle level are unchanged, otherwise they are re-aggregated in full.
+    - Every other technique (e.g. LSI, hybrid, sampled) is recalculated in full from its updated components.
+    - Metrics are refreshed for queries whose similarities or traces changed, or every query if the targets
+      changed.
+    """
+
+    def __init__(self, dataset: Dataset):
+        self.dataset = dataset
+        self.techniques: Dict[str, ITechnique] = {}
+        self.matrices: Dict[str, SimilarityMatrix] = {}
+        self.term_models: Dict[str, TermModel] = {}
+        self.transforms: Dict[str, List[ScalingTransform]] = {}
+        self.query_metrics: Dict[str, List[Optional[Metrics]]] = {}
+
+    def get_similarity_matrix(self, technique: ITechnique) -> SimilarityMatrix:
+        """
+        Returns the similarity matrix of technique, calculating and tracking it on first access.
+        :param technique: the technique to calculate
+        :return: SimilarityMatrix
+        """
+        name = technique.get_name()
+        if name not in self.matrices:
+            self.matrices[name] = self.calculate_similarity_matrix(technique)
+            self.techniques[name] = technique
+        return self.matrices[name]
+
+    def calculate_similarity_matrix(self, technique: ITechnique) -> SimilarityMatrix:
+        """
+        Calculates the similarity matrix of technique from the tracked matrices of its components.
+        :param technique: the technique to calculate
+        :return: SimilarityMatrix
+        """
+        definition = technique.definition
+        name = technique.get_name()
+        if is_vsm_technique(definition):
+            upper_level, lower_level = definition.artifact_paths
+            upper_texts = self.dataset.artifacts[upper_level]["text"]
+            lower_texts = self.dataset.artifacts[lower_level]["text"]
+            model = fit_term_frequency_model(upper_texts, lower_texts)
+            upper_vectors = model.transform(upper_texts)
+            lower_vectors = model.transform(lower_texts)
+            self.term_models[name] = (model, upper_vectors, lower_vectors)
+            return calculate_similarity_matrix_from_term_frequencies(
+                upper_vectors, lower_vectors
+            )
+        if is_fusable_transitive_technique(definition):
+            matrices = [
+                self.get_similarity_matrix(component)
+                for component in definition.get_component_techniques()
+            ]
+            transforms = get_scaling_transforms(definition.scaling_method, matrices)
+            self.transforms[name] = transforms
+            return aggregate_scaled_matrices(
+                matrices, transforms, definition.transitive_aggregation
+            )
+        if isinstance(definition, HybridTechniqueDefinition):
+            matrices = [
+                self.get_similarity_matrix(component)
+                for component in definition.get_component_techniques()
+            ]
+            return aggregate_techniques(matrices, definition.technique_aggregation)
+        return technique.calculate_technique_data(self.dataset).similarity_matrix
+
+    def get_query_metrics(self, technique: ITechnique) -> List[Metrics]:
+        """
+        Returns the metrics of each query with traced targets, calculating and tracking them on first access.
+        :param technique: the technique to evaluate
+        :return: Metrics per query
+        """
+        name = technique.get_name()
+        if name not in self.query_metrics:
+            similarity_matrix = self.get_similarity_matrix(technique)
+            oracle_matrix = self.get_oracle_matrix(technique.definition)
+            self.query_metrics[name] = [
+                calculate_query_metrics(
+                    oracle_matrix[query_index],
+                    similarity_matrix[query_index],
+                    query_index,
+                )
+                for query_index in range(similarity_matrix.shape[0])
+            ]
+        return [m for m in self.query_metrics[name] if m is not None]
+
+    def get_oracle_matrix(self, definition: ITechniqueDefinition) -> np.ndarray:
+        """
+        Returns the trace matrix between the source and target levels of technique.
+        :param definition: the definition of the technique
+        :return: np.ndarray
+        """
+        return self.dataset.get_oracle_matrix(
+            definition.source_level, definition.target_level
+        )
+
+    def apply_changes(self, changes: DatasetChanges) -> Dict[str, List[int]]:
+        """
+        Updates the tracked similarity matrices and metrics after a change set was applied to the dataset.
+        :param changes: the changes returned by applying the change set
+        :return: the indices of the queries whose metrics were refreshed per evaluated technique
+        """
+        matrix_changes: Dict[str, MatrixChanges] = {}
+        for technique in list(self.techniques.values()):
+            self.update_similarity_matrix(technique, changes, matrix_changes)
+        return {
+            name: self.refresh_query_metrics(
+                self.techniques[name], changes, matrix_changes[name]
+            )
+            for name in self.query_metrics
+        }
+
+    def update_similarity_matrix(
+        self,
+        technique: ITechnique,
+        changes: DatasetChanges,
+        matrix_changes: Dict[str, MatrixChanges],
+    ) -> MatrixChanges:
+        """
+        Updates the similarity matrix of technique after its components have been updated.
+        :param technique: the tracked technique
+        :param changes: the changes of the dataset
+        :param matrix_changes: the changes of techniques already updated, technique is added to it
+        :return: the changed rows and columns of the similarity matrix
+        """
+        name = technique.get_name()
+        if name in matrix_changes:
+            return matrix_changes[name]
+        definition = technique.definition
+        row_changes = changes.levels[definition.source_level]
+        col_changes = changes.levels[definition.target_level]
+        previous_matrix = self.matrices[name]
+
+        if is_vsm_technique(definition):
+            matrix, changed = self.update_vsm_matrix(
+                name, definition, previous_matrix, changes
+            )
+        elif is_fusable_transitive_technique(definition):
+            matrix, changed = self.update_transitive_matrix(
+                name, definition, previous_matrix, changes, matrix_changes
+            )
+        else:
+            if isinstance(definition, HybridTechniqueDefinition):
+                for component in definition.get_component_techniques():
+                    self.update_similarity_matrix(component, changes, matrix_changes)
+            matrix = self.calculate_similarity_matrix(technique)
+            changed = find_matrix_changes(
+                matrix, previous_matrix, row_changes, col_changes
+            )
+        self.matrices[name] = matrix
+        matrix_changes[name] = changed
+        return changed
+
+    def update_vsm_matrix(
+        self,
+        name: str,
+        definition: DirectTechniqueDefinition,
+        previous_matrix: SimilarityMatrix,
+        changes: DatasetChanges,
+    ) -> Tuple[SimilarityMatrix, MatrixChanges]:
+        """
+        Compares the added and modified artifacts of the technique levels with the fitted vectorizer.
+        :param name: the name of the technique
+        :param definition: the VSM technique
+        :param previous_matrix: the similarity matrix before the change
+        :param changes: the changes of the dataset
+        :return: the updated similarity matrix and its changed rows and columns
+        """
+        upper_level, lower_level = definition.artifact_paths
+        row_changes, col_changes = (
+            changes.levels[upper_level],
+            changes.levels[lower_level],
+        )
+        model, upper_vectors, lower_vectors = self.term_models[name]
+        upper_vectors = update_term_vectors(
+            model,
+            upper_vectors,
+            self.dataset.artifacts[upper_level]["text"],
+            row_changes,
+        )
+        lower_vectors = update_term_vectors(
+            model,
+            lower_vectors,
+            self.dataset.artifacts[lower_level]["text"],
+            col_changes,
+        )
+        self.term_models[name] = (model, upper_vectors, lower_vectors)
+
+        matrix = reindex_matrix(previous_matrix, row_changes, col_changes)
+        rows = sorted(row_changes.changed_indices)
+        cols = sorted(col_changes.changed_indices)
+        if len(rows) > 0:
+            matrix[rows] = calculate_similarity_matrix_from_term_frequencies(
+                upper_vectors[rows], lower_vectors
+            )
+        if len(cols) > 0:
+            matrix[:, cols] = calculate_similarity_matrix_from_term_frequencies(
+                upper_vectors, lower_vectors[cols]
+            )
+        return matrix, MatrixChanges(set(rows), set(cols))
+
+    def update_transitive_matrix(
+        self,
+        name: str,
+        definition: TransitiveTechniqueDefinition,
+        previous_matrix: SimilarityMatrix,
+        changes: DatasetChanges,
+        matrix_changes: Dict[str, MatrixChanges],
+    ) -> Tuple[SimilarityMatrix, MatrixChanges]:
+        """
+        Re-aggregates the changed rows and columns of a transitive technique. The whole matrix is re-aggregated if
+        the technique has more than two components or the scaling of its components or its middle level changed.
+        :param name: the name of the technique
+        :param definition: the transitive technique
+        :param previous_matrix: the similarity matrix before the change
+        :param changes: the changes of the dataset
+        :param matrix_changes: the changes of techniques already updated
+        :return: the updated similarity matrix and its changed rows and columns
+        """
+        components = definition.get_component_techniques()
+        component_changes = [
+            self.update_similarity_matrix(component, changes, matrix_changes)
+            for component in components
+        ]
+        matrices = [self.matrices[component.get_name()] for component in components]
+        transforms = get_scaling_transforms(definition.scaling_method, matrices)
+        previous_transforms = self.transforms[name]
+        self.transforms[name] = transforms
+        row_changes = changes.levels[definition.source_level]
+        col_changes = changes.levels[definition.target_level]
+        aggregation_type = definition.transitive_aggregation
+
+        middle_changes = changes.levels[components[0].definition.target_level]
+        can_update_in_place = (
+            len(components) == 2
+            and transforms == previous_transforms
+            and len(component_changes[0].cols) == 0
+            and len(component_changes[1].rows) == 0
+            and not middle_changes.is_reindexed()
+        )
+        if not can_update_in_place:
+            matrix = aggregate_scaled_matrices(matrices, transforms, aggregation_type)
+            changed = find_matrix_changes(
+                matrix, previous_matrix, row_changes, col_changes
+            )
+            return matrix, changed
+
+        matrix = reindex_matrix(previous_matrix, row_changes, col_changes)
+        rows = sorted(component_changes[0].rows)
+        cols = sorted(component_changes[1].cols)
+        if len(rows) > 0:
+            matrix[rows] = aggregate_scaled_matrices(
+                [matrices[0][rows], matrices[1]], transforms, aggregation_type
+            )
+        if len(cols) > 0:
+            matrix[:, cols] = aggregate_scaled_matrices(
+                [matrices[0], matrices[1][:, cols]], transforms, aggregation_type
+            )
+        return matrix, MatrixChanges(set(rows), set(cols))
+
+    def refresh_query_metrics(
+        self,
+        technique: ITechnique,
+        changes: DatasetChanges,
+        matrix_changes: MatrixChanges,
+    ) -> List[int]:
+        """
+        Recalculates the metrics of queries affected by the changes and reindexes the others.
+        :param technique: the evaluated technique
+        :param changes: the changes of the dataset
+        :param matrix_changes: the changed rows and columns of the similarity matrix of technique
+        :return: the indices of the refreshed queries
+        """
+        name = technique.get_name()
+        definition = technique.definition
+        source_level, target_level = definition.source_level, definition.target_level
+        row_changes = changes.levels[source_level]
+        col_changes = changes.levels[target_level]
+        n_queries = len(row_changes.previous_indices)
+
+        if len(matrix_changes.cols) > 0 or col_changes.is_reindexed():
+            refreshed_queries = set(range(n_queries))
+        else:
+            refreshed_queries = set(matrix_changes.rows) | set(
+                int(i) for i in np.flatnonzero(row_changes.previous_indices < 0)
+            )
+            for link_change in changes.changed_links:
+                level_a, index_a, level_b, index_b = link_change
+                if (level_a, level_b) == (source_level, target_level):
+                    refreshed_queries.add(index_a)
+                elif (level_b, level_a) == (source_level, target_level):
+                    refreshed_queries.add(index_b)
+
+        previous_metrics = self.query_metrics[name]
+        query_metrics: List[Optional[Metrics]] = [None] * n_queries
+        for current_index, previous_index in zip(*row_changes.get_kept_indices()):
+            m_entry = previous_metrics[previous_index]
+            if m_entry is not None:
+                query_metrics[current_index] = Metrics(
+                    ap=m_entry.ap,
+                    auc=m_entry.auc,
+                    lag=m_entry.lag,
+                    query_id=int(current_index),
+                )
+        similarity_matrix = self.matrices[name]
+        oracle_matrix = self.get_oracle_matrix(definition)
+        for query_index in refreshed_queries:
+            query_metrics[query_index] = calculate_query_metrics(
+                oracle_matrix[query_index], similarity_matrix[query_index], query_index
+            )
+        self.query_metrics[name] = query_metrics
+        return sorted(refreshed_queries)
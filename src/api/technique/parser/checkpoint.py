@@ -0,0 +1,175 @@
+"""
+The following module is responsible for persisting the state of technique pipelines after each step so that
+long-running techniques interrupted mid-pipeline (e.g. during transitive aggregation) resume from their last
+completed step instead of recalculating earlier steps. Checkpointing is turned off by default.
+"""
+import json
+import os
+import pickle
+from typing import List, Optional
+
+import numpy as np
+
+from api.constants.paths import PATH_TO_CACHE_TEMP
+from api.extension.file_operations import remove_folder
+
+CHECKPOINTS_FOLDER = "checkpoints"
+MANIFEST_FILE_NAME = "manifest.json"
+STATE_FILE_NAME = "state.pkl"
+STEP_FOLDER_PREFIX = "step_"
+UNCHECKPOINTED_ATTRIBUTES = [
+    "dataset",
+    "technique",
+    "step_profiles",
+    "_scoring_table",
+]  # attributes recreated by the pipeline or derived from other attributes
+
+
+class PipelineCheckpoint:
+    """
+    Stores the attributes of pipeline data after each completed step in a folder per dataset and technique.
+    Arrays and lists of arrays are stored as .npy files, any other attribute is pickled.
+    """
+
+    CHECKPOINTS_ON = False
+    path_to_checkpoints = os.path.join(PATH_TO_CACHE_TEMP, CHECKPOINTS_FOLDER)
+
+    @staticmethod
+    def is_checkpointed(dataset) -> bool:
+        """
+        Returns whether pipelines calculated on dataset are checkpointed. Datasets modified in memory by a change
+        set no longer match the dataset on disk that checkpoints are keyed by (see Cache.is_dataset_cacheable).
+        :param dataset: the dataset the pipeline is calculated on
+        :return: bool
+        """
+        return PipelineCheckpoint.CHECKPOINTS_ON and dataset.revision == 0
+
+    @staticmethod
+    def get_path_to_technique(data) -> str:
+        """
+        Returns the path to the folder containing the checkpoints of the data's technique and dataset.
+        :param data: TechniqueData being calculated
+        :return: str
+        """
+        folder_name = "_".join([data.dataset.name, data.technique.get_name()])
+        return os.path.join(PipelineCheckpoint.path_to_checkpoints, folder_name)
+
+    @staticmethod
+    def save(data, completed_steps: List[str]):
+        """
+        Stores the state of data after the given steps have been completed. The manifest is written last so
+        that interrupted writes are never restored.
+        :param data: TechniqueData being calculated
+        :param completed_steps: the names of the pipeline functions applied to data
+        :return: None
+        """
+        path_to_technique = PipelineCheckpoint.get_path_to_technique(data)
+        path_to_step = os.path.join(
+            path_to_technique, STEP_FOLDER_PREFIX + str(len(completed_steps))
+        )
+        remove_folder(path_to_step)
+        os.makedirs(path_to_step)
+
+        manifest = {"completed_steps": completed_steps, "arrays": [], "array_lists": {}}
+        state = {}
+        for attribute, value in vars(data).items():
+            if attribute in UNCHECKPOINTED_ATTRIBUTES:
+                continue
+            if isinstance(value, np.ndarray):
+                np.save(os.path.join(path_to_step, attribute + ".npy"), value)
+                manifest["arrays"].append(attribute)
+            elif is_array_list(value):
+                for array_index, array in enumerate(value):
+                    file_name = "%s_%d.npy" % (attribute, array_index)
+                    np.save(os.path.join(path_to_step, file_name), array)
+                manifest["array_lists"][attribute] = len(value)
+            else:
+                state[attribute] = value
+        with open(os.path.join(path_to_step, STATE_FILE_NAME), "wb") as state_file:
+            pickle.dump(state, state_file)
+        with open(os.path.join(path_to_step, MANIFEST_FILE_NAME), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        for folder_name in os.listdir(path_to_technique):
+            if folder_name != os.path.basename(path_to_step):
+                remove_folder(os.path.join(path_to_technique, folder_name))
+
+    @staticmethod
+    def restore(data, step_names: List[str]) -> int:
+        """
+        Restores the state of data from the latest checkpoint of its technique and dataset, if any.
+        Checkpoints made by a different pipeline are ignored.
+        :param data: TechniqueData created for the pipeline
+        :param step_names: the names of the pipeline functions to be applied
+        :return: the number of steps completed in the restored state (0 if none was restored)
+        """
+        path_to_step = PipelineCheckpoint.get_path_to_latest_step(data)
+        if path_to_step is None:
+            return 0
+        with open(os.path.join(path_to_step, MANIFEST_FILE_NAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+        completed_steps = manifest["completed_steps"]
+        if completed_steps != step_names[: len(completed_steps)]:
+            return 0
+
+        with open(os.path.join(path_to_step, STATE_FILE_NAME), "rb") as state_file:
+            for attribute, value in pickle.load(state_file).items():
+                setattr(data, attribute, value)
+        for attribute in manifest["arrays"]:
+            setattr(
+                data, attribute, np.load(os.path.join(path_to_step, attribute + ".npy"))
+            )
+        for attribute, n_arrays in manifest["array_lists"].items():
+            arrays = [
+                np.load(os.path.join(path_to_step, "%s_%d.npy" % (attribute, i)))
+                for i in range(n_arrays)
+            ]
+            setattr(data, attribute, arrays)
+        return len(completed_steps)
+
+    @staticmethod
+    def get_path_to_latest_step(data) -> Optional[str]:
+        """
+        Returns the path to the latest complete checkpoint of data's technique and dataset.
+        :param data: TechniqueData being calculated
+        :return: str - path to folder or None if no complete checkpoint exists
+        """
+        path_to_technique = PipelineCheckpoint.get_path_to_technique(data)
+        if not os.path.isdir(path_to_technique):
+            return None
+        step_folders = [
+            folder_name
+            for folder_name in os.listdir(path_to_technique)
+            if folder_name.startswith(STEP_FOLDER_PREFIX)
+            and os.path.isfile(
+                os.path.join(path_to_technique, folder_name, MANIFEST_FILE_NAME)
+            )
+        ]
+        if len(step_folders) == 0:
+            return None
+        latest_folder = max(
+            step_folders, key=lambda f: int(f[len(STEP_FOLDER_PREFIX) :])
+        )
+        return os.path.join(path_to_technique, latest_folder)
+
+    @staticmethod
+    def remove(data):
+        """
+        Removes the checkpoints of data's technique and dataset, e.g. once the pipeline has completed.
+        :param data: TechniqueData being calculated
+        :return: None
+        """
+        remove_folder(PipelineCheckpoint.get_path_to_technique(data))
+
+
+def is_array_list(value) -> bool:
+    """
+    Returns whether value is a non-empty list containing only arrays.
+    :param value: any attribute value
+    :return: bool
+    """
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(item, np.ndarray) for item in value)
+    )
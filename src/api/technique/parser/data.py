@@ -1,7 +1,7 @@
 """
 TODO
 """
-from typing import Union
+from typing import Dict, List, Optional
 
 from api.datasets.dataset import Dataset
 from api.tables.scoring_table import ScoringTable
@@ -13,28 +13,56 @@ from api.technique.variationpoints.algebraicmodel.models import SimilarityMatrix
 class TechniqueData:
     """
     The base class for describing the technique_data that persists between a technique's
-    computational steps.
+    computational steps. Intermediate values (e.g. component matrices) are released once the pipeline has
+    calculated the similarity matrix unless RETAIN_INTERMEDIATES is set. The scoring table is built on first
+    request and reused until the similarity matrix changes.
     """
 
+    RETAIN_INTERMEDIATES = False
+
     def __init__(self, dataset: Dataset, technique: ITechniqueDefinition):
         self.dataset: Dataset = dataset
         self.technique: itechnique_definition = technique
-        self.similarity_matrix: Union[
-            SimilarityMatrix, None
+        self._scoring_table: Optional[ScoringTable] = None
+        self._similarity_matrix: Optional[
+            SimilarityMatrix
         ] = None  # matrix of simlarity scores between source & target artifacts
+        self.step_profiles: List[Dict] = []  # records of PipelineProfiler, if enabled
+
+    @property
+    def similarity_matrix(self) -> Optional[SimilarityMatrix]:
+        """
+        The similarity scores between source and target artifacts, None until calculated.
+        :return: SimilarityMatrix
+        """
+        return self._similarity_matrix
+
+    @similarity_matrix.setter
+    def similarity_matrix(self, similarity_matrix: Optional[SimilarityMatrix]):
+        self._similarity_matrix = similarity_matrix
+        self._scoring_table = None
+
+    def release_intermediates(self):
+        """
+        Removes the intermediate values used to calculate the similarity matrix. Subclasses holding
+        intermediate values override this method.
+        :return: None
+        """
 
     def get_scoring_table(self) -> ScoringTable:
         """
-        TODO
-        :return:
+        Returns the table of predicted and oracle values, building it on first call.
+        :return: ScoringTable
         """
         assert self.similarity_matrix is not None, "similarity table was not computed"
-        return create_similarity_scoring_table_from_matrix(
-            self.dataset,
-            self.technique.source_level,
-            self.technique.target_level,
-            self.similarity_matrix,
-        )
+        if self._scoring_table is None:
+            self._scoring_table = create_similarity_scoring_table_from_matrix(
+                self.dataset,
+                self.technique.source_level,
+                self.technique.target_level,
+                self.similarity_matrix,
+            )
+        return self._scoring_table
 
     def get_similarity_matrix(self) -> SimilarityMatrix:
         """
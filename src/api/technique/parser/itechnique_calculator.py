@@ -26,18 +26,22 @@ class ITechniqueCalculator(
     def calculate_technique_data(self, dataset: Dataset) -> GenericOutputData:
         """
         The runs the set pipeline on technique_data created from create_pipeline_data and returns result.
-        If subclasses are stochastic calculators override this method and implement to implement
-        management of cached states when cache is on. This function will always recalculate techniques
-        if cache is off.
+        Stochastic techniques (e.g. sampled techniques without a seed) are always recalculated, seeded
+        techniques are cached under a name containing their seed. This function will always recalculate
+        techniques if cache is off.
         :param dataset: contains the artifacts levels to run the technique on.
         :return: the technique_data after mutated by pipeline functions
         """
-        if Cache.CACHE_ON and not self.definition.contains_stochastic_technique():
+        if (
+            Cache.get_config().cache_on
+            and not self.definition.contains_stochastic_technique()
+        ):
+            similarity_matrix = None
             if Cache.is_cached(dataset, self.definition):
+                similarity_matrix = Cache.get_similarities(dataset, self.definition)
+            if similarity_matrix is not None:
                 data = self.create_pipeline_data(dataset)
-                data.similarity_matrix = Cache.get_similarities(
-                    dataset, self.definition
-                )
+                data.similarity_matrix = similarity_matrix
             else:
                 data = self.run_pipeline_on_dataset(dataset)
                 Cache.store_similarities(
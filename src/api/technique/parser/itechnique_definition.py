@@ -118,6 +118,13 @@ class ITechniqueDefinition(ABC):
             )
         )
 
+    def get_component_techniques(self) -> list:
+        """
+        Returns the techniques this technique is composed of, empty for techniques without components.
+        :return: list of ITechnique
+        """
+        return self._component_techniques
+
 
 def stringify_paths(artifact_paths: ArtifactPathType) -> str:
     """
@@ -2,10 +2,12 @@
 TODO
 """
 from abc import abstractmethod
-from typing import Callable, TypeVar, Generic
+from typing import Callable, Generic, List, TypeVar
 
 from api.datasets.dataset import Dataset
+from api.technique.parser.checkpoint import PipelineCheckpoint
 from api.technique.parser.data import TechniqueData
+from api.technique.parser.profiler import PipelineProfiler, TECHNIQUE_STEP_NAME
 
 PipelineFunction = Callable[[TechniqueData], None]
 Pipeline = [PipelineFunction]
@@ -34,11 +36,86 @@ class TechniquePipeline(Generic[GenericOutputData]):
 
     def run_pipeline_on_dataset(self, dataset: Dataset) -> GenericOutputData:
         """
-        TODO
-        :param dataset:
-        :return:
+        Creates the pipeline data for given dataset and applies each pipeline step to it. If PipelineProfiler is
+        enabled the measurements of each step and of the whole pipeline are appended to the data's step_profiles.
+        If PipelineCheckpoint is enabled the data is checkpointed after each step and the pipeline resumes from
+        the last completed step of a previous, interrupted run.
+        Intermediate values are released once the similarity matrix is calculated unless they are retained.
+        :param dataset: the dataset to run the technique on
+        :return: the data after being mutated by each step
         """
         data = self.create_pipeline_data(dataset)
-        for p_func in self.pipeline:
-            p_func(data)
+        first_step_index = 0
+        if PipelineCheckpoint.is_checkpointed(dataset):
+            first_step_index = PipelineCheckpoint.restore(data, self.get_step_names())
+
+        if PipelineProfiler.PROFILING_ON:
+            self.run_profiled_pipeline(data, first_step_index)
+        else:
+            for step_index in range(first_step_index, len(self.pipeline)):
+                self.pipeline[step_index](data)
+                self.checkpoint_step(data, step_index)
+
+        if PipelineCheckpoint.is_checkpointed(dataset):
+            PipelineCheckpoint.remove(data)
+        if data.similarity_matrix is not None and not data.RETAIN_INTERMEDIATES:
+            data.release_intermediates()
         return data
+
+    def run_profiled_pipeline(self, data: TechniqueData, first_step_index: int = 0):
+        """
+        Applies each pipeline step to data while recording the measurements of each step and the whole pipeline.
+        :param data: the pipeline data
+        :param first_step_index: the index of the first step to apply, previous steps were restored
+        :return: None
+        """
+        technique_name = data.technique.get_name()
+        technique_measurement = PipelineProfiler.start()
+        try:
+            for step_index in range(first_step_index, len(self.pipeline)):
+                p_func = self.pipeline[step_index]
+                step_measurement = PipelineProfiler.start()
+                try:
+                    p_func(data)
+                    data.step_profiles.append(
+                        PipelineProfiler.stop(
+                            step_measurement,
+                            data.dataset.name,
+                            technique_name,
+                            p_func.__name__,
+                        )
+                    )
+                finally:
+                    PipelineProfiler.discard(step_measurement)  # if the step failed
+                self.checkpoint_step(data, step_index)
+            data.step_profiles.append(
+                PipelineProfiler.stop(
+                    technique_measurement,
+                    data.dataset.name,
+                    technique_name,
+                    TECHNIQUE_STEP_NAME,
+                )
+            )
+        finally:
+            PipelineProfiler.discard(technique_measurement)  # if a step failed
+
+    def checkpoint_step(self, data: TechniqueData, step_index: int):
+        """
+        Checkpoints data after the step at given index if checkpointing is on. The last step is not checkpointed
+        since its result is returned immediately.
+        :param data: the pipeline data
+        :param step_index: the index of the step completed
+        :return: None
+        """
+        if (
+            PipelineCheckpoint.is_checkpointed(data.dataset)
+            and step_index < len(self.pipeline) - 1
+        ):
+            PipelineCheckpoint.save(data, self.get_step_names()[: step_index + 1])
+
+    def get_step_names(self) -> List[str]:
+        """
+        Returns the names of the functions in the pipeline.
+        :return: list of str
+        """
+        return [p_func.__name__ for p_func in self.pipeline]
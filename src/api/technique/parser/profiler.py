@@ -0,0 +1,168 @@
+"""
+The following module is responsible for measuring the steps of technique pipelines. When profiling is enabled
+each pipeline step and each technique records its wall time, CPU time and peak allocated bytes (via tracemalloc).
+Records are attached to the resulting TechniqueData and collected so that the trace of an entire run (e.g. a grid
+of techniques) can be exported as JSON lines.
+
+Pipelines may be profiled in concurrent threads: each thread keeps its own nested measurements and records are
+collected from every thread. CPU time and peak bytes are measured for the whole process, so they include the work
+of other threads running at the same time; profile a single thread for precise values.
+"""
+import json
+import threading
+import time
+import tracemalloc
+from typing import Dict, List
+
+TECHNIQUE_STEP_NAME = (
+    "technique"  # the step name of records measuring an entire pipeline
+)
+PROFILE_COLUMNS = [
+    "dataset",
+    "technique",
+    "step",
+    "wall_time",
+    "cpu_time",
+    "peak_bytes",
+]
+
+
+class Measurement:
+    """
+    The state of a step being measured.
+    """
+
+    def __init__(self):
+        self.start_wall_time = time.perf_counter()
+        self.start_cpu_time = time.process_time()
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.peak_bytes = (
+            0  # absolute peaks observed before nested steps reset the peak
+        )
+
+
+class PipelineProfiler:
+    """
+    Collects the measurements of pipeline steps. Profiling is disabled by default, see enable.
+    """
+
+    PROFILING_ON = False
+    records: List[Dict] = []
+    lock = threading.Lock()  # guards records
+    thread_state = threading.local()  # the measurements active in each thread
+    _started_tracemalloc = False
+
+    @staticmethod
+    def enable():
+        """
+        Turns on profiling and starts tracing memory allocations if not already traced.
+        :return: None
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            PipelineProfiler._started_tracemalloc = True
+        PipelineProfiler.PROFILING_ON = True
+
+    @staticmethod
+    def disable():
+        """
+        Turns off profiling and stops tracing memory allocations if tracing was started by enable.
+        :return: None
+        """
+        PipelineProfiler.PROFILING_ON = False
+        if PipelineProfiler._started_tracemalloc:
+            tracemalloc.stop()
+            PipelineProfiler._started_tracemalloc = False
+
+    @staticmethod
+    def reset():
+        """
+        Removes all collected records.
+        :return: None
+        """
+        with PipelineProfiler.lock:
+            PipelineProfiler.records = []
+        PipelineProfiler.thread_state.measurements = []
+
+    @staticmethod
+    def get_active_measurements() -> List[Measurement]:
+        """
+        Returns the measurements started and not yet stopped by the current thread.
+        :return: list of Measurement, outermost first
+        """
+        if not hasattr(PipelineProfiler.thread_state, "measurements"):
+            PipelineProfiler.thread_state.measurements = []
+        return PipelineProfiler.thread_state.measurements
+
+    @staticmethod
+    def start() -> Measurement:
+        """
+        Starts measuring a step, steps may be nested (e.g. component techniques).
+        :return: Measurement to be passed to stop
+        """
+        current_peak = tracemalloc.get_traced_memory()[1]
+        active_measurements = PipelineProfiler.get_active_measurements()
+        for active_measurement in active_measurements:
+            active_measurement.peak_bytes = max(
+                active_measurement.peak_bytes, current_peak
+            )
+        if hasattr(tracemalloc, "reset_peak"):  # python >= 3.9
+            tracemalloc.reset_peak()
+        measurement = Measurement()
+        active_measurements.append(measurement)
+        return measurement
+
+    @staticmethod
+    def discard(measurement: Measurement):
+        """
+        Stops measuring a step without recording it, e.g. when the step failed.
+        :param measurement: the measurement returned by start
+        :return: None
+        """
+        active_measurements = PipelineProfiler.get_active_measurements()
+        if measurement in active_measurements:
+            active_measurements.remove(measurement)
+
+    @staticmethod
+    def stop(
+        measurement: Measurement, dataset_name: str, technique_name: str, step: str
+    ) -> Dict:
+        """
+        Stops measuring given step and records the measurements.
+        :param measurement: the measurement returned by start
+        :param dataset_name: the name of the dataset the technique is calculated on
+        :param technique_name: the name of the technique
+        :param step: the name of the pipeline step
+        :return: dict containing a value for each of PROFILE_COLUMNS
+        """
+        active_measurements = PipelineProfiler.get_active_measurements()
+        active_measurements.remove(measurement)
+        peak_bytes = max(measurement.peak_bytes, tracemalloc.get_traced_memory()[1])
+        for active_measurement in active_measurements:
+            active_measurement.peak_bytes = max(
+                active_measurement.peak_bytes, peak_bytes
+            )
+        record = {
+            "dataset": dataset_name,
+            "technique": technique_name,
+            "step": step,
+            "wall_time": time.perf_counter() - measurement.start_wall_time,
+            "cpu_time": time.process_time() - measurement.start_cpu_time,
+            "peak_bytes": max(peak_bytes - measurement.start_bytes, 0),
+        }
+        with PipelineProfiler.lock:
+            PipelineProfiler.records.append(record)
+        return record
+
+    @staticmethod
+    def export_trace(path_to_file: str):
+        """
+        Writes the collected records to given file, one JSON object per line.
+        :param path_to_file: where to write the trace
+        :return: None
+        """
+        with PipelineProfiler.lock:
+            records = list(PipelineProfiler.records)
+        with open(path_to_file, "w") as trace_file:
+            for record in records:
+                trace_file.write(json.dumps(record) + "\n")
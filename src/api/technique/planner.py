@@ -0,0 +1,143 @@
+"""
+The following module is responsible for evaluating a batch of technique definitions at once. The definitions are
+parsed into a single directed acyclic graph whose nodes are the unique (sub-)techniques identified by their name
+so that techniques shared between definitions (e.g. direct components) are calculated only once. Stochastic
+techniques are never merged, each one draws its own sample as if it were calculated on its own.
+"""
+from typing import Dict, List
+
+from api.datasets.dataset import Dataset
+from api.extension.cache import Cache
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.parser.data import TechniqueData
+from api.technique.parser.itechnique import ITechnique
+
+
+class TechniqueNode:
+    """
+    A unique technique in a plan along with the names of the techniques it depends on.
+    """
+
+    def __init__(self, technique: ITechnique, dependencies: List[str]):
+        """
+        :param technique: the technique represented by the node
+        :param dependencies: the keys of the nodes of the technique's components, in the order of the components
+        """
+        self.technique = technique
+        self.name = technique.get_name()
+        self.dependencies = dependencies
+
+
+class CalculatedTechnique:
+    """
+    Stands in for a component technique whose data has already been calculated by the plan so that parent
+    techniques reuse the result instead of recalculating it.
+    """
+
+    def __init__(self, technique: ITechnique, technique_data: TechniqueData):
+        self.definition = technique.definition
+        self.calculator = technique.calculator
+        self.technique_data = technique_data
+
+    def calculate_technique_data(self, dataset: Dataset) -> TechniqueData:
+        """
+        Returns the previously calculated technique data.
+        :param dataset: the dataset the data was calculated on
+        :return: TechniqueData
+        """
+        assert dataset == self.technique_data.dataset, "data calculated on %s" % (
+            self.technique_data.dataset.name
+        )
+        return self.technique_data
+
+    def get_name(self) -> str:
+        """
+        Returns the name of the calculated technique.
+        :return: str
+        """
+        return self.definition.get_name()
+
+
+class TechniquePlan:
+    """
+    Parses a batch of technique definitions into a graph of unique techniques and calculates each one once,
+    in dependency order. Nodes are keyed by the name of their technique, stochastic techniques get a key of their
+    own so that they are not merged.
+    """
+
+    def __init__(self, technique_definitions: List[str]):
+        self.requested_names: List[str] = []  # node keys of the requested techniques
+        self.nodes: Dict[str, TechniqueNode] = {}  # in dependency order
+        for technique_definition in technique_definitions:
+            technique = create_technique_from_name(technique_definition)
+            self.requested_names.append(self.add_technique(technique))
+
+    def add_technique(self, technique: ITechnique) -> str:
+        """
+        Adds the technique and its components to the plan if not already present.
+        :param technique: the technique to add
+        :return: the key of the node representing the technique
+        """
+        key = technique.get_name()
+        if technique.definition.contains_stochastic_technique():
+            key = "%s#%d" % (key, len(self.nodes))
+        if key not in self.nodes:
+            dependencies = [
+                self.add_technique(component)
+                for component in technique.definition.get_component_techniques()
+            ]
+            self.nodes[key] = TechniqueNode(technique, dependencies)
+        return key
+
+    def get_execution_order(self) -> List[str]:
+        """
+        Returns the keys of the unique techniques in the plan, each one after its dependencies.
+        :return: list of node keys
+        """
+        return list(self.nodes.keys())
+
+    def get_required_nodes(self, dataset: Dataset) -> List[str]:
+        """
+        Returns the names of the techniques that need to be calculated to produce the requested techniques. The
+        components of techniques stored in the cache are not required.
+        :param dataset: the dataset the plan is executed on
+        :return: list of node keys
+        """
+        required_names = set()
+
+        def visit(name: str):
+            if name in required_names:
+                return
+            required_names.add(name)
+            definition = self.nodes[name].technique.definition
+            is_cached = not definition.contains_stochastic_technique() and (
+                Cache.is_cached(dataset, definition)
+            )
+            if not is_cached:
+                for dependency in self.nodes[name].dependencies:
+                    visit(dependency)
+
+        for requested_name in self.requested_names:
+            visit(requested_name)
+        return [name for name in self.get_execution_order() if name in required_names]
+
+    def execute(self, dataset: Dataset) -> List[TechniqueData]:
+        """
+        Calculates every required technique once, in dependency order, substituting the components of each
+        technique with their calculated data. The components are substituted in a fresh copy of each technique so
+        the plan can be executed again, e.g. on another dataset.
+        :param dataset: the dataset to calculate techniques on
+        :return: list of TechniqueData, one per requested definition (in the order given)
+        """
+        calculated_data: Dict[str, TechniqueData] = {}
+        for name in self.get_required_nodes(dataset):
+            node = self.nodes[name]
+            technique = create_technique_from_name(node.name)
+            components = technique.definition.get_component_techniques()
+            for component_index, dependency in enumerate(node.dependencies):
+                if dependency in calculated_data:
+                    components[component_index] = CalculatedTechnique(
+                        self.nodes[dependency].technique, calculated_data[dependency]
+                    )
+            calculated_data[name] = technique.calculate_technique_data(dataset)
+        return [calculated_data[name] for name in self.requested_names]
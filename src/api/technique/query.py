@@ -0,0 +1,240 @@
+"""
+The following module is responsible for calculating the similarities between a single source artifact (or a block
+of source artifacts) and every target artifact of a technique without calculating the similarities of the other
+source artifacts.
+"""
+import threading
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+from sklearn.metrics import pairwise_distances
+
+from api.datasets.dataset import Dataset
+from api.extension.single_flight import SingleFlight
+from api.technique.definitions.direct.calculator import (
+    get_document_term_matrices,
+    get_lsi_projections,
+)
+from api.technique.definitions.direct.definition import DirectTechniqueDefinition
+from api.technique.definitions.transitive.calculator import (
+    aggregate_scaled_matrices,
+    can_fuse_scaling,
+)
+from api.technique.definitions.transitive.definition import (
+    TransitiveTechniqueDefinition,
+)
+from api.technique.parser.itechnique import ITechnique
+from api.technique.parser.itechnique_definition import ITechniqueDefinition
+from api.technique.variationpoints.algebraicmodel.models import (
+    AlgebraicModel,
+    SimilarityMatrix,
+)
+from api.technique.variationpoints.scalers.scalers import get_scaling_transforms
+from api.technique.variationpoints.tracetype.trace_type import TraceType
+
+QueryKey = Tuple[str, str]  # dataset name, technique name
+RankedTargets = List[Tuple[str, float]]  # target artifact id and similarity score
+DEFAULT_BLOCK_SIZE = 256  # source artifacts whose similarities are calculated at once
+
+
+class QueryCache:
+    """
+    Keeps the artifact vectors and component similarity matrices needed to answer queries in memory so that
+    subsequent queries on the same dataset only calculate the row being queried. Entries requested by concurrent
+    threads are calculated once.
+    """
+
+    def __init__(self):
+        self.vectors: Dict[QueryKey, Tuple] = {}  # upper and lower artifact vectors
+        self.matrices: Dict[QueryKey, SimilarityMatrix] = {}
+        self.lock = threading.RLock()  # guards vectors and matrices
+        self.computations = SingleFlight()
+
+    def get_entry(self, entry_type: str, key: QueryKey, calculate: Callable):
+        """
+        Returns the entry under key, calculating and storing it if it is missing.
+        :param entry_type: either vectors or matrices
+        :param key: the dataset and technique name of the entry
+        :param calculate: calculates the entry
+        :return: the entry
+        """
+        entries = getattr(self, entry_type)
+        with self.lock:
+            if key in entries:
+                return entries[key]
+
+        def calculate_and_store():
+            with self.lock:
+                if key in entries:  # stored by the previous computation of key
+                    return entries[key]
+            entry = calculate()
+            with self.lock:
+                entries[key] = entry
+            return entry
+
+        return self.computations.run((entry_type, key), calculate_and_store)
+
+    def remove_dataset(self, dataset: Dataset):
+        """
+        Removes every entry calculated on given dataset.
+        :param dataset: the dataset whose entries are removed
+        :return: None
+        """
+        with self.lock:
+            for entries in [self.vectors, self.matrices]:
+                for key in [key for key in entries if key[0] == dataset.name]:
+                    del entries[key]
+
+
+def calculate_query_similarities(
+    technique: ITechnique, dataset: Dataset, source_index: int, query_cache: QueryCache
+) -> np.ndarray:
+    """
+    Returns the similarities between one source artifact and every target artifact of technique.
+    :param technique: the technique to calculate
+    :param dataset: the dataset containing the artifacts
+    :param source_index: the index of the source artifact in the source level of the technique
+    :param query_cache: where vectors and component matrices are kept between queries
+    :return: vector of similarities, one per target artifact
+    """
+    source_rows = slice(source_index, source_index + 1)
+    return calculate_block_similarities(technique, dataset, source_rows, query_cache)[0]
+
+
+def calculate_block_similarities(
+    technique: ITechnique, dataset: Dataset, source_rows: slice, query_cache: QueryCache
+) -> SimilarityMatrix:
+    """
+    Returns the rows of the similarity matrix of technique belonging to a block of source artifacts. Direct
+    techniques only compare the source artifacts in the block. Transitive techniques with arithmetic aggregations
+    propagate the rows of the block through their components. Every other technique is calculated in full.
+    :param technique: the technique to calculate
+    :param dataset: the dataset containing the artifacts
+    :param source_rows: the indices of the source artifacts in the source level of the technique
+    :param query_cache: where vectors and component matrices are kept between queries
+    :return: SimilarityMatrix with a row per source artifact in block
+    """
+    definition = technique.definition
+    if not supports_block_calculation(definition):
+        return get_similarity_matrix(technique, dataset, query_cache)[source_rows]
+    if isinstance(definition, DirectTechniqueDefinition):
+        return calculate_direct_block_similarities(
+            definition, dataset, source_rows, query_cache
+        )
+    return calculate_transitive_block_similarities(
+        definition, dataset, source_rows, query_cache
+    )
+
+
+def supports_block_calculation(definition: ITechniqueDefinition) -> bool:
+    """
+    Returns whether the rows of the similarity matrix of technique can be calculated independently of each other.
+    :param definition: the definition of the technique
+    :return: bool
+    """
+    if definition.contains_stochastic_technique():
+        return False
+    if isinstance(definition, DirectTechniqueDefinition):
+        return True
+    return isinstance(definition, TransitiveTechniqueDefinition) and can_fuse_scaling(
+        definition
+    )
+
+
+def calculate_direct_block_similarities(
+    definition: DirectTechniqueDefinition,
+    dataset: Dataset,
+    source_rows: slice,
+    query_cache: QueryCache,
+) -> SimilarityMatrix:
+    """
+    Compares the source artifacts in block with every target artifact using the algebraic model of the technique.
+    :param definition: the direct technique
+    :param dataset: the dataset containing the artifacts
+    :param source_rows: the indices of the source artifacts
+    :param query_cache: where the artifact vectors are kept between queries
+    :return: SimilarityMatrix with a row per source artifact in block
+    """
+    upper_level_index, lower_level_index = definition.artifact_paths
+    if definition.trace_type == TraceType.TRACED:
+        trace_id = "%d-%d" % (upper_level_index, lower_level_index)
+        return np.array(dataset.traced_matrices[trace_id][source_rows], dtype=float)
+
+    get_vectors = (
+        get_lsi_projections
+        if definition.algebraic_model == AlgebraicModel.LSI
+        else get_document_term_matrices
+    )
+    upper_vectors, lower_vectors = query_cache.get_entry(
+        "vectors",
+        (dataset.name, definition.get_name()),
+        lambda: get_vectors(dataset, upper_level_index, lower_level_index),
+    )
+    return 1 - pairwise_distances(
+        upper_vectors[source_rows], Y=lower_vectors, metric="cosine"
+    )
+
+
+def calculate_transitive_block_similarities(
+    definition: TransitiveTechniqueDefinition,
+    dataset: Dataset,
+    source_rows: slice,
+    query_cache: QueryCache,
+) -> SimilarityMatrix:
+    """
+    Propagates the rows of the source artifacts in block through the components of the technique. The scaling of
+    each component depends on all of its values, so component matrices are calculated once and kept in the query
+    cache.
+    :param definition: the transitive technique whose aggregation can be fused with its scaling
+    :param dataset: the dataset containing the artifacts
+    :param source_rows: the indices of the source artifacts
+    :param query_cache: where the component matrices are kept between queries
+    :return: SimilarityMatrix with a row per source artifact in block
+    """
+    matrices = [
+        get_similarity_matrix(component, dataset, query_cache)
+        for component in definition.get_component_techniques()
+    ]
+    transforms = get_scaling_transforms(definition.scaling_method, matrices)
+    return aggregate_scaled_matrices(
+        [matrices[0][source_rows]] + matrices[1:],
+        transforms,
+        definition.transitive_aggregation,
+    )
+
+
+def get_similarity_matrix(
+    technique: ITechnique, dataset: Dataset, query_cache: QueryCache
+) -> SimilarityMatrix:
+    """
+    Returns the full similarity matrix of technique, keeping it in the query cache unless it is stochastic.
+    :param technique: the technique to calculate
+    :param dataset: the dataset containing the artifacts
+    :param query_cache: where the matrix is kept between queries
+    :return: SimilarityMatrix
+    """
+    if technique.definition.contains_stochastic_technique():
+        return technique.calculate_technique_data(dataset).similarity_matrix
+    return query_cache.get_entry(
+        "matrices",
+        (dataset.name, technique.get_name()),
+        lambda: technique.calculate_technique_data(dataset).similarity_matrix,
+    )
+
+
+def rank_targets(
+    similarities: np.ndarray, target_ids: List[str], k: int
+) -> RankedTargets:
+    """
+    Returns the k target artifacts with the highest similarities in descending order.
+    :param similarities: vector of similarities, one per target artifact
+    :param target_ids: the ids of the target artifacts
+    :param k: the number of targets to return
+    :return: list of target id and score pairs
+    """
+    k = min(k, len(similarities))
+    if k <= 0:
+        return []
+    top_indices = np.argpartition(-similarities, k - 1)[:k]
+    top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
+    return [(target_ids[i], float(similarities[i])) for i in top_indices]
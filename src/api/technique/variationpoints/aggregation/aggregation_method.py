@@ -16,3 +16,9 @@ class AggregationMethod(Enum):
     SUM = "SUM"
     PCA = "PCA"
     MAX = "MAX"
+
+
+COMMUTATIVE_AGGREGATIONS = [
+    AggregationMethod.SUM,
+    AggregationMethod.MAX,
+]  # aggregations whose result does not depend on the order of their inputs
@@ -16,6 +16,7 @@ from api.technique.variationpoints.algebraicmodel import models
 from api.technique.variationpoints.algebraicmodel.models import (
     SimilarityMatrix,
 )
+from api.technique.variationpoints.scalers.scalers import ScalingTransform
 
 
 def apply_transitive_aggregation(
@@ -117,3 +118,44 @@ def dot_product_with_aggregation(similarity_matrices: models, aggregation_functi
             aggregated_score = aggregation_function(row_col_multiplication)
             result[row_idx, col_idx] = aggregated_score
     return result
+
+
+def aggregate_with_scaling_transforms(
+    upper: SimilarityMatrix,
+    upper_transform: ScalingTransform,
+    lower: SimilarityMatrix,
+    lower_transform: ScalingTransform,
+    aggregation_type: AggregationMethod,
+) -> SimilarityMatrix:
+    """
+    Returns the transitive aggregation of upper and lower after applying their scaling transforms without
+    creating scaled copies of either matrix. Scaled SUM is expanded into a matrix product plus row and column
+    terms, scaled MAX applies the transforms to one row of upper at a time.
+    :param upper: the similarity matrix between the top and middle levels
+    :param upper_transform: the (scale, offset) of upper
+    :param lower: the similarity matrix between the middle and bottom levels
+    :param lower_transform: the (scale, offset) of lower
+    :param aggregation_type: SUM or MAX
+    :return: SimilarityMatrix between the top and bottom levels
+    """
+    upper_scale, upper_offset = upper_transform
+    lower_scale, lower_offset = lower_transform
+    if aggregation_type == AggregationMethod.SUM:
+        n_middle = upper.shape[1]
+        return (
+            upper_scale * lower_scale * (upper @ lower)
+            + upper_scale * lower_offset * upper.sum(axis=1)[:, None]
+            + upper_offset * lower_scale * lower.sum(axis=0)[None, :]
+            + n_middle * upper_offset * lower_offset
+        )
+    if aggregation_type == AggregationMethod.MAX:
+        result = np.zeros(shape=(upper.shape[0], lower.shape[1]))
+        for row_idx in range(upper.shape[0]):
+            scaled_row = upper[row_idx, :] * upper_scale + upper_offset
+            row_col_multiplication = (
+                scaled_row[:, None] * lower * lower_scale
+                + (scaled_row * lower_offset)[:, None]
+            )
+            result[row_idx, :] = row_col_multiplication.max(axis=0)
+        return result
+    raise Exception("Cannot fuse scaling into aggregation: %s" % aggregation_type)
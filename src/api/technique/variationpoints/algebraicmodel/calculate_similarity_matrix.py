@@ -18,6 +18,7 @@ textual documents and as CACHE_COLUMNS each word appearing in the aggregate voca
 the documents. Each entry in the matrix is a number meant to represent how much
 "weight" a given column (word) has in each row (text doc).
 """
+import numpy as np
 import pandas as pd
 from scipy.sparse import csr_matrix, vstack
 from sklearn.decomposition import TruncatedSVD
@@ -25,6 +26,7 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics import pairwise_distances
 
 from api.constants.techniques import ArtifactLevel
+from api.extension.parallelism import Parallelism
 from api.technique.variationpoints.algebraicmodel.models import (
     AlgebraicModel,
     SimilarityMatrix,
@@ -88,15 +90,7 @@ def calculate_lsi_similarity_matrix(raw_a, raw_b) -> (SimilarityMatrix, dict):
     :return {Experiment.Technique.AlgebraicModel} From every doc in A to B
     """
     matrix_a, matrix_b, vocab = create_term_frequency_matrix(raw_a, raw_b)
-    n_components = min(len(raw_a), len(raw_b), 100)  # average number of documents
-
-    # Singular Value Decomposition on Term Frequencies = LSI
-    lsa_model = TruncatedSVD(
-        n_components=n_components, random_state=42, algorithm="arpack"
-    )
-    lsa_model.fit(vstack([matrix_a, matrix_b]))  # essentially appending docs vectorized
-    matrix_a_lsa = lsa_model.transform(matrix_a)
-    matrix_b_lsa = lsa_model.transform(matrix_b)
+    matrix_a_lsa, matrix_b_lsa = calculate_lsi_projections(matrix_a, matrix_b)
 
     similarity_matrix = calculate_similarity_matrix_from_term_frequencies(
         matrix_a_lsa, matrix_b_lsa
@@ -105,6 +99,27 @@ def calculate_lsi_similarity_matrix(raw_a, raw_b) -> (SimilarityMatrix, dict):
     return similarity_matrix, vocab
 
 
+def calculate_lsi_projections(
+    matrix_a: DocumentTermMatrix, matrix_b: DocumentTermMatrix
+) -> (np.ndarray, np.ndarray):
+    """
+    Fits a truncated SVD on the documents of both matrices and projects each into the resulting latent space.
+    :param matrix_a: document-term matrix representing the rows of the similarity matrix
+    :param matrix_b: document-term matrix representing the cols of the similarity matrix
+    :return: the LSI projections of matrix_a and matrix_b
+    """
+    n_components = min(
+        matrix_a.shape[0], matrix_b.shape[0], 100
+    )  # average number of documents
+
+    # Singular Value Decomposition on Term Frequencies = LSI
+    lsa_model = TruncatedSVD(
+        n_components=n_components, random_state=42, algorithm="arpack"
+    )
+    lsa_model.fit(vstack([matrix_a, matrix_b]))  # essentially appending docs vectorized
+    return lsa_model.transform(matrix_a), lsa_model.transform(matrix_b)
+
+
 def calculate_similarity_matrix_from_term_frequencies(
     tf_a: DocumentTermMatrix, tf_b: DocumentTermMatrix
 ) -> SimilarityMatrix:
@@ -114,7 +129,9 @@ def calculate_similarity_matrix_from_term_frequencies(
     :param tf_b:
     :return:
     """
-    return 1 - pairwise_distances(tf_a, Y=tf_b, metric="cosine", n_jobs=-1)
+    return 1 - pairwise_distances(
+        tf_a, Y=tf_b, metric="cosine", n_jobs=Parallelism.get_n_jobs()
+    )
 
 
 def create_term_frequency_matrix(
@@ -128,11 +145,24 @@ def create_term_frequency_matrix(
     :param raw_b : The documents whose matrix is the second element
     :return: CountMatrix for raw_a and raw_b, and also the vocabulary used
     """
-    model = vectorizer()
-    combined = pd.concat([raw_a, raw_b], axis=0)
-
-    model.fit(combined)  # creates vocabulary with features from both A and B
+    model = fit_term_frequency_model(raw_a, raw_b, vectorizer)
     set_a: DocumentTermMatrix = model.transform(raw_a)
     set_b: DocumentTermMatrix = model.transform(raw_b)
 
     return set_a, set_b, model.vocabulary_
+
+
+def fit_term_frequency_model(
+    raw_a: pd.Series, raw_b: pd.Series, vectorizer=TfidfVectorizer
+):
+    """
+    Returns vectorizer whose vocabulary and weights are fitted on the documents of A and B.
+    :param raw_a: The documents of the first set
+    :param raw_b: The documents of the second set
+    :param vectorizer: vectorizer for assigning weights to words, must be one of sklearn.text.extraction
+    :return: the fitted vectorizer
+    """
+    model = vectorizer()
+    combined = pd.concat([raw_a, raw_b], axis=0)
+    model.fit(combined)  # creates vocabulary with features from both A and B
+    return model
@@ -1,6 +1,8 @@
 """
 TODO
 """
+from typing import List, Tuple
+
 import numpy as np
 from sklearn.preprocessing import minmax_scale
 
@@ -62,3 +64,40 @@ def independent_scaling(matrices: [SimilarityMatrix]) -> [SimilarityMatrix]:
         scaled_matrices.append(scaled_matrix)
 
     return scaled_matrices
+
+
+ScalingTransform = Tuple[
+    float, float
+]  # (scale, offset) such that scaled = matrix * scale + offset
+
+
+def get_scaling_transforms(
+    scaling_type: ScalingMethod, matrices: [SimilarityMatrix]
+) -> List[ScalingTransform]:
+    """
+    Returns the affine transform per matrix equivalent to scaling the matrices with the specified scaling method,
+    allowing the scaling to be applied without creating scaled copies of the matrices.
+    :param scaling_type: the scaling method to perform on the matrices
+    :param matrices: list of matrices in technique
+    :return: list of (scale, offset) one per matrix
+    """
+    if scaling_type == ScalingMethod.INDEPENDENT:
+        return [create_minmax_transform(m.min(), m.max()) for m in matrices]
+    if scaling_type == ScalingMethod.GLOBAL:
+        global_transform = create_minmax_transform(
+            min(m.min() for m in matrices), max(m.max() for m in matrices)
+        )
+        return [global_transform] * len(matrices)
+    raise Exception("Unrecognized Scaling type type: ", scaling_type)
+
+
+def create_minmax_transform(min_value: float, max_value: float) -> ScalingTransform:
+    """
+    Returns the affine transform mapping values in [min_value, max_value] onto [0, 1] as done by minmax_scale.
+    :param min_value: the minimum value being scaled
+    :param max_value: the maximum value being scaled
+    :return: (scale, offset)
+    """
+    data_range = max_value - min_value
+    scale = 1.0 / data_range if data_range != 0 else 1.0
+    return scale, -min_value * scale
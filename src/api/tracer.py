@@ -1,35 +1,145 @@
 """
 TODO
 """
-from typing import List
+import threading
+from itertools import product
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+from api.constants.processing import (
+    DATASET_COLNAME,
+    NAME_COLNAME,
+    TECHNIQUE_TYPE_COLNAME,
+)
+from api.datasets.change_set import ChangeSet
 from api.datasets.dataset import Dataset
-from api.metrics.calculator import calculate_metrics_for_scoring_table
-from api.tables.metric_table import Metrics
-from api.technique.definitions.combined.technique import create_technique_from_name
+from api.datasets.dataset_registry import DatasetRegistry
+from api.datasets.shared_dataset import (
+    SharedDataset,
+    SharedDatasetHandle,
+    attach_dataset,
+)
+from api.extension.cache import Cache, CacheConfig
+from api.extension.parallelism import create_process_pool
+from api.extension.single_flight import SingleFlight
+from api.extension.snapshot import load_snapshot, save_snapshot
+from api.metrics.calculator import (
+    calculate_metrics_for_scoring_table,
+    iterate_query_metrics,
+)
+from api.tables.metric_table import MetricTable, Metrics
+from api.technique.definitions.combined.technique import (
+    create_technique_from_name,
+    get_technique_type,
+)
+from api.technique.incremental import TrackedDataset
 from api.technique.parser.data import TechniqueData
+from api.technique.parser.itechnique import ITechnique
+from api.technique.planner import TechniquePlan
+from api.technique.query import (
+    DEFAULT_BLOCK_SIZE,
+    QueryCache,
+    RankedTargets,
+    calculate_block_similarities,
+    calculate_query_similarities,
+    rank_targets,
+    supports_block_calculation,
+)
 
 
 class Tracer:
     """
     Proxy class for parsing technique definitions and evaluating them on given datasets.
+
+    A tracer can be used by concurrent threads. Datasets are loaded once, identical (non-stochastic) computations
+    requested concurrently are calculated once and shared, and change sets are applied one at a time. Change sets
+    edit datasets in place, so they should not be applied while other threads evaluate the same dataset.
     """
 
-    def __init__(self):
-        self.datasets: [Dataset] = []
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        cache_config: Optional[CacheConfig] = None,
+    ):
+        """
+        :param memory_budget: bytes of loaded datasets kept before least recently used ones are evicted, unbounded if
+        None
+        :param cache_config: the cache settings used by this tracer, the global Cache settings are used if None
+        """
+        self.cache_config = cache_config
+        self.datasets = DatasetRegistry(memory_budget)
+        self.query_cache = QueryCache()
+        self.tracked_datasets: Dict[str, TrackedDataset] = {}
+        self.tracking_lock = threading.RLock()  # guards tracked_datasets
+        self.computations = SingleFlight()
+        self.datasets.add_eviction_callback(self.query_cache.remove_dataset)
+        self.datasets.add_eviction_callback(self.remove_tracked_dataset)
 
-    def get_dataset(self, name: str):
+    def calculate_once(self, key: Tuple, technique: ITechnique, calculate: Callable):
         """
-        TODO
-        :param name:
-        :return:
+        Returns the result of calculate, sharing it with concurrent calls using the same key and technique.
+        Stochastic techniques are calculated on every call.
+        :param key: identifies the computation along with the technique name
+        :param technique: the technique calculated
+        :param calculate: calculates the result
+        :return: the result of calculate
+        """
+        if technique.definition.contains_stochastic_technique():
+            return calculate()
+        return self.computations.run(key + (technique.get_name(),), calculate)
+
+    def remove_tracked_dataset(self, dataset: Dataset):
+        """
+        Stops tracking the techniques of dataset.
+        :param dataset: the dataset that is no longer tracked
+        :return: None
+        """
+        with self.tracking_lock:
+            self.tracked_datasets.pop(dataset.name, None)
+
+    def save_snapshot(self, path_to_snapshot: str):
+        """
+        Saves the loaded datasets, the artifact vectors and similarity matrices kept for queries and the tracked
+        techniques so that another process can restore them with load_snapshot.
+        :param path_to_snapshot: the folder to write the snapshot to
+        :return: None
+        """
+        with self.tracking_lock:
+            save_snapshot(
+                path_to_snapshot,
+                self.datasets,
+                self.query_cache,
+                self.tracked_datasets,
+            )
+
+    @staticmethod
+    def load_snapshot(
+        path_to_snapshot: str,
+        memory_budget: Optional[int] = None,
+        cache_config: Optional[CacheConfig] = None,
+    ) -> "Tracer":
+        """
+        Creates a tracer holding the state saved in a snapshot. Matrices are memory-mapped from the snapshot files.
+        :param path_to_snapshot: the folder containing the snapshot
+        :param memory_budget: see constructor
+        :param cache_config: see constructor
+        :return: Tracer
+        """
+        tracer = Tracer(memory_budget, cache_config)
+        load_snapshot(
+            path_to_snapshot,
+            tracer.datasets,
+            tracer.query_cache,
+            tracer.tracked_datasets,
+        )
+        return tracer
+
+    def get_dataset(self, name: str) -> Dataset:
+        """
+        Returns the dataset with given name, loading it on first access.
+        :param name: the name of the dataset
+        :return: Dataset
         """
-        query = list(filter(lambda d: d.name == name, self.datasets))
-        if len(query) == 0:
-            dataset = Dataset(name)
-            self.datasets.append(dataset)
-            return dataset
-        return query[0]
+        return self.datasets.get(name)
 
     def get_technique_data(
         self, dataset_name: str, technique_name: str
@@ -42,8 +152,25 @@ class Tracer:
         """
         dataset: Dataset = self.get_dataset(dataset_name)
         technique = create_technique_from_name(technique_name)
+        with Cache.use_config(self.cache_config):
+            return self.calculate_once(
+                ("technique_data", dataset.name, dataset.revision),
+                technique,
+                lambda: technique.calculate_technique_data(dataset),
+            )
 
-        return technique.calculate_technique_data(dataset)
+    def get_batch_technique_data(
+        self, dataset_name: str, technique_names: List[str]
+    ) -> List[TechniqueData]:
+        """
+        Returns the technique data of each technique, calculating techniques shared between them only once.
+        :param dataset_name: name of dataset
+        :param technique_names: the technique definitions to calculate
+        :return: list of TechniqueData in the order of given technique names
+        """
+        dataset: Dataset = self.get_dataset(dataset_name)
+        with Cache.use_config(self.cache_config):
+            return TechniquePlan(technique_names).execute(dataset)
 
     def get_metrics(
         self, dataset_name: str, technique_name: str, summary_metrics=True
@@ -58,10 +185,228 @@ class Tracer:
         dataset: Dataset = self.get_dataset(dataset_name)
         technique = create_technique_from_name(technique_name)
 
-        technique_data = technique.calculate_technique_data(dataset)
-        scoring_table = technique_data.get_scoring_table()
+        def calculate_metrics() -> List[Metrics]:
+            technique_data = technique.calculate_technique_data(dataset)
+            scoring_table = technique_data.get_scoring_table()
+            n_queries = len(dataset.artifacts[technique.definition.source_level])
+            return calculate_metrics_for_scoring_table(
+                scoring_table, n_queries, summary_metrics=summary_metrics
+            )
+
+        with Cache.use_config(self.cache_config):
+            return self.calculate_once(
+                ("metrics", dataset.name, dataset.revision, summary_metrics),
+                technique,
+                calculate_metrics,
+            )
 
-        n_queries = len(dataset.artifacts[technique.definition.source_level])
-        return calculate_metrics_for_scoring_table(
-            scoring_table, n_queries, summary_metrics=summary_metrics
+    def stream_metrics(
+        self,
+        dataset_name: str,
+        technique_name: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> Iterator[Metrics]:
+        """
+        Yields the metrics of each query as they are calculated, see stream_metric_blocks.
+        :param dataset_name: name of dataset
+        :param technique_name: technique definition to evaluate
+        :param block_size: the number of queries calculated at once
+        :return: Metrics per query with traced targets
+        """
+        for block_metrics in self.stream_metric_blocks(
+            dataset_name, technique_name, block_size
+        ):
+            yield from block_metrics
+
+    def stream_metric_blocks(
+        self,
+        dataset_name: str,
+        technique_name: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> Iterator[List[Metrics]]:
+        """
+        Yields the metrics of the queries in each block of source artifacts. Only the rows of the block are
+        calculated for techniques supporting it, other techniques are calculated in full before the first block.
+        :param dataset_name: name of dataset
+        :param technique_name: technique definition to evaluate
+        :param block_size: the number of queries calculated at once
+        :return: list of Metrics per block, containing one per query with traced targets
+        """
+        dataset: Dataset = self.get_dataset(dataset_name)
+        technique = create_technique_from_name(technique_name)
+        definition = technique.definition
+        oracle_matrix = dataset.get_oracle_matrix(
+            definition.source_level, definition.target_level
         )
+        similarity_matrix = None
+        if not supports_block_calculation(definition):
+            similarity_matrix = self.get_technique_data(
+                dataset_name, technique_name
+            ).similarity_matrix
+
+        n_queries = oracle_matrix.shape[0]
+        for block_start in range(0, n_queries, block_size):
+            source_rows = slice(block_start, min(block_start + block_size, n_queries))
+            if similarity_matrix is None:
+                with Cache.use_config(self.cache_config):
+                    block_similarities = calculate_block_similarities(
+                        technique, dataset, source_rows, self.query_cache
+                    )
+            else:
+                block_similarities = similarity_matrix[source_rows]
+            yield list(
+                iterate_query_metrics(
+                    block_similarities, oracle_matrix[source_rows], block_start
+                )
+            )
+
+    def get_top_k_targets(
+        self,
+        dataset_name: str,
+        technique_name: str,
+        source: Union[str, Tuple[int, int]],
+        k: int = 20,
+    ) -> RankedTargets:
+        """
+        Returns the target artifacts most similar to a single source artifact without calculating the similarities
+        of the other source artifacts where the technique allows it.
+        :param dataset_name: name of dataset
+        :param technique_name: technique definition used to compare artifacts
+        :param source: id of the source artifact or tuple containing its level and index
+        :param k: the number of targets to return
+        :return: list of target id and score pairs in descending order of score
+        """
+        dataset: Dataset = self.get_dataset(dataset_name)
+        technique = create_technique_from_name(technique_name)
+        definition = technique.definition
+
+        if isinstance(source, tuple):
+            level_index, source_index = source
+        else:
+            level_index, source_index = dataset.get_artifact_level_index(source)
+        if level_index != definition.source_level:
+            raise ValueError(
+                "Source artifact is in level %d but technique starts at level %d"
+                % (level_index, definition.source_level)
+            )
+
+        with Cache.use_config(self.cache_config):
+            similarities = calculate_query_similarities(
+                technique, dataset, source_index, self.query_cache
+            )
+        target_ids = list(dataset.artifacts[definition.target_level]["id"])
+        return rank_targets(similarities, target_ids, k)
+
+    def get_tracked_metrics(
+        self, dataset_name: str, technique_name: str
+    ) -> List[Metrics]:
+        """
+        Returns the metrics of each query of technique and keeps its similarity matrix up to date with the change
+        sets applied through apply_change_set.
+        :param dataset_name: name of dataset
+        :param technique_name: technique definition to evaluate
+        :return: Metrics of each query with traced targets
+        """
+        technique = create_technique_from_name(technique_name)
+        with self.tracking_lock, Cache.use_config(self.cache_config):
+            if dataset_name not in self.tracked_datasets:
+                self.tracked_datasets[dataset_name] = TrackedDataset(
+                    self.get_dataset(dataset_name)
+                )
+            return self.tracked_datasets[dataset_name].get_query_metrics(technique)
+
+    def apply_change_set(
+        self, dataset_name: str, change_set: ChangeSet
+    ) -> Dict[str, List[int]]:
+        """
+        Edits the artifacts and trace links of a loaded dataset and recalculates the affected rows and columns of
+        the techniques tracked on it.
+        :param dataset_name: name of dataset
+        :param change_set: the artifacts and trace links to edit
+        :return: the indices of the queries whose metrics were refreshed per tracked technique
+        """
+        dataset = self.get_dataset(dataset_name)
+        with self.tracking_lock, Cache.use_config(self.cache_config):
+            changes = dataset.apply_change_set(change_set)
+            self.query_cache.remove_dataset(dataset)
+            if dataset_name not in self.tracked_datasets:
+                return {}
+            return self.tracked_datasets[dataset_name].apply_changes(changes)
+
+    def get_metrics_batch(
+        self,
+        dataset_names: List[str],
+        technique_names: List[str],
+        n_workers: Optional[int] = None,
+    ) -> MetricTable:
+        """
+        Evaluates every technique on every dataset using a pool of worker processes. Each dataset is loaded once and
+        shared with the workers through shared memory.
+        :param dataset_names: names of the datasets to evaluate on
+        :param technique_names: technique definitions to evaluate
+        :param n_workers: the number of worker processes, by default the cores are split between workers and their
+        threads
+        :return: MetricTable containing dataset, name, technique type, and summary metrics of each evaluation
+        """
+        with Cache.use_config(self.cache_config):
+            cache_config = Cache.get_config()  # the settings of the workers
+        shared_datasets = [
+            SharedDataset(self.get_dataset(dataset_name))
+            for dataset_name in dataset_names
+        ]
+        try:
+            handles = [shared_dataset.handle for shared_dataset in shared_datasets]
+            jobs = list(product(dataset_names, technique_names))
+            with create_process_pool(
+                n_workers,
+                len(jobs),
+                initializer=attach_worker_datasets,
+                initargs=(handles, cache_config),
+            ) as executor:
+                results = list(executor.map(evaluate_on_worker_dataset, jobs))
+        finally:
+            for shared_dataset in shared_datasets:
+                shared_dataset.close()
+
+        metric_table = MetricTable()
+        for dataset_name, technique_name, metrics in results:
+            metric_table.add(
+                [metrics],
+                other={
+                    DATASET_COLNAME: dataset_name,
+                    NAME_COLNAME: technique_name,
+                    TECHNIQUE_TYPE_COLNAME: get_technique_type(technique_name),
+                },
+            )
+        return metric_table
+
+
+_worker_tracer: Optional[
+    Tracer
+] = None  # tracer of each worker process, holds the datasets attached to shared memory
+
+
+def attach_worker_datasets(
+    handles: List[SharedDatasetHandle], cache_config: Optional[CacheConfig] = None
+):
+    """
+    Initializes the tracer of a worker process with the datasets published to shared memory.
+    :param handles: the handles of the published datasets
+    :param cache_config: the cache settings of the worker tracer, see Tracer
+    :return: None
+    """
+    global _worker_tracer  # pylint: disable=global-statement
+    _worker_tracer = Tracer(cache_config=cache_config)
+    for handle in handles:
+        _worker_tracer.datasets.add(attach_dataset(handle))
+
+
+def evaluate_on_worker_dataset(job: Tuple[str, str]) -> Tuple[str, str, Metrics]:
+    """
+    Calculates the summary metrics of technique on dataset attached to the current worker process.
+    :param job: tuple containing the dataset name and technique definition
+    :return: the dataset name, technique definition and resulting metrics
+    """
+    dataset_name, technique_name = job
+    metrics = _worker_tracer.get_metrics(dataset_name, technique_name)[0]
+    return dataset_name, technique_name, metrics
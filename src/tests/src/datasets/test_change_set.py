@@ -0,0 +1,90 @@
+import numpy as np
+
+from api.datasets.change_set import ChangeSet
+from api.datasets.dataset import Dataset
+from api.extension.cache import Cache
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestChangeSet(TestTechniqueHelper):
+    def setUp(self):
+        self.edited_dataset = Dataset(self.d_name)
+
+    def test_add_artifact(self):
+        change_set = ChangeSet().add_artifact(2, "C4", "system log timeout")
+        changes = self.edited_dataset.apply_change_set(change_set)
+        self.assertEqual(
+            ["C1", "C2", "C3", "C4"], list(self.edited_dataset.artifacts[2]["id"])
+        )
+        self.assertEqual([0, 1, 2, -1], list(changes.levels[2].previous_indices))
+        self.assertEqual({3}, changes.levels[2].changed_indices)
+        self.assertTrue(changes.levels[2].is_reindexed())
+        self.assertFalse(changes.levels[0].is_reindexed())
+        self.assertEqual((1, 4), self.edited_dataset.traced_matrices["0-2"].shape)
+        self.assertEqual(0, self.edited_dataset.traced_matrices["1-2"][:, 3].sum())
+        self.assertEqual(1, self.edited_dataset.revision)
+
+    def test_modify_and_delete_artifacts(self):
+        change_set = (
+            ChangeSet()
+            .delete_artifact(1, "D2")
+            .modify_artifact(1, "D3", "logout threshold")
+        )
+        changes = self.edited_dataset.apply_change_set(change_set)
+        level = self.edited_dataset.artifacts[1]
+        self.assertEqual(["D1", "D3"], list(level["id"]))
+        self.assertEqual("logout threshold", level["text"][1])
+        self.assertEqual([0, 2], list(changes.levels[1].previous_indices))
+        self.assertEqual({1}, changes.levels[1].changed_indices)
+        self.assertTrue(
+            np.array_equal([[1, 0]], self.edited_dataset.traced_matrices["0-1"])
+        )
+        self.assertTrue(
+            np.array_equal(
+                [[1, 0, 1], [0, 0, 0]], self.edited_dataset.traced_matrices["1-2"]
+            )
+        )
+
+    def test_edit_links(self):
+        change_set = ChangeSet().add_link("D3", "C2").remove_link("C1", "R1")
+        changes = self.edited_dataset.apply_change_set(change_set)
+        self.assertEqual(1, self.edited_dataset.traced_matrices["1-2"][2, 1])
+        self.assertEqual(0, self.edited_dataset.traced_matrices["0-2"][0, 0])
+        self.assertEqual([(1, 2, 2, 1), (2, 0, 0, 0)], changes.changed_links)
+
+    def test_invalid_edits(self):
+        invalid_change_sets = [
+            ChangeSet().modify_artifact(1, "C1", "text"),
+            ChangeSet().delete_artifact(2, "C4"),
+            ChangeSet().add_artifact(2, "C1", "text"),
+            ChangeSet().add_artifact(3, "E1", "text"),
+        ]
+        for change_set in invalid_change_sets:
+            with self.assertRaises(ValueError):
+                Dataset(self.d_name).apply_change_set(change_set)
+
+    def test_failed_change_set_leaves_dataset_untouched(self):
+        failing_change_sets = [
+            ChangeSet().delete_artifact(0, "R1").delete_artifact(2, "C4"),
+            ChangeSet().delete_artifact(1, "D2").add_link("D1", "C5"),
+        ]
+        for change_set in failing_change_sets:
+            with self.assertRaises(Exception):
+                self.edited_dataset.apply_change_set(change_set)
+            self.assertEqual(["R1"], list(self.edited_dataset.artifacts[0]["id"]))
+            self.assertEqual(
+                ["D1", "D2", "D3"], list(self.edited_dataset.artifacts[1]["id"])
+            )
+            self.assertEqual((1, 3), self.edited_dataset.traced_matrices["0-1"].shape)
+            self.assertEqual((3, 3), self.edited_dataset.traced_matrices["1-2"].shape)
+            self.assertEqual(0, self.edited_dataset.revision)
+
+    def test_edited_dataset_is_not_cached(self):
+        cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        try:
+            self.assertTrue(Cache.is_dataset_cacheable(self.edited_dataset))
+            self.edited_dataset.apply_change_set(ChangeSet())
+            self.assertFalse(Cache.is_dataset_cacheable(self.edited_dataset))
+        finally:
+            Cache.CACHE_ON = cache_on
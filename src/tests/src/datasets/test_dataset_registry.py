@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from api.datasets.dataset_registry import DatasetRegistry, get_dataset_bytes
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestDatasetRegistry(TestTechniqueHelper):
+    dataset_names = ["A", "B", "C"]
+
+    def setUp(self):
+        self.loaded_names = []
+        self.evicted_names = []
+
+    def load_dataset(self, name: str):
+        """
+        Returns the mock dataset under given name, recording each load.
+        """
+        self.loaded_names.append(name)
+        dataset = self.dataset.__class__.__new__(self.dataset.__class__)
+        dataset.__dict__.update(self.dataset.__dict__)
+        dataset.name = name
+        return dataset
+
+    def create_registry(self, n_datasets_in_budget: int) -> DatasetRegistry:
+        memory_budget = n_datasets_in_budget * get_dataset_bytes(self.dataset)
+        registry = DatasetRegistry(memory_budget, load_dataset=self.load_dataset)
+        registry.add_eviction_callback(
+            lambda dataset: self.evicted_names.append(dataset.name)
+        )
+        return registry
+
+    def test_loads_once(self):
+        registry = DatasetRegistry(load_dataset=self.load_dataset)
+        dataset = registry.get("A")
+        self.assertIs(dataset, registry.get("A"))
+        self.assertEqual(["A"], self.loaded_names)
+        self.assertIn("A", registry)
+
+    def test_dataset_bytes(self):
+        matrix_bytes = sum(m.nbytes for m in self.dataset.traced_matrices.values())
+        self.assertGreater(get_dataset_bytes(self.dataset), matrix_bytes)
+
+    def test_evicts_least_recently_used(self):
+        registry = self.create_registry(2)
+        registry.get("A")
+        registry.get("B")
+        registry.get("A")
+        registry.get("C")
+        self.assertEqual(["B"], self.evicted_names)
+        self.assertEqual(2, len(registry))
+        self.assertNotIn("B", registry)
+        registry.get("B")
+        self.assertEqual(["A", "B", "C", "B"], self.loaded_names)
+        self.assertEqual(["B", "A"], self.evicted_names)
+
+    def test_keeps_dataset_over_budget(self):
+        registry = self.create_registry(0)
+        registry.get("A")
+        registry.get("B")
+        self.assertEqual(["A"], self.evicted_names)
+        self.assertIn("B", registry)
+
+    def test_keeps_edited_dataset(self):
+        registry = self.create_registry(1)
+        registry.get("A").revision = 1
+        registry.get("B")
+        registry.get("C")
+        self.assertEqual(["B"], self.evicted_names)
+        self.assertIn("A", registry)
+
+    def test_concurrent_get_loads_once(self):
+        registry = DatasetRegistry(load_dataset=self.load_dataset)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            datasets = list(executor.map(registry.get, ["A"] * 8))
+        self.assertEqual(["A"], self.loaded_names)
+        for dataset in datasets:
+            self.assertIs(datasets[0], dataset)
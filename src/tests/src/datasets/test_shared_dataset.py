@@ -0,0 +1,26 @@
+import numpy as np
+
+from api.datasets.shared_dataset import SharedDataset, attach_dataset
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestSharedDataset(TestTechniqueHelper):
+    def test_attach_dataset(self):
+        with SharedDataset(self.dataset) as shared_dataset:
+            dataset = attach_dataset(shared_dataset.handle)
+            self.assertEqual(self.dataset.name, dataset.name)
+            self.assertEqual(len(self.dataset.artifacts), len(dataset.artifacts))
+            for level, shared_level in zip(self.dataset.artifacts, dataset.artifacts):
+                self.assertTrue(level.equals(shared_level))
+            for trace_id, matrix in self.dataset.traced_matrices.items():
+                shared_matrix = dataset.traced_matrices[trace_id]
+                self.assertTrue(np.array_equal(matrix, shared_matrix))
+                self.assertFalse(shared_matrix.flags.writeable)
+            self.assertTrue(
+                np.array_equal(
+                    self.dataset.get_oracle_matrix(2, 0),
+                    dataset.get_oracle_matrix(2, 0),
+                )
+            )
+            del dataset
+        self.assertEqual(0, len(shared_dataset.blocks))
@@ -1,10 +1,20 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
+from scipy.sparse import csr_matrix
 
 from api.constants.techniques import SIMILARITY_MATRIX_EXTENSION
 from api.datasets.dataset import Dataset
-from api.extension.cache import Cache
+from api.extension.cache import (
+    Cache,
+    CacheConfig,
+    DEFAULT_EVICTION_POLICY,
+    DEFAULT_MAX_CACHE_SIZE,
+    DEFAULT_STORAGE_CODEC,
+)
+from api.extension.cache_policies import EvictionPolicy, StorageCodec
+from api.extension.intermediates import IntermediateType
 from api.tracer import Tracer
 from tests.res.test_technique_helper import TestTechniqueHelper
 
@@ -104,3 +114,180 @@ class TestCache(TestTechniqueHelper):
         self.assertFalse(Cache.is_cached(self.dataset, self.get_direct_definition()))
 
         Cache.CACHE_ON = original_cache_value
+
+    def test_compressed_storage(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.STORAGE_CODEC = StorageCodec.NPZ_COMPRESSED
+        Cache.cleanup(self.dataset.name)
+
+        scores = np.array([[0.1, 0.2, 0.3]])
+        Cache.store_similarities(self.dataset, self.get_direct_definition(), scores)
+        compressed_files = list(
+            filter(
+                lambda f: StorageCodec.NPZ_COMPRESSED.value in f,
+                os.listdir(Cache.path_to_memory),
+            )
+        )
+        self.assertEqual(1, len(compressed_files))
+
+        Cache.reload()
+        similarities = Cache.get_similarities(
+            self.dataset, self.get_direct_definition()
+        )
+        self.assertTrue(np.array_equal(scores, similarities))
+
+        Cache.cleanup(self.dataset.name)
+        Cache.STORAGE_CODEC = DEFAULT_STORAGE_CODEC
+        Cache.CACHE_ON = original_cache_value
+
+    def test_get_evicted_similarities(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup()
+
+        definition = self.get_direct_definition()
+        Cache.store_similarities(self.dataset, definition, np.array([[0.1, 0.2]]))
+        self.assertTrue(Cache.is_cached(self.dataset, definition))
+        os.remove(Cache.query(self.dataset, definition).iloc[0]["file_name"])
+        self.assertIsNone(Cache.get_similarities(self.dataset, definition))
+
+        Cache.cleanup()
+        Cache.CACHE_ON = original_cache_value
+
+    def test_eviction_lru(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup()
+
+        scores = np.array([[0.1, 0.2, 0.3]])
+        Cache.store_similarities(self.dataset, self.get_direct_definition(), scores)
+        Cache.store_similarities(self.dataset, self.get_transitive_definition(), scores)
+        Cache.get_similarities(self.dataset, self.get_direct_definition())
+
+        Cache.MAX_CACHE_SIZE = Cache.get_size() - 1
+        Cache.EVICTION_POLICY = EvictionPolicy.LRU
+        Cache.enforce_budget()
+
+        self.assertTrue(Cache.is_cached(self.dataset, self.get_direct_definition()))
+        self.assertFalse(
+            Cache.is_cached(self.dataset, self.get_transitive_definition())
+        )
+
+        Cache.MAX_CACHE_SIZE = DEFAULT_MAX_CACHE_SIZE
+        Cache.cleanup(self.dataset.name)
+        Cache.CACHE_ON = original_cache_value
+
+    def test_eviction_lfu(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup()
+
+        scores = np.array([[0.1, 0.2, 0.3]])
+        Cache.store_similarities(self.dataset, self.get_direct_definition(), scores)
+        Cache.get_similarities(self.dataset, self.get_direct_definition())
+        Cache.get_similarities(self.dataset, self.get_direct_definition())
+        Cache.store_similarities(self.dataset, self.get_transitive_definition(), scores)
+        Cache.get_similarities(self.dataset, self.get_transitive_definition())
+
+        Cache.EVICTION_POLICY = EvictionPolicy.LFU
+        Cache.MAX_CACHE_SIZE = Cache.get_size() - 1
+        Cache.enforce_budget()
+
+        self.assertTrue(Cache.is_cached(self.dataset, self.get_direct_definition()))
+        self.assertFalse(
+            Cache.is_cached(self.dataset, self.get_transitive_definition())
+        )
+
+        Cache.MAX_CACHE_SIZE = DEFAULT_MAX_CACHE_SIZE
+        Cache.EVICTION_POLICY = DEFAULT_EVICTION_POLICY
+        Cache.cleanup(self.dataset.name)
+        Cache.CACHE_ON = original_cache_value
+
+    def test_intermediates_in_budget(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup()
+
+        entry_type = IntermediateType.DENSE_MATRICES
+        Cache.store_intermediate(
+            self.dataset, "step", "0-1", [np.zeros((10, 10))], entry_type
+        )
+        intermediate_size = Cache.get_size()
+        self.assertGreater(intermediate_size, 0)
+        Cache.reload()
+        self.assertEqual(intermediate_size, Cache.get_size())
+
+        Cache.MAX_CACHE_SIZE = intermediate_size
+        Cache.store_intermediate(
+            self.dataset, "step", "1-2", [np.zeros((10, 10))], entry_type
+        )
+        self.assertFalse(
+            Cache.is_intermediate_cached(self.dataset, "step", "0-1", entry_type)
+        )
+        self.assertTrue(
+            Cache.is_intermediate_cached(self.dataset, "step", "1-2", entry_type)
+        )
+        self.assertEqual(intermediate_size, Cache.get_size())
+
+        Cache.MAX_CACHE_SIZE = DEFAULT_MAX_CACHE_SIZE
+        Cache.cleanup()
+        Cache.CACHE_ON = original_cache_value
+
+    def test_intermediates(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup(self.dataset.name)
+
+        intermediates = [
+            (IntermediateType.SPARSE_MATRIX, csr_matrix(np.array([[0, 1], [1, 0]]))),
+            (IntermediateType.SVD_FACTORS, {"upper": np.array([[0.5, 0.25]])}),
+            (IntermediateType.DENSE_MATRICES, [np.array([[1.0]]), np.array([[2.0]])]),
+            (IntermediateType.VOCABULARY, {"word": 0, "other": 1}),
+        ]
+        for entry_type, value in intermediates:
+            self.assertFalse(
+                Cache.is_intermediate_cached(self.dataset, "step", "0-1", entry_type)
+            )
+            Cache.store_intermediate(self.dataset, "step", "0-1", value, entry_type)
+            self.assertTrue(
+                Cache.is_intermediate_cached(self.dataset, "step", "0-1", entry_type)
+            )
+
+        sparse_matrix = Cache.get_intermediate(
+            self.dataset, "step", "0-1", IntermediateType.SPARSE_MATRIX
+        )
+        self.assertEqual(1, sparse_matrix[0, 1])
+        factors = Cache.get_intermediate(
+            self.dataset, "step", "0-1", IntermediateType.SVD_FACTORS
+        )
+        self.assertEqual(0.25, factors["upper"][0, 1])
+        matrices = Cache.get_intermediate(
+            self.dataset, "step", "0-1", IntermediateType.DENSE_MATRICES
+        )
+        self.assertEqual([1.0, 2.0], [m[0, 0] for m in matrices])
+        vocab = Cache.get_intermediate(
+            self.dataset, "step", "0-1", IntermediateType.VOCABULARY
+        )
+        self.assertEqual({"word": 0, "other": 1}, vocab)
+
+        Cache.cleanup(self.dataset.name)
+        for entry_type, _ in intermediates:
+            self.assertFalse(
+                Cache.is_intermediate_cached(self.dataset, "step", "0-1", entry_type)
+            )
+        Cache.CACHE_ON = original_cache_value
+
+    def test_use_config(self):
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+        config = CacheConfig(cache_on=True, max_cache_size=1)
+        with Cache.use_config(config):
+            self.assertIs(config, Cache.get_config())
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                other_config = executor.submit(Cache.get_config).result()
+            with Cache.use_config(None):
+                self.assertIs(config, Cache.get_config())
+        self.assertFalse(other_config.cache_on)
+        self.assertFalse(Cache.get_config().cache_on)
+        Cache.CACHE_ON = original_cache_value
@@ -0,0 +1,88 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from api.extension.cache import Cache
+from api.extension.cache_statistics import (
+    CacheStatistics,
+    get_bucket_index,
+    get_technique_type,
+)
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestCacheStatistics(TestTechniqueHelper):
+    def test_get_technique_type(self):
+        self.assertEqual("Direct", get_technique_type(self.get_direct_definition()))
+        self.assertEqual(
+            "Transitive", get_technique_type(self.get_transitive_definition())
+        )
+
+    def test_get_bucket_index(self):
+        self.assertEqual(0, get_bucket_index(0.0005))
+        self.assertEqual(1, get_bucket_index(0.005))
+        self.assertEqual(5, get_bucket_index(100))
+
+    def test_concurrent_recording(self):
+        statistics = CacheStatistics()
+
+        def record(dataset_index: int):
+            for technique_index in range(50):
+                statistics.record_lookup(str(dataset_index), str(technique_index), True)
+                statistics.to_dict()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(record, range(8)))
+        self.assertEqual(400, statistics.to_dict()["total"]["hits"])
+
+    def test_to_dict(self):
+        statistics = CacheStatistics()
+        statistics.record_lookup("A", "Direct", True)
+        statistics.record_lookup("A", "Direct", False)
+        statistics.record_lookup("B", "Transitive", True)
+        statistics.record_load("A", "Direct", 100, 0.0001)
+        statistics.record_store("B", "Transitive", 50, 2)
+
+        snapshot = statistics.to_dict()
+        self.assertEqual(2, snapshot["total"]["hits"])
+        self.assertEqual(1, snapshot["total"]["misses"])
+        self.assertAlmostEqual(2 / 3, snapshot["total"]["hit_rate"])
+        self.assertEqual(0.5, snapshot["by_dataset"]["A"]["hit_rate"])
+        self.assertEqual(100, snapshot["by_technique_type"]["Direct"]["bytes_read"])
+        self.assertEqual(50, snapshot["by_dataset"]["B"]["bytes_written"])
+        self.assertEqual(1, snapshot["total"]["load_latency"]["<=0.001s"])
+        self.assertEqual(1, snapshot["total"]["store_latency"]["<=10s"])
+        self.assertEqual(snapshot, json.loads(statistics.to_json()))
+
+        statistics.reset()
+        self.assertEqual(0, statistics.to_dict()["total"]["hits"])
+        self.assertIsNone(statistics.to_dict()["total"]["hit_rate"])
+
+    def test_cache_records_operations(self):
+        Cache.cleanup()
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.statistics.reset()
+        definition = self.get_direct_definition()
+
+        self.assertFalse(Cache.is_cached(self.dataset, definition))
+        Cache.store_similarities(self.dataset, definition, np.array([[0.1, 0.2]]))
+        self.assertTrue(Cache.is_cached(self.dataset, definition))
+        Cache.get_similarities(self.dataset, definition)
+
+        snapshot = Cache.statistics.to_dict()
+        direct_measurements = snapshot["by_technique_type"]["Direct"]
+        self.assertEqual(1, direct_measurements["hits"])
+        self.assertEqual(1, direct_measurements["misses"])
+        self.assertEqual(1, direct_measurements["n_loads"])
+        self.assertEqual(1, direct_measurements["n_stores"])
+        self.assertGreater(direct_measurements["bytes_written"], 0)
+        self.assertEqual(
+            direct_measurements["bytes_written"], direct_measurements["bytes_read"]
+        )
+        self.assertIn(self.d_name, snapshot["by_dataset"])
+
+        Cache.cleanup()
+        Cache.statistics.reset()
+        Cache.CACHE_ON = original_cache_value
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from api.cli import main
+from api.extension.file_operations import read_technique_names
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestCli(TestTechniqueHelper):
+    def run_cli(self, *arguments: str):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = main(["--datasets", self.d_name] + list(arguments), stdout, stderr)
+        self.assertEqual(0, exit_code)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_summary_json_lines(self):
+        stdout, stderr = self.run_cli(
+            "--techniques",
+            self.direct_technique_name,
+            self.transitive_technique_name,
+            "--workers",
+            "1",
+        )
+        rows = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual(2, len(rows))
+        self.assertEqual(
+            {self.direct_technique_name, self.transitive_technique_name},
+            {row["technique"] for row in rows},
+        )
+        for row in rows:
+            self.assertEqual(self.d_name, row["dataset"])
+            self.assertGreaterEqual(row["seconds"], 0)
+            self.assertNotIn("query_id", row)
+        self.assertEqual(2, len(stderr.splitlines()))
+        self.assertIn("[2/2]", stderr)
+
+    def test_query_csv_with_workers(self):
+        stdout, _ = self.run_cli(
+            "--techniques",
+            self.direct_technique_name,
+            "--mode",
+            "query",
+            "--format",
+            "csv",
+            "--workers",
+            "2",
+            "--quiet",
+        )
+        rows = list(csv.DictReader(io.StringIO(stdout)))
+        self.assertEqual(1, len(rows))
+        self.assertEqual("0", rows[0]["query_id"])
+        self.assertEqual("DIRECT", rows[0]["technique_type"])
+
+    def test_read_technique_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path_to_file = os.path.join(directory, "techniques.txt")
+            with open(path_to_file, "w") as file:
+                file.write(
+                    "# direct\n%s\n\n%s\n"
+                    % (self.direct_technique_name, self.transitive_technique_name)
+                )
+            self.assertEqual(
+                [
+                    self.combined_technique_name,
+                    self.direct_technique_name,
+                    self.transitive_technique_name,
+                ],
+                read_technique_names([self.combined_technique_name], path_to_file),
+            )
@@ -0,0 +1,42 @@
+from threadpoolctl import threadpool_info
+
+from api.extension.parallelism import (
+    DEFAULT_N_JOBS,
+    Parallelism,
+    create_process_pool,
+    split_cores,
+)
+from tests.res.smart_test import SmartTest
+
+
+def get_worker_limits():
+    """
+    Returns the n_jobs and BLAS threads of the worker process calling it.
+    """
+    blas_threads = [
+        pool["num_threads"] for pool in threadpool_info() if pool["user_api"] == "blas"
+    ]
+    return Parallelism.get_n_jobs(), blas_threads
+
+
+class TestParallelism(SmartTest):
+    def test_split_cores(self):
+        self.assertEqual((32, 1), split_cores(None, 100, n_cores=32))
+        self.assertEqual((2, 16), split_cores(None, 2, n_cores=32))
+        self.assertEqual((4, 8), split_cores(4, 100, n_cores=32))
+        self.assertEqual((64, 1), split_cores(64, 100, n_cores=32))
+        self.assertEqual((1, 32), split_cores(None, 0, n_cores=32))
+
+    def test_worker_threads_are_limited(self):
+        with create_process_pool(2, 2) as executor:
+            n_jobs, blas_threads = executor.submit(get_worker_limits).result()
+        self.assertGreaterEqual(n_jobs, 1)
+        self.assertTrue(all(n_threads <= n_jobs for n_threads in blas_threads))
+        self.assertEqual(DEFAULT_N_JOBS, Parallelism.get_n_jobs())
+
+    def test_remove_thread_limit(self):
+        original_limits = get_worker_limits()
+        Parallelism.set_thread_limit(1)
+        self.assertEqual((1, [1] * len(original_limits[1])), get_worker_limits())
+        Parallelism.set_thread_limit(None)
+        self.assertEqual(original_limits, get_worker_limits())
@@ -0,0 +1,78 @@
+from api.datasets.dataset import Dataset
+from api.extension.cache import Cache
+from api.extension.precompute import (
+    CACHED_STATUS,
+    COMPUTED_STATUS,
+    PRECOMPUTE_STATUS_COLNAME,
+    get_unique_components,
+    precompute_cache,
+)
+from api.technique.definitions.combined.technique import create_technique_from_name
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestPrecompute(TestTechniqueHelper):
+    def test_get_unique_components(self):
+        direct_names, transitive_names = get_unique_components(
+            [self.combined_technique_name, self.direct_technique_name]
+        )
+        self.assertEqual(3, len(direct_names))
+        self.assertIn(self.direct_technique_name, direct_names)
+        self.assertEqual(1, len(transitive_names))
+
+    def test_stochastic_components_skipped(self):
+        direct_names, transitive_names = get_unique_components(
+            [self.transitive_sampled_artifacts_technique_name]
+        )
+        self.assertEqual(2, len(direct_names))
+        self.assertEqual(0, len(transitive_names))
+
+    def test_precompute_cache(self):
+        Cache.cleanup()
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+
+        table = precompute_cache(
+            [self.d_name], [self.combined_technique_name], n_workers=2
+        )
+        statuses = list(table.table[PRECOMPUTE_STATUS_COLNAME])
+        self.assertEqual([COMPUTED_STATUS] * 4, statuses)
+        self.assertFalse(Cache.CACHE_ON)
+
+        table = precompute_cache(
+            [self.d_name], [self.combined_technique_name], n_workers=2
+        )
+        statuses = list(table.table[PRECOMPUTE_STATUS_COLNAME])
+        self.assertEqual([CACHED_STATUS] * 4, statuses)
+
+        Cache.cleanup()
+        Cache.CACHE_ON = original_cache_value
+
+    def test_precompute_dataset_with_separator_in_name(self):
+        dataset_name = "SAMPLE_EasyClinic"
+        Cache.cleanup(dataset_name)
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+        try:
+            table = precompute_cache(
+                [dataset_name], [self.combined_technique_name], n_workers=2
+            )
+            statuses = list(table.table[PRECOMPUTE_STATUS_COLNAME])
+            self.assertEqual([COMPUTED_STATUS] * 4, statuses)
+
+            Cache.CACHE_ON = True
+            dataset = Dataset(dataset_name)
+            for phase_names in get_unique_components([self.combined_technique_name]):
+                for technique_name in phase_names:
+                    technique = create_technique_from_name(technique_name)
+                    self.assertTrue(Cache.is_cached(dataset, technique.definition))
+            Cache.CACHE_ON = False
+
+            table = precompute_cache(
+                [dataset_name], [self.combined_technique_name], n_workers=2
+            )
+            statuses = list(table.table[PRECOMPUTE_STATUS_COLNAME])
+            self.assertEqual([CACHED_STATUS] * 4, statuses)
+        finally:
+            Cache.cleanup(dataset_name)
+            Cache.CACHE_ON = original_cache_value
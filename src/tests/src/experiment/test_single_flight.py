@@ -0,0 +1,58 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.extension.single_flight import SingleFlight
+from tests.res.smart_test import SmartTest
+
+
+class TestSingleFlight(SmartTest):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.release_event = threading.Event()
+        self.n_calls = 0
+
+    def calculate(self):
+        self.n_calls += 1
+        self.release_event.wait()
+        return self.n_calls
+
+    def wait_for_flight(self):
+        while len(self.single_flight) == 0:
+            self.release_event.wait(0.001)
+
+    def test_shares_concurrent_computation(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.single_flight.run, "key", self.calculate)
+                for _ in range(4)
+            ]
+            self.wait_for_flight()
+            time.sleep(0.1)  # lets the other threads join the computation
+            self.release_event.set()
+            results = [future.result() for future in futures]
+        self.assertEqual([1, 1, 1, 1], results)
+        self.assertEqual(1, self.n_calls)
+        self.assertEqual(0, len(self.single_flight))
+
+    def test_separate_keys(self):
+        self.release_event.set()
+        self.single_flight.run("a", self.calculate)
+        self.single_flight.run("b", self.calculate)
+        self.single_flight.run("a", self.calculate)
+        self.assertEqual(3, self.n_calls)
+
+    def test_propagates_exception(self):
+        def fail():
+            self.release_event.wait()
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.single_flight.run, "key", fail) for _ in range(2)
+            ]
+            self.wait_for_flight()
+            self.release_event.set()
+            for future in futures:
+                self.assertRaises(ValueError, future.result)
+        self.assertEqual(0, len(self.single_flight))
@@ -0,0 +1,99 @@
+from api.constants.processing import (
+    AP_COLNAME,
+    NAME_COLNAME,
+    TECHNIQUE_TYPE_COLNAME,
+)
+from api.constants.techniques import DIRECT_ID, HYBRID_ID, TRANSITIVE_ID
+from api.extension.cache import Cache, CacheConfig
+from api.extension.technique_grid import (
+    TechniqueGrid,
+    evaluate_technique,
+    evaluate_technique_grid,
+    get_technique_type,
+)
+from api.technique.definitions.combined.technique import (
+    create_technique_from_name,
+    get_canonical_name,
+)
+from api.technique.variationpoints.aggregation.aggregation_method import (
+    AggregationMethod,
+)
+from api.technique.variationpoints.algebraicmodel.models import AlgebraicModel
+from api.technique.variationpoints.scalers.scaling_method import ScalingMethod
+from api.technique.variationpoints.tracetype.trace_type import TraceType
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestTechniqueGrid(TestTechniqueHelper):
+    level_paths = [[0, 2], [0, 1, 2]]
+
+    def create_single_grid(self) -> TechniqueGrid:
+        return TechniqueGrid(
+            self.level_paths,
+            algebraic_models=[AlgebraicModel.VSM],
+            trace_types=[TraceType.NOT_TRACED],
+            transitive_aggregations=[AggregationMethod.SUM],
+            scaling_methods=[ScalingMethod.GLOBAL],
+            technique_aggregations=[AggregationMethod.SUM],
+        )
+
+    def test_single_grid(self):
+        definitions = self.create_single_grid().get_definitions()
+        self.assertEqual(
+            [
+                self.direct_technique_name,
+                self.transitive_technique_name,
+                self.combined_technique_name,
+            ],
+            definitions,
+        )
+
+    def test_full_grid(self):
+        grid = TechniqueGrid(self.level_paths)
+        self.assertEqual(4, len(grid.get_direct_definitions()))
+        self.assertEqual(24, len(grid.get_transitive_definitions()))
+        self.assertEqual(4 * 24 * 3, len(grid.get_hybrid_definitions()))
+        for definition in grid.get_definitions()[:30]:
+            self.assertEqual(definition, get_canonical_name(definition))
+
+    def test_get_technique_type(self):
+        self.assertEqual(DIRECT_ID, get_technique_type(self.direct_technique_name))
+        self.assertEqual(
+            TRANSITIVE_ID, get_technique_type(self.transitive_technique_name)
+        )
+        self.assertEqual(HYBRID_ID, get_technique_type(self.combined_technique_name))
+
+    def test_evaluate_technique_grid(self):
+        definitions = self.create_single_grid().get_definitions()
+        progress = []
+        metric_table = evaluate_technique_grid(
+            [self.d_name],
+            definitions,
+            n_workers=2,
+            progress_callback=lambda n_completed, n_total: progress.append(
+                (n_completed, n_total)
+            ),
+        )
+        self.assertEqual([(1, 3), (2, 3), (3, 3)], progress)
+        self.assertEqual(3, len(metric_table.table))
+        self.assertEqual(set(definitions), set(metric_table.table[NAME_COLNAME]))
+        self.assertEqual(
+            {DIRECT_ID, TRANSITIVE_ID, HYBRID_ID},
+            set(metric_table.table[TECHNIQUE_TYPE_COLNAME]),
+        )
+        self.assertTrue(all(metric_table.table[AP_COLNAME] >= 0))
+
+    def test_evaluate_technique_uses_cache_config(self):
+        Cache.cleanup(self.d_name)
+        original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+        try:
+            evaluate_technique(
+                (self.d_name, self.direct_technique_name), CacheConfig(cache_on=True)
+            )
+            Cache.CACHE_ON = True
+            technique = create_technique_from_name(self.direct_technique_name)
+            self.assertTrue(Cache.is_cached(self.dataset, technique.definition))
+        finally:
+            Cache.cleanup(self.d_name)
+            Cache.CACHE_ON = original_cache_value
@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+
+from api.extension.cache import Cache
+from api.extension.work_queue import (
+    CLAIMED_FOLDER,
+    FAILED_FOLDER,
+    PENDING_FOLDER,
+    RESULTS_FOLDER,
+    WorkQueue,
+    run_worker,
+)
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestWorkQueue(TestTechniqueHelper):
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+        self.queue_dir = tempfile.TemporaryDirectory()
+        self.queue = WorkQueue(self.queue_dir.name, lease_seconds=60)
+        self.technique_names = [
+            self.direct_technique_name,
+            self.transitive_technique_name,
+        ]
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.cache_on
+        self.queue_dir.cleanup()
+
+    def test_enqueue_skips_existing_jobs(self):
+        self.assertEqual(2, self.queue.enqueue([self.d_name], self.technique_names))
+        self.assertEqual(0, self.queue.enqueue([self.d_name], self.technique_names))
+        self.assertEqual(2, self.queue.get_status()[PENDING_FOLDER])
+
+    def test_claim_is_exclusive(self):
+        self.queue.enqueue([self.d_name], self.technique_names)
+        other_queue = WorkQueue(self.queue_dir.name, lease_seconds=60)
+        first_id, _ = self.queue.claim()
+        second_id, _ = other_queue.claim()
+        self.assertNotEqual(first_id, second_id)
+        self.assertIsNone(self.queue.claim())
+        self.assertEqual(2, self.queue.get_status()[CLAIMED_FOLDER])
+
+    def expire_lease(self, job_id: str):
+        path_to_claim = self.queue.get_path(CLAIMED_FOLDER, job_id)
+        with open(path_to_claim) as file:
+            content = json.load(file)
+        content["lease_deadline"] = self.queue.get_shared_time() - 1
+        with open(path_to_claim, "w") as file:
+            json.dump(content, file)
+
+    def test_reclaims_expired_lease(self):
+        self.queue.enqueue([self.d_name], [self.direct_technique_name])
+        job_id, job = self.queue.claim()
+        self.assertEqual([], self.queue.reclaim_expired_leases())
+        self.expire_lease(job_id)
+        other_queue = WorkQueue(self.queue_dir.name, lease_seconds=60)
+        self.assertEqual((job_id, job), other_queue.claim())
+        self.assertTrue(other_queue.renew(job_id))
+        self.assertFalse(self.queue.renew(job_id))
+
+    def test_reclaimed_job_has_no_lease(self):
+        self.queue.enqueue([self.d_name], [self.direct_technique_name])
+        job_id, job = self.queue.claim()
+        self.expire_lease(job_id)
+        other_queue = WorkQueue(self.queue_dir.name, lease_seconds=60)
+        self.assertEqual([job_id], other_queue.reclaim_expired_leases())
+        with open(self.queue.get_path(PENDING_FOLDER, job_id)) as file:
+            self.assertEqual({"dataset": job[0], "technique": job[1]}, json.load(file))
+
+        os.rename(  # claimed by a worker that has not written its lease yet
+            self.queue.get_path(PENDING_FOLDER, job_id),
+            self.queue.get_path(CLAIMED_FOLDER, job_id),
+        )
+        self.assertEqual([], other_queue.reclaim_expired_leases())
+        self.assertFalse(self.queue.renew(job_id))
+
+        os.rename(
+            self.queue.get_path(CLAIMED_FOLDER, job_id),
+            self.queue.get_path(PENDING_FOLDER, job_id),
+        )
+        self.assertEqual((job_id, job), other_queue.claim())
+        self.assertTrue(other_queue.is_owner(job_id))
+        self.assertFalse(self.queue.renew(job_id))
+
+    def test_release_only_own_claim(self):
+        self.queue.enqueue([self.d_name], [self.direct_technique_name])
+        job_id, _ = self.queue.claim()
+        self.expire_lease(job_id)
+        other_queue = WorkQueue(self.queue_dir.name, lease_seconds=60)
+        other_queue.claim()
+
+        self.queue.complete(job_id, {"dataset": self.d_name})
+        self.assertTrue(other_queue.is_owner(job_id))
+        other_queue.release(job_id)
+        self.assertEqual(0, self.queue.get_status()[CLAIMED_FOLDER])
+
+    def test_run_worker_and_merge(self):
+        self.queue.enqueue([self.d_name], self.technique_names + ["(. (VSM NT) (0 9))"])
+        self.assertEqual(2, run_worker(self.queue))
+        status = self.queue.get_status()
+        self.assertTrue(self.queue.is_finished())
+        self.assertEqual(2, status[RESULTS_FOLDER])
+        self.assertEqual(1, status[FAILED_FOLDER])
+
+        metric_table = self.queue.merge()
+        self.assertEqual(2, len(metric_table.table))
+        self.assertEqual(
+            set(self.technique_names), set(metric_table.table["name"].values)
+        )
+        for job_id in self.queue.list_job_ids(RESULTS_FOLDER):
+            with open(self.queue.get_path(RESULTS_FOLDER, job_id)) as file:
+                self.assertGreaterEqual(json.load(file)["seconds"], 0)
@@ -0,0 +1,86 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from api.extension.cache import Cache
+from api.server.load_test import create_link_urls, run_load_test
+from api.server.service import TraceLinkServer
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestService(TestTechniqueHelper):
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+        self.server = TraceLinkServer(("127.0.0.1", 0), n_workers=4)
+        self.base_url = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        Cache.CACHE_ON = self.cache_on
+
+    def get(self, path: str, **params):
+        with urlopen("%s%s?%s" % (self.base_url, path, urlencode(params))) as response:
+            return json.loads(response.read())
+
+    def test_links(self):
+        body = self.get(
+            "/links",
+            dataset=self.d_name,
+            technique=self.transitive_technique_name,
+            source="R1",
+            k=2,
+        )
+        expected_links = Tracer().get_top_k_targets(
+            self.d_name, self.transitive_technique_name, "R1", 2
+        )
+        self.assertEqual(
+            [[target_id, score] for target_id, score in expected_links],
+            [[link["id"], link["score"]] for link in body["links"]],
+        )
+        indexed_body = self.get(
+            "/links",
+            dataset=self.d_name,
+            technique=self.transitive_technique_name,
+            level=0,
+            index=0,
+            k=2,
+        )
+        self.assertEqual(body["links"], indexed_body["links"])
+
+    def test_metrics_and_cache(self):
+        body = self.get(
+            "/metrics", dataset=self.d_name, technique=self.direct_technique_name
+        )
+        expected_metrics = Tracer().get_metrics(self.d_name, self.direct_technique_name)
+        self.assertEqual(1, len(body["metrics"]))
+        self.assertAlmostEqual(expected_metrics[0].ap, body["metrics"][0]["ap"])
+        cache_status = self.get("/cache")
+        self.assertEqual([self.d_name], cache_status["datasets"])
+        self.assertIn("total", cache_status["statistics"])
+
+    def test_errors(self):
+        with self.assertRaises(HTTPError) as context:
+            self.get("/links", dataset=self.d_name)
+        self.assertEqual(400, context.exception.code)
+        with self.assertRaises(HTTPError) as context:
+            self.get("/unknown")
+        self.assertEqual(404, context.exception.code)
+
+    def test_load_test(self):
+        self.server.warm([self.d_name], [self.direct_technique_name])
+        urls = create_link_urls(
+            self.base_url, self.d_name, self.direct_technique_name, 2
+        )
+        self.assertEqual(1, len(urls))
+        report = run_load_test(urls, n_requests=20, concurrency=4)
+        self.assertEqual(20, report["n_requests"])
+        self.assertEqual(0, report["n_errors"])
+        self.assertLessEqual(report["p50_latency"], report["max_latency"])
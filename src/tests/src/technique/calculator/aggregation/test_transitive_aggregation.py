@@ -6,12 +6,18 @@ from api.technique.variationpoints.aggregation.aggregation_method import (
     AggregationMethod,
 )
 from api.technique.variationpoints.aggregation.transitive_path_aggregation import (
+    aggregate_with_scaling_transforms,
     apply_transitive_aggregation,
     aggregate_similarity_matrices_with_arithmetic_aggregator,
     create_transitive_aggregation_training_data,
     dot_product_with_aggregation,
 )
 from api.technique.variationpoints.algebraicmodel.models import SimilarityMatrices
+from api.technique.variationpoints.scalers.scalers import (
+    get_scaling_transforms,
+    scale_with_technique,
+)
+from api.technique.variationpoints.scalers.scaling_method import ScalingMethod
 from tests.res.smart_test import SmartTest
 
 
@@ -128,3 +134,35 @@ class TestIntermediateAggregation(SmartTest):
         self.assertEqual(1, result[0][0])
         self.assertEqual(0, result[0][1])
         self.assertEqual(1, result[0][2])
+
+    """
+    aggregate_with_scaling_transforms
+    """
+
+    def test_aggregate_with_scaling_transforms(self):
+        matrices = [self.upper, self.lower]
+        for scaling_method in ScalingMethod:
+            scaled_upper, scaled_lower = scale_with_technique(scaling_method, matrices)
+            upper_transform, lower_transform = get_scaling_transforms(
+                scaling_method, matrices
+            )
+            for aggregation_type in [AggregationMethod.SUM, AggregationMethod.MAX]:
+                expected_matrix = apply_transitive_aggregation(
+                    SimilarityMatrices(scaled_upper, scaled_lower), aggregation_type
+                )
+                fused_matrix = aggregate_with_scaling_transforms(
+                    self.upper,
+                    upper_transform,
+                    self.lower,
+                    lower_transform,
+                    aggregation_type,
+                )
+                self.assertTrue(np.allclose(expected_matrix, fused_matrix))
+
+    def test_aggregate_with_scaling_transforms_pca(self):
+        self.assertRaises(
+            Exception,
+            lambda: aggregate_with_scaling_transforms(
+                self.upper, (1, 0), self.lower, (1, 0), AggregationMethod.PCA
+            ),
+        )
@@ -1,6 +1,7 @@
 from api.technique.definitions.combined.technique import (
     create_technique,
     CombinedTechnique,
+    get_canonical_name,
     HYBRID_COMMAND_SYMBOL,
 )
 from api.technique.definitions.direct.definition import DIRECT_COMMAND_SYMBOL
@@ -33,3 +34,33 @@ class TestCombinedTechnique(TestTechniqueHelper):
         self.assertRaises(
             Exception, lambda: create_technique("!", ["VSM", "NT"], ["0", "2"])
         )
+
+    """
+    get_canonical_name
+    """
+
+    def test_canonical_name_whitespace_and_case(self):
+        canonical_name = get_canonical_name("(.  (vsm  nt)   (0 2) )")
+        self.assertEqual(self.direct_technique_name, canonical_name)
+
+    def test_canonical_name_sorts_commutative_components(self):
+        reversed_name = "(o (SUM) (%s %s))" % (
+            self.transitive_technique_name,
+            self.direct_technique_name,
+        )
+        self.assertEqual(
+            self.combined_technique_name, get_canonical_name(reversed_name)
+        )
+
+    def test_canonical_name_keeps_pca_order(self):
+        pca_name = "(o (PCA) (%s %s))" % (
+            self.transitive_technique_name,
+            self.direct_technique_name,
+        )
+        self.assertEqual(pca_name, get_canonical_name(pca_name))
+
+    def test_canonical_name_keeps_transitive_order(self):
+        self.assertEqual(
+            self.transitive_technique_name,
+            get_canonical_name(self.transitive_technique_name.lower()),
+        )
@@ -1,11 +1,21 @@
+import numpy as np
+
 from api.extension.cache import Cache
+from api.extension.intermediates import IntermediateType
 from api.technique.definitions.combined.technique import create_technique_from_name
 from api.technique.definitions.direct.calculator import (
+    DOCUMENT_TERMS_STEP,
     DirectTechniqueCalculator,
     DirectTechniqueData,
+    LSI_STEP,
+    calculate_similarity_matrix_between_levels,
     create_direct_algebraic_model,
 )
 from api.technique.definitions.direct.definition import DirectTechniqueDefinition
+from api.technique.variationpoints.algebraicmodel.calculate_similarity_matrix import (
+    calculate_similarity_matrix_for_nlp_technique,
+)
+from api.technique.variationpoints.algebraicmodel.models import AlgebraicModel
 from api.technique.variationpoints.tracetype.trace_type import TraceType
 from tests.res.test_technique_helper import TestTechniqueHelper
 
@@ -78,3 +88,38 @@ class DirectCalculator(TestTechniqueHelper):
         self.assertEqual(self.dataset.name, technique_data.dataset.name)
         self.assertEqual(-1, technique_data.similarity_matrix)
         Cache.CACHE_ON = original
+
+    """
+    calculate_similarity_matrix_between_levels
+    """
+
+    def test_intermediates_are_cached(self):
+        original = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup(self.dataset.name)
+
+        for algebraic_model in [AlgebraicModel.VSM, AlgebraicModel.LSI]:
+            expected = calculate_similarity_matrix_for_nlp_technique(
+                algebraic_model, self.dataset.artifacts[0], self.dataset.artifacts[2]
+            )
+            for _ in range(2):  # second iteration reads intermediates from cache
+                similarity_matrix = calculate_similarity_matrix_between_levels(
+                    self.dataset, algebraic_model, 0, 2
+                )
+                self.assertTrue(np.allclose(expected, similarity_matrix))
+
+        self.assertTrue(
+            Cache.is_intermediate_cached(
+                self.dataset,
+                DOCUMENT_TERMS_STEP,
+                "0-2-upper",
+                IntermediateType.SPARSE_MATRIX,
+            )
+        )
+        self.assertTrue(
+            Cache.is_intermediate_cached(
+                self.dataset, LSI_STEP, "0-2", IntermediateType.SVD_FACTORS
+            )
+        )
+        Cache.cleanup(self.dataset.name)
+        Cache.CACHE_ON = original
@@ -1,3 +1,6 @@
+import numpy as np
+
+from api.datasets.dataset import Dataset
 from api.extension.cache import Cache
 from api.technique.definitions.sampled.artifacts.technique import (
     SampledIntermediateTechnique,
@@ -38,3 +41,30 @@ class TestSampledArtifactsTechnique(TestTechniqueHelper):
         self.assertNotEqual(metrics_a[0].auc, metrics_b[0].auc)
 
         Cache.cleanup(dataset)
+
+    def test_seeded_sampled_is_cached(self):
+        dataset = Dataset("SAMPLE_EasyClinic")
+        original = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup(dataset.name)
+
+        def create_technique(seed: str):
+            return SampledIntermediateTechnique(
+                self.sampled_parameters + [seed], self.sampled_components
+            )
+
+        matrix_a = create_technique("1").calculate_technique_data(dataset)
+        self.assertTrue(Cache.is_cached(dataset, create_technique("1").definition))
+        self.assertFalse(Cache.is_cached(dataset, create_technique("2").definition))
+
+        Cache.CACHE_ON = False  # recalculating with same seed yields same matrix
+        matrix_b = create_technique("1").calculate_technique_data(dataset)
+        self.assertTrue(
+            np.array_equal(
+                matrix_a.get_similarity_matrix(), matrix_b.get_similarity_matrix()
+            )
+        )
+
+        Cache.CACHE_ON = True
+        Cache.cleanup(dataset.name)
+        Cache.CACHE_ON = original
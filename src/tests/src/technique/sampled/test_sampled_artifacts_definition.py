@@ -16,6 +16,15 @@ class TestSampledArtifactsDefinition(TestTechniqueHelper):
         self.assertTrue(definition._is_stochastic)
         self.assertTrue(definition.contains_stochastic_technique())
 
+    def test_with_seed(self):
+        definition = SampledTechniqueDefinition(
+            self.sampled_parameters + ["42"], self.sampled_components
+        )
+
+        self.assertEqual(42, definition.seed)
+        self.assertFalse(definition.contains_stochastic_technique())
+        self.assertIn("42", definition.get_name())
+
     def test_get_symbol(self):
         self.assertEqual(
             SAMPLED_COMMAND_SYMBOL, SampledTechniqueDefinition.get_symbol()
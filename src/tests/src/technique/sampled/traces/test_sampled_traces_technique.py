@@ -22,6 +22,14 @@ class TestSampledTracesTechnique(TestTechniqueHelper):
             SAMPLED_TRACED_COMMAND_SYMBOL, SampledTracesTechnique.get_symbol()
         )
 
+    def test_get_name(self):
+        technique = SampledTracesTechnique(
+            self.sampled_parameters, self.sampled_components
+        )
+        self.assertEqual(
+            "(%s " % SAMPLED_TRACED_COMMAND_SYMBOL, technique.get_name()[:3]
+        )
+
     def test_combined_sampled(self):
         dataset = "SAMPLE_EasyClinic"
         tracer = Tracer()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+
+import numpy as np
+
+from api.datasets.change_set import ChangeSet
+from api.datasets.dataset import Dataset
+from api.technique.definitions.transitive.calculator import (
+    TRANSITIVE_TECHNIQUE_PIPELINE,
+    TransitiveTechniqueCalculator,
+    append_direct_component_matrices,
+    scale_transitive_matrices,
+)
+from api.technique.parser.checkpoint import PipelineCheckpoint
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+def interrupt(data):
+    raise InterruptedError("process died during %s" % data.technique.get_name())
+
+
+def create_unreachable_step(step_name: str):
+    def unreachable_step(data):
+        raise AssertionError("%s should have been restored" % step_name)
+
+    unreachable_step.__name__ = step_name
+    return unreachable_step
+
+
+class TestCheckpoint(TestTechniqueHelper):
+    def setUp(self):
+        self.checkpoint_dir = tempfile.TemporaryDirectory()
+        self.original_path = PipelineCheckpoint.path_to_checkpoints
+        PipelineCheckpoint.path_to_checkpoints = self.checkpoint_dir.name
+        PipelineCheckpoint.CHECKPOINTS_ON = True
+
+    def tearDown(self):
+        PipelineCheckpoint.CHECKPOINTS_ON = False
+        PipelineCheckpoint.path_to_checkpoints = self.original_path
+        self.checkpoint_dir.cleanup()
+
+    def run_interrupted_pipeline(self):
+        calculator = TransitiveTechniqueCalculator(
+            self.get_transitive_definition(),
+            [append_direct_component_matrices, scale_transitive_matrices, interrupt],
+        )
+        self.assertRaises(
+            InterruptedError, lambda: calculator.run_pipeline_on_dataset(self.dataset)
+        )
+        return calculator
+
+    def test_resume_after_interruption(self):
+        expected_matrix = (
+            TransitiveTechniqueCalculator(self.get_transitive_definition())
+            .run_pipeline_on_dataset(self.dataset)
+            .similarity_matrix
+        )
+        self.run_interrupted_pipeline()
+
+        resumed_pipeline = [
+            create_unreachable_step(p_func.__name__)
+            for p_func in TRANSITIVE_TECHNIQUE_PIPELINE[:2]
+        ] + TRANSITIVE_TECHNIQUE_PIPELINE[2:]
+        resumed_data = TransitiveTechniqueCalculator(
+            self.get_transitive_definition(), resumed_pipeline
+        ).run_pipeline_on_dataset(self.dataset)
+        self.assertTrue(np.allclose(expected_matrix, resumed_data.similarity_matrix))
+
+    def test_edited_dataset_not_checkpointed(self):
+        self.run_interrupted_pipeline()
+        edited_dataset = Dataset(self.d_name)
+        edited_dataset.apply_change_set(ChangeSet().add_artifact(2, "C4", "timeout"))
+
+        edited_data = TransitiveTechniqueCalculator(
+            self.get_transitive_definition()
+        ).run_pipeline_on_dataset(edited_dataset)
+        self.assertEqual((1, 4), edited_data.similarity_matrix.shape)
+        self.assertTrue(
+            os.path.isdir(PipelineCheckpoint.get_path_to_technique(edited_data))
+        )  # the checkpoint of the unedited dataset is kept
+
+    def test_checkpoint_removed_after_completion(self):
+        calculator = self.run_interrupted_pipeline()
+        data = calculator.create_pipeline_data(self.dataset)
+        self.assertTrue(os.path.isdir(PipelineCheckpoint.get_path_to_technique(data)))
+
+        TransitiveTechniqueCalculator(
+            self.get_transitive_definition()
+        ).run_pipeline_on_dataset(self.dataset)
+        self.assertFalse(os.path.isdir(PipelineCheckpoint.get_path_to_technique(data)))
+
+    def test_restore(self):
+        calculator = self.run_interrupted_pipeline()
+        data = calculator.create_pipeline_data(self.dataset)
+        n_completed_steps = PipelineCheckpoint.restore(
+            data, calculator.get_step_names()
+        )
+        self.assertEqual(2, n_completed_steps)
+        self.assertEqual(2, len(data.transitive_matrices))
+        self.assertIsNone(data.similarity_matrix)
+
+    def test_restore_ignores_other_pipelines(self):
+        calculator = self.run_interrupted_pipeline()
+        data = calculator.create_pipeline_data(self.dataset)
+        self.assertEqual(
+            0, PipelineCheckpoint.restore(data, ["scale_transitive_matrices"])
+        )
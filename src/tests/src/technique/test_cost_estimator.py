@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+
+from api.technique import cost_estimator
+
+from api.technique.cost_estimator import (
+    CostConstants,
+    DatasetProfile,
+    calibrate_cost_constants,
+    estimate_technique_cost,
+    fit_cost_constants,
+    main,
+    order_jobs_by_cost,
+)
+from api.technique.definitions.combined.technique import create_technique_from_name
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestCostEstimator(TestTechniqueHelper):
+    profile = DatasetProfile([100, 1000, 2000], 5000, 30.0)
+    transitive_pca_name = "(x (PCA GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))"
+
+    def estimate(self, technique_name: str):
+        technique = create_technique_from_name(technique_name)
+        return estimate_technique_cost(technique, self.profile)
+
+    def test_profile_from_dataset(self):
+        profile = DatasetProfile.from_dataset(self.dataset)
+        self.assertEqual([1, 3, 3], profile.level_sizes)
+        self.assertGreater(profile.vocabulary_size, 0)
+        self.assertGreater(profile.average_tokens, 0)
+
+    def test_steps_follow_pipeline(self):
+        technique = create_technique_from_name(self.transitive_pca_name)
+        technique_cost = estimate_technique_cost(technique, self.profile)
+        self.assertEqual(
+            [p_func.__name__ for p_func in technique.calculator.pipeline],
+            [step.step for step in technique_cost.steps],
+        )
+
+    def test_direct(self):
+        technique_cost = self.estimate(self.direct_technique_name)
+        self.assertEqual(1, len(technique_cost.steps))
+        self.assertGreaterEqual(technique_cost.get_peak_bytes(), 100 * 2000 * 8)
+        traced_cost = self.estimate("(. (VSM T) (0 2))")
+        self.assertEqual(0, traced_cost.get_flops())
+
+    def test_pca_costs_more_than_sum(self):
+        constants = CostConstants()
+        pca_cost = self.estimate(self.transitive_pca_name)
+        sum_cost = self.estimate(self.transitive_technique_name)
+        self.assertGreater(pca_cost.get_peak_bytes(), sum_cost.get_peak_bytes())
+        self.assertGreater(
+            pca_cost.get_seconds(constants), sum_cost.get_seconds(constants)
+        )
+
+    def test_hybrid_includes_components(self):
+        constants = CostConstants()
+        hybrid_cost = self.estimate(self.combined_technique_name)
+        transitive_cost = self.estimate(self.transitive_technique_name)
+        self.assertGreater(
+            hybrid_cost.get_seconds(constants), transitive_cost.get_seconds(constants)
+        )
+        self.assertIn("steps", hybrid_cost.to_dict(constants))
+
+    def test_order_jobs_by_cost(self):
+        jobs = [
+            (self.d_name, self.direct_technique_name),
+            (self.d_name, self.transitive_pca_name),
+        ]
+        ordered_jobs = order_jobs_by_cost(jobs, {self.d_name: self.profile})
+        self.assertEqual(self.transitive_pca_name, ordered_jobs[0][1])
+
+    def test_calibrate(self):
+        constants = calibrate_cost_constants(
+            matrix_size=50, loop_size=5, n_documents=10
+        )
+        self.assertGreater(constants.seconds_per_flop, 0)
+        self.assertGreater(constants.seconds_per_python_op, 0)
+        self.assertGreater(constants.seconds_per_token, 0)
+        with tempfile.TemporaryDirectory() as path_to_dir:
+            path_to_constants = os.path.join(path_to_dir, "constants.json")
+            constants.save(path_to_constants)
+            loaded_constants = CostConstants.load(path_to_constants)
+        self.assertEqual(constants.to_dict(), loaded_constants.to_dict())
+
+    def test_load_default(self):
+        default_path = cost_estimator.PATH_TO_COST_CONSTANTS
+        with tempfile.TemporaryDirectory() as path_to_dir:
+            path_to_constants = os.path.join(path_to_dir, "constants.json")
+            cost_estimator.PATH_TO_COST_CONSTANTS = path_to_constants
+            try:
+                self.assertEqual(
+                    CostConstants().to_dict(), CostConstants.load_default().to_dict()
+                )
+                CostConstants(1.0, 2.0, 3.0).save(path_to_constants)
+                self.assertEqual(
+                    CostConstants(1.0, 2.0, 3.0).to_dict(),
+                    CostConstants.load_default().to_dict(),
+                )
+            finally:
+                cost_estimator.PATH_TO_COST_CONSTANTS = default_path
+
+    def test_fit_cost_constants(self):
+        initial_constants = CostConstants(1.0, 1.0, 1.0)
+        constants = fit_cost_constants(
+            [self.dataset],
+            [self.direct_technique_name, self.transitive_technique_name],
+            initial_constants,
+        )
+        for seconds in constants.to_dict().values():
+            self.assertGreater(seconds, 0)
+
+    def test_main_saves_constants(self):
+        with tempfile.TemporaryDirectory() as path_to_dir:
+            path_to_constants = os.path.join(path_to_dir, "constants", "cost.json")
+            main(
+                [
+                    "--datasets",
+                    self.d_name,
+                    "--techniques",
+                    self.direct_technique_name,
+                    "--output",
+                    path_to_constants,
+                ]
+            )
+            with open(path_to_constants) as constants_file:
+                saved_constants = json.load(constants_file)
+        self.assertEqual(CostConstants().to_dict().keys(), saved_constants.keys())
@@ -0,0 +1,134 @@
+import numpy as np
+
+from api.datasets.change_set import ChangeSet
+from api.datasets.dataset import Dataset
+from api.extension.cache import Cache
+from api.metrics.calculator import calculate_query_metrics
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.incremental import TrackedDataset
+from api.technique.variationpoints.algebraicmodel.calculate_similarity_matrix import (
+    calculate_similarity_matrix_from_term_frequencies,
+)
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestIncremental(TestTechniqueHelper):
+    vsm_technique_name = "(. (VSM NT) (1 2))"
+    technique_names = [
+        vsm_technique_name,
+        "(. (LSI NT) (0 1))",
+        "(x (SUM GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))",
+        "(x (MAX INDEPENDENT) ((. (VSM NT) (0 1)) (. (VSM T) (1 2))))",
+        "(x (SUM INDEPENDENT) ((. (LSI NT) (0 1)) (. (LSI NT) (1 2))))",
+        "(o (SUM) ((. (VSM NT) (0 2)) (x (SUM GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))))",
+    ]
+    change_sets = [
+        ChangeSet().modify_artifact(1, "D2", "inact timeout log user"),
+        ChangeSet().modify_artifact(2, "C1", "automat logout system log"),
+        ChangeSet().add_artifact(1, "D4", "user account logout").add_link("D4", "C1"),
+        ChangeSet().delete_artifact(2, "C2").remove_link("R1", "C1"),
+    ]
+
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.cache_on
+
+    def create_tracked_dataset(self) -> TrackedDataset:
+        tracked_dataset = TrackedDataset(Dataset(self.d_name))
+        for technique_name in self.technique_names:
+            tracked_dataset.get_query_metrics(
+                create_technique_from_name(technique_name)
+            )
+        return tracked_dataset
+
+    def test_matrices_match_recalculation(self):
+        for change_set in self.change_sets:
+            tracked_dataset = self.create_tracked_dataset()
+            changes = tracked_dataset.dataset.apply_change_set(change_set)
+            tracked_dataset.apply_changes(changes)
+            for technique_name, technique in tracked_dataset.techniques.items():
+                expected_matrix = (
+                    self.calculate_frozen_vsm_matrix(tracked_dataset, technique)
+                    if technique_name in tracked_dataset.term_models
+                    else tracked_dataset.calculate_similarity_matrix(technique)
+                )
+                self.assertTrue(
+                    np.allclose(
+                        expected_matrix, tracked_dataset.matrices[technique_name]
+                    ),
+                    technique_name,
+                )
+                self.assert_metrics_match_matrix(tracked_dataset, technique)
+
+    def test_refreshes_affected_queries(self):
+        tracked_dataset = self.create_tracked_dataset()
+        dataset = tracked_dataset.dataset
+        change_set = ChangeSet().modify_artifact(1, "D2", "inact timeout log user")
+        refreshed_queries = tracked_dataset.apply_changes(
+            dataset.apply_change_set(change_set)
+        )
+        self.assertEqual([1], refreshed_queries[self.vsm_technique_name])
+
+        refreshed_queries = tracked_dataset.apply_changes(
+            dataset.apply_change_set(ChangeSet().add_link("D3", "C2"))
+        )
+        self.assertEqual([2], refreshed_queries[self.vsm_technique_name])
+        query_ids = [
+            m.query_id
+            for m in tracked_dataset.get_query_metrics(
+                create_technique_from_name(self.vsm_technique_name)
+            )
+        ]
+        self.assertEqual([0, 1, 2], query_ids)
+
+        change_set = ChangeSet().modify_artifact(2, "C1", "automat logout")
+        refreshed_queries = tracked_dataset.apply_changes(
+            dataset.apply_change_set(change_set)
+        )
+        self.assertEqual([0, 1, 2], refreshed_queries[self.vsm_technique_name])
+
+    def test_tracer_apply_change_set(self):
+        tracer = Tracer()
+        metrics = tracer.get_tracked_metrics(self.d_name, self.vsm_technique_name)
+        self.assertEqual(2, len(metrics))
+        refreshed_queries = tracer.apply_change_set(
+            self.d_name, ChangeSet().add_link("D3", "C3")
+        )
+        self.assertEqual([2], refreshed_queries[self.vsm_technique_name])
+        metrics = tracer.get_tracked_metrics(self.d_name, self.vsm_technique_name)
+        self.assertEqual(3, len(metrics))
+        self.assertEqual(1, tracer.get_dataset(self.d_name).revision)
+
+    def calculate_frozen_vsm_matrix(self, tracked_dataset: TrackedDataset, technique):
+        """
+        Returns the similarity matrix of a VSM technique using the vectorizer fitted before the changes.
+        """
+        upper_level, lower_level = technique.definition.artifact_paths
+        model = tracked_dataset.term_models[technique.get_name()][0]
+        artifacts = tracked_dataset.dataset.artifacts
+        return calculate_similarity_matrix_from_term_frequencies(
+            model.transform(artifacts[upper_level]["text"]),
+            model.transform(artifacts[lower_level]["text"]),
+        )
+
+    def assert_metrics_match_matrix(self, tracked_dataset: TrackedDataset, technique):
+        similarity_matrix = tracked_dataset.matrices[technique.get_name()]
+        oracle_matrix = tracked_dataset.get_oracle_matrix(technique.definition)
+        expected_metrics = [
+            calculate_query_metrics(oracle_matrix[i], similarity_matrix[i], i)
+            for i in range(similarity_matrix.shape[0])
+        ]
+        expected_metrics = [
+            [m.query_id, m.ap, m.auc, m.lag] for m in expected_metrics if m is not None
+        ]
+        actual_metrics = [
+            [m.query_id, m.ap, m.auc, m.lag]
+            for m in tracked_dataset.get_query_metrics(technique)
+        ]
+        np.testing.assert_allclose(
+            expected_metrics, actual_metrics, err_msg=technique.get_name()
+        )
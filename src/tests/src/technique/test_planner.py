@@ -0,0 +1,85 @@
+import numpy as np
+
+from api.datasets.dataset import Dataset
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.planner import CalculatedTechnique, TechniquePlan
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestPlanner(TestTechniqueHelper):
+    def get_technique_names(self):
+        return [
+            self.direct_technique_name,
+            self.transitive_technique_name,
+            self.combined_technique_name,
+        ]
+
+    def test_unique_nodes(self):
+        plan = TechniquePlan(self.get_technique_names() + [self.direct_technique_name])
+        self.assertEqual(5, len(plan.nodes))
+        self.assertEqual(4, len(plan.requested_names))
+
+    def test_equivalent_definitions_merged(self):
+        reversed_name = "(o (sum) (%s %s))" % (
+            self.transitive_technique_name,
+            self.direct_technique_name,
+        )
+        plan = TechniquePlan([self.combined_technique_name, reversed_name])
+        self.assertEqual(5, len(plan.nodes))
+        self.assertEqual(1, len(set(plan.requested_names)))
+
+    def test_execution_order(self):
+        plan = TechniquePlan(self.get_technique_names())
+        execution_order = plan.get_execution_order()
+        for node_index, name in enumerate(execution_order):
+            for dependency in plan.nodes[name].dependencies:
+                self.assertLess(execution_order.index(dependency), node_index)
+        self.assertEqual(self.combined_technique_name, execution_order[-1])
+
+    def test_execute(self):
+        technique_names = self.get_technique_names()
+        batch_data = TechniquePlan(technique_names).execute(self.dataset)
+
+        self.assertEqual(len(technique_names), len(batch_data))
+        for technique_name, technique_data in zip(technique_names, batch_data):
+            expected_data = create_technique_from_name(
+                technique_name
+            ).calculate_technique_data(self.dataset)
+            self.assertEqual(technique_name, technique_data.technique.get_name())
+            self.assertTrue(
+                np.allclose(
+                    expected_data.similarity_matrix, technique_data.similarity_matrix
+                )
+            )
+
+    def test_execute_reuses_components(self):
+        direct_data, transitive_data, combined_data = TechniquePlan(
+            self.get_technique_names()
+        ).execute(self.dataset)
+        combined_components = combined_data.technique.get_component_techniques()
+        self.assertIsInstance(combined_components[0], CalculatedTechnique)
+        self.assertIs(direct_data, combined_components[0].technique_data)
+        self.assertIs(transitive_data, combined_components[1].technique_data)
+
+    def test_stochastic_techniques_not_merged(self):
+        stochastic_name = self.transitive_sampled_artifacts_technique_name
+        plan = TechniquePlan([stochastic_name, stochastic_name])
+        self.assertEqual(2, len(set(plan.requested_names)))
+        self.assertEqual(4, len(plan.nodes))  # direct components are merged
+
+    def test_execute_keeps_plan(self):
+        plan = TechniquePlan(self.get_technique_names())
+        plan.execute(self.dataset)
+        for node in plan.nodes.values():
+            for component in node.technique.definition.get_component_techniques():
+                self.assertNotIsInstance(component, CalculatedTechnique)
+        other_dataset = Dataset(self.d_name)
+        for technique_data in plan.execute(other_dataset):
+            self.assertIs(other_dataset, technique_data.dataset)
+
+    def test_tracer(self):
+        batch_data = Tracer().get_batch_technique_data(
+            self.d_name, self.get_technique_names()
+        )
+        self.assertEqual(3, len(batch_data))
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from api.extension.cache import Cache
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.parser.profiler import (
+    PipelineProfiler,
+    PROFILE_COLUMNS,
+    TECHNIQUE_STEP_NAME,
+)
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestProfiler(TestTechniqueHelper):
+    def setUp(self):
+        self.original_cache_value = Cache.CACHE_ON
+        Cache.CACHE_ON = False  # cached techniques do not run their pipeline
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.original_cache_value
+        PipelineProfiler.disable()
+        PipelineProfiler.reset()
+
+    def calculate_transitive_technique(self):
+        technique = create_technique_from_name(self.transitive_technique_name)
+        return technique.calculate_technique_data(self.dataset)
+
+    def test_disabled_by_default(self):
+        technique_data = self.calculate_transitive_technique()
+        self.assertEqual(0, len(technique_data.step_profiles))
+        self.assertEqual(0, len(PipelineProfiler.records))
+
+    def test_step_profiles(self):
+        PipelineProfiler.enable()
+        technique_data = self.calculate_transitive_technique()
+        steps = [record["step"] for record in technique_data.step_profiles]
+        self.assertEqual(
+            [
+                "append_direct_component_matrices",
+                "perform_scaled_transitive_aggregation",
+                TECHNIQUE_STEP_NAME,
+            ],
+            steps,
+        )
+        for record in technique_data.step_profiles:
+            self.assertEqual(PROFILE_COLUMNS, list(record.keys()))
+            self.assertGreaterEqual(record["wall_time"], 0)
+            self.assertGreaterEqual(record["peak_bytes"], 0)
+
+        technique_record = technique_data.step_profiles[-1]
+        component_record = technique_data.step_profiles[0]
+        self.assertGreaterEqual(
+            technique_record["wall_time"], component_record["wall_time"]
+        )
+        self.assertGreaterEqual(
+            technique_record["peak_bytes"], component_record["peak_bytes"]
+        )
+
+    def test_records_include_components(self):
+        PipelineProfiler.enable()
+        self.calculate_transitive_technique()
+        techniques = set(record["technique"] for record in PipelineProfiler.records)
+        self.assertEqual(3, len(techniques))  # transitive and two direct components
+
+    def test_failed_step_is_not_measured(self):
+        def fail_step(data):
+            raise ValueError("step failed")
+
+        PipelineProfiler.enable()
+        technique = create_technique_from_name(self.direct_technique_name)
+        technique.calculator.pipeline = technique.calculator.pipeline[:1] + [fail_step]
+        with self.assertRaises(ValueError):
+            technique.calculate_technique_data(self.dataset)
+        self.assertEqual(0, len(PipelineProfiler.get_active_measurements()))
+        self.assertEqual(1, len(PipelineProfiler.records))  # the first step
+
+    def test_concurrent_threads(self):
+        PipelineProfiler.enable()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = [
+                executor.submit(self.calculate_transitive_technique) for _ in range(4)
+            ]
+            for result in results:
+                self.assertEqual(3, len(result.result().step_profiles))
+        self.assertEqual(4 * 7, len(PipelineProfiler.records))
+
+    def test_export_trace(self):
+        PipelineProfiler.enable()
+        self.calculate_transitive_technique()
+        with tempfile.TemporaryDirectory() as path_to_dir:
+            path_to_trace = os.path.join(path_to_dir, "trace.jsonl")
+            PipelineProfiler.export_trace(path_to_trace)
+            with open(path_to_trace) as trace_file:
+                records = [json.loads(line) for line in trace_file]
+        self.assertEqual(PipelineProfiler.records, records)
@@ -0,0 +1,131 @@
+import numpy as np
+
+from api.extension.cache import Cache
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.technique.query import (
+    QueryCache,
+    calculate_block_similarities,
+    calculate_query_similarities,
+    rank_targets,
+)
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestQuery(TestTechniqueHelper):
+    technique_names = [
+        "(. (VSM NT) (0 2))",
+        "(. (LSI NT) (0 2))",
+        "(. (VSM T) (1 2))",
+        "(x (SUM GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))",
+        "(x (MAX INDEPENDENT) ((. (VSM NT) (0 1)) (. (VSM T) (1 2))))",
+        "(x (PCA GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))",
+        "(o (SUM) ((. (VSM NT) (0 2)) (x (SUM GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))))",
+    ]
+
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.cache_on
+
+    def test_query_similarities_match_full_matrix(self):
+        query_cache = QueryCache()
+        for technique_name in self.technique_names:
+            technique = create_technique_from_name(technique_name)
+            similarity_matrix = technique.calculate_technique_data(
+                self.dataset
+            ).similarity_matrix
+            for source_index in range(similarity_matrix.shape[0]):
+                similarities = calculate_query_similarities(
+                    technique, self.dataset, source_index, query_cache
+                )
+                self.assertTrue(
+                    np.allclose(similarity_matrix[source_index], similarities),
+                    technique_name,
+                )
+
+    def test_query_cache_keeps_components(self):
+        query_cache = QueryCache()
+        technique = create_technique_from_name(self.transitive_technique_name)
+        calculate_query_similarities(technique, self.dataset, 0, query_cache)
+        self.assertEqual(2, len(query_cache.matrices))
+        query_cache.remove_dataset(self.dataset)
+        self.assertEqual(0, len(query_cache.matrices))
+
+    def test_rank_targets(self):
+        similarities = np.array([0.1, 0.7, 0.3, 0.7])
+        ranked_targets = rank_targets(similarities, ["A", "B", "C", "D"], 3)
+        self.assertEqual([("B", 0.7), ("D", 0.7), ("C", 0.3)], ranked_targets)
+        self.assertEqual(4, len(rank_targets(similarities, ["A", "B", "C", "D"], 10)))
+        self.assertEqual([], rank_targets(similarities, ["A", "B", "C", "D"], 0))
+
+    def test_get_top_k_targets(self):
+        tracer = Tracer()
+        technique_name = self.transitive_technique_name
+        ranked_targets = tracer.get_top_k_targets(self.d_name, technique_name, "R1", 2)
+        similarity_matrix = tracer.get_technique_data(
+            self.d_name, technique_name
+        ).similarity_matrix
+        target_ids = list(self.dataset.artifacts[2]["id"])
+        expected_order = np.argsort(-similarity_matrix[0], kind="stable")[:2]
+        self.assertEqual(
+            [target_ids[i] for i in expected_order],
+            [target_id for target_id, _ in ranked_targets],
+        )
+        self.assertEqual(
+            ranked_targets,
+            tracer.get_top_k_targets(self.d_name, technique_name, (0, 0), 2),
+        )
+
+    def test_get_top_k_targets_wrong_level(self):
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            tracer.get_top_k_targets(self.d_name, self.direct_technique_name, "C1")
+
+    def test_block_similarities_match_full_matrix(self):
+        query_cache = QueryCache()
+        for technique_name in self.technique_names:
+            technique = create_technique_from_name(technique_name)
+            similarity_matrix = technique.calculate_technique_data(
+                self.dataset
+            ).similarity_matrix
+            block_similarities = calculate_block_similarities(
+                technique, self.dataset, slice(0, 2), query_cache
+            )
+            self.assertTrue(
+                np.allclose(similarity_matrix[0:2], block_similarities),
+                technique_name,
+            )
+
+    def test_stream_metrics(self):
+        tracer = Tracer()
+        for technique_name in self.technique_names:
+            technique = create_technique_from_name(technique_name)
+            if technique.definition.source_level != 0:
+                continue
+            expected_metrics = tracer.get_metrics(
+                self.d_name, technique_name, summary_metrics=False
+            )
+            streamed_metrics = list(
+                tracer.stream_metrics(self.d_name, technique_name, block_size=1)
+            )
+            self.assertEqual(
+                [vars(m) for m in expected_metrics], [vars(m) for m in streamed_metrics]
+            )
+
+    def test_stream_metric_blocks(self):
+        tracer = Tracer()
+        technique_name = "(. (VSM NT) (1 2))"
+        blocks = list(
+            tracer.stream_metric_blocks(self.d_name, technique_name, block_size=2)
+        )
+        self.assertEqual(2, len(blocks))
+        expected_metrics = tracer.get_metrics(
+            self.d_name, technique_name, summary_metrics=False
+        )
+        self.assertEqual(
+            [m.query_id for m in expected_metrics],
+            [m.query_id for block in blocks for m in block],
+        )
@@ -1,13 +1,21 @@
 import numpy as np
 
 from api.extension.cache import Cache
+from api.extension.intermediates import IntermediateType
 from api.technique.definitions.direct.calculator import DirectTechniqueData
+from api.technique.definitions.combined.technique import create_technique_from_name
 from api.technique.definitions.transitive.calculator import (
+    FUSED_TRANSITIVE_TECHNIQUE_PIPELINE,
+    SCALED_COMPONENTS_STEP,
+    TRANSITIVE_TECHNIQUE_PIPELINE,
     TransitiveTechniqueCalculator,
     TransitiveTechniqueData,
     append_direct_component_matrices,
+    can_fuse_scaling,
+    create_scaled_components_key,
     perform_transitive_aggregation,
     perform_transitive_aggregation_on_component_techniques,
+    scale_transitive_matrices,
 )
 from api.technique.variationpoints.aggregation.aggregation_method import (
     AggregationMethod,
@@ -48,6 +56,66 @@ class TestIntermediateCalculationPipeline(TestTechniqueHelper):
 
         self.assertEqual((1, 3), matrix.shape)
 
+    def test_fused_pipeline_selected(self):
+        calculator = TransitiveTechniqueCalculator(self.get_transitive_definition())
+        self.assertEqual(FUSED_TRANSITIVE_TECHNIQUE_PIPELINE, calculator.pipeline)
+
+        pca_technique = create_technique_from_name(
+            "(x (PCA GLOBAL) (%s %s))"
+            % (self.transitive_upper_comp, self.transitive_component_b_name)
+        )
+        self.assertFalse(can_fuse_scaling(pca_technique.definition))
+        calculator = TransitiveTechniqueCalculator(pca_technique.definition)
+        self.assertEqual(TRANSITIVE_TECHNIQUE_PIPELINE, calculator.pipeline)
+
+    def test_fused_pipeline_identical(self):
+        for aggregation in ["SUM", "MAX"]:
+            for scaling in ["GLOBAL", "INDEPENDENT"]:
+                technique = create_technique_from_name(
+                    "(x (%s %s) (%s %s))"
+                    % (
+                        aggregation,
+                        scaling,
+                        self.transitive_upper_comp,
+                        self.transitive_component_b_name,
+                    )
+                )
+                fused_data = TransitiveTechniqueCalculator(
+                    technique.definition
+                ).run_pipeline_on_dataset(self.dataset)
+                unfused_data = TransitiveTechniqueCalculator(
+                    technique.definition, TRANSITIVE_TECHNIQUE_PIPELINE
+                ).run_pipeline_on_dataset(self.dataset)
+                self.assertTrue(
+                    np.allclose(
+                        unfused_data.similarity_matrix, fused_data.similarity_matrix
+                    )
+                )
+
+    def test_intermediates_released(self):
+        calculator = TransitiveTechniqueCalculator(self.get_transitive_definition())
+        technique_data = calculator.run_pipeline_on_dataset(self.dataset)
+        self.assertIsNotNone(technique_data.similarity_matrix)
+        self.assertEqual(0, len(technique_data.transitive_matrices))
+
+    def test_intermediates_retained(self):
+        TransitiveTechniqueData.RETAIN_INTERMEDIATES = True
+        try:
+            calculator = TransitiveTechniqueCalculator(self.get_transitive_definition())
+            technique_data = calculator.run_pipeline_on_dataset(self.dataset)
+        finally:
+            TransitiveTechniqueData.RETAIN_INTERMEDIATES = False
+        self.assertEqual(2, len(technique_data.transitive_matrices))
+
+    def test_scoring_table_memoized(self):
+        calculator = TransitiveTechniqueCalculator(self.get_transitive_definition())
+        technique_data = calculator.run_pipeline_on_dataset(self.dataset)
+        scoring_table = technique_data.get_scoring_table()
+        self.assertIs(scoring_table, technique_data.get_scoring_table())
+
+        technique_data.similarity_matrix = technique_data.similarity_matrix * 0.5
+        self.assertIsNot(scoring_table, technique_data.get_scoring_table())
+
     """
     calculate_technique_data
     """
@@ -100,3 +168,38 @@ class TestIntermediateCalculationPipeline(TestTechniqueHelper):
         self.assertEqual((1, 2), result.shape)
         self.assertEqual(1, result[0][1])
         self.assertEqual(1, result.sum(axis=1).sum())
+
+    """
+    scale_transitive_matrices
+    """
+
+    def test_scale_transitive_matrices_cached(self):
+        original = Cache.CACHE_ON
+        Cache.CACHE_ON = True
+        Cache.cleanup(self.dataset.name)
+
+        definition = self.get_transitive_definition()
+        data = TransitiveTechniqueData(self.dataset, definition)
+        append_direct_component_matrices(data)
+        scale_transitive_matrices(data)
+        self.assertTrue(
+            Cache.is_intermediate_cached(
+                self.dataset,
+                SCALED_COMPONENTS_STEP,
+                create_scaled_components_key(definition),
+                IntermediateType.DENSE_MATRICES,
+            )
+        )
+
+        cached_data = TransitiveTechniqueData(self.dataset, definition)
+        scale_transitive_matrices(cached_data)
+        self.assertEqual(
+            len(data.transitive_matrices), len(cached_data.transitive_matrices)
+        )
+        for expected, cached in zip(
+            data.transitive_matrices, cached_data.transitive_matrices
+        ):
+            self.assertTrue(np.array_equal(expected, cached))
+
+        Cache.cleanup(self.dataset.name)
+        Cache.CACHE_ON = original
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from api.async_tracer import AsyncTracer
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestAsyncTracer(TestTechniqueHelper):
+    """
+    Each test blocks the single worker of the executor so that requests stay pending until released.
+    """
+
+    def setUp(self):
+        self.release_event = threading.Event()
+        self.async_tracer = AsyncTracer(ThreadPoolExecutor(max_workers=1))
+
+    def tearDown(self):
+        self.release_event.set()
+        self.async_tracer.executor.shutdown()
+
+    def block_executor(self):
+        self.async_tracer.executor.submit(self.release_event.wait)
+
+    def test_get_metrics(self):
+        async def evaluate():
+            return await self.async_tracer.get_metrics(
+                self.d_name, self.direct_technique_name
+            )
+
+        metrics = asyncio.run(evaluate())
+        expected_metrics = Tracer().get_metrics(self.d_name, self.direct_technique_name)
+        self.assertEqual(1, len(metrics))
+        self.assertEqual(expected_metrics[0].ap, metrics[0].ap)
+
+    def test_coalesce_requests(self):
+        async def evaluate():
+            self.block_executor()
+            requests = [
+                asyncio.ensure_future(
+                    self.async_tracer.get_technique_data(self.d_name, name)
+                )
+                for name in [
+                    self.transitive_technique_name,
+                    self.transitive_technique_name.lower(),
+                ]
+            ]
+            await asyncio.sleep(0)
+            n_pending = len(self.async_tracer.pending)
+            self.release_event.set()
+            return n_pending, await asyncio.gather(*requests)
+
+        n_pending, (data_a, data_b) = asyncio.run(evaluate())
+        self.assertEqual(1, n_pending)
+        self.assertIs(data_a, data_b)
+        self.assertEqual(0, len(self.async_tracer.pending))
+
+    def test_stochastic_requests_not_coalesced(self):
+        async def evaluate():
+            self.block_executor()
+            requests = [
+                asyncio.ensure_future(
+                    self.async_tracer.get_technique_data(
+                        self.d_name, self.transitive_sampled_artifacts_technique_name
+                    )
+                )
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            n_pending = len(self.async_tracer.pending)
+            self.release_event.set()
+            return n_pending, await asyncio.gather(*requests)
+
+        n_pending, (data_a, data_b) = asyncio.run(evaluate())
+        self.assertEqual(2, n_pending)
+        self.assertIsNot(data_a, data_b)
+        self.assertEqual(0, len(self.async_tracer.pending))
+
+    def test_timeout(self):
+        async def evaluate():
+            self.block_executor()
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.async_tracer.get_metrics(
+                    self.d_name, self.direct_technique_name, timeout=0.01
+                )
+            return self.async_tracer.pending
+
+        pending = asyncio.run(evaluate())
+        self.assertEqual(0, len(pending))
+
+    def test_cancel_keeps_shared_computation(self):
+        async def evaluate():
+            self.block_executor()
+            request_a = asyncio.ensure_future(
+                self.async_tracer.get_metrics(self.d_name, self.direct_technique_name)
+            )
+            request_b = asyncio.ensure_future(
+                self.async_tracer.get_metrics(self.d_name, self.direct_technique_name)
+            )
+            await asyncio.sleep(0)
+            request_a.cancel()
+            await asyncio.sleep(0)
+            self.release_event.set()
+            return request_a, await request_b
+
+        request_a, metrics = asyncio.run(evaluate())
+        self.assertTrue(request_a.cancelled())
+        self.assertEqual(1, len(metrics))
+
+    def test_process_executor(self):
+        async def evaluate():
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                async with AsyncTracer(executor) as async_tracer:
+                    return await async_tracer.get_metrics(
+                        self.d_name, self.direct_technique_name
+                    )
+
+        metrics = asyncio.run(evaluate())
+        self.assertEqual(1, len(metrics))
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from api.extension.cache import Cache, CacheConfig
+from api.technique.definitions.combined.technique import create_technique_from_name
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestConcurrentTracer(TestTechniqueHelper):
+    technique_names = [
+        "(. (VSM NT) (0 2))",
+        "(. (VSM NT) (0 1))",
+        "(x (SUM GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))",
+    ]
+
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.cache_on
+
+    def test_concurrent_metrics(self):
+        expected_aps = [
+            Tracer().get_metrics(self.d_name, technique_name)[0].ap
+            for technique_name in self.technique_names
+        ]
+        tracer = Tracer()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(tracer.get_metrics, self.d_name, technique_name)
+                for _ in range(4)
+                for technique_name in self.technique_names
+            ]
+            aps = [future.result()[0].ap for future in futures]
+        np.testing.assert_allclose(expected_aps * 4, aps)
+        self.assertEqual(1, len(tracer.datasets))
+        self.assertEqual(0, len(tracer.computations))
+
+    def test_concurrent_queries(self):
+        tracer = Tracer()
+        technique_name = self.technique_names[0]
+        expected_targets = tracer.get_top_k_targets(
+            self.d_name, technique_name, (0, 0), 3
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda _: tracer.get_top_k_targets(
+                        self.d_name, technique_name, (0, 0), 3
+                    ),
+                    range(8),
+                )
+            )
+        for targets in results:
+            self.assertEqual(expected_targets, targets)
+
+    def test_cache_config(self):
+        Cache.cleanup()
+        tracer = Tracer(cache_config=CacheConfig(cache_on=False))
+        Cache.CACHE_ON = True
+        technique_name = self.technique_names[0]
+        tracer.get_metrics(self.d_name, technique_name)
+        self.assertTrue(Cache.get_config().cache_on)
+        definition = create_technique_from_name(technique_name).definition
+        self.assertFalse(Cache.is_cached(self.dataset, definition))
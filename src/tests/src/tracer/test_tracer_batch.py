@@ -0,0 +1,48 @@
+from api.constants.processing import (
+    AP_COLNAME,
+    DATASET_COLNAME,
+    NAME_COLNAME,
+    TECHNIQUE_TYPE_COLNAME,
+)
+from api.constants.techniques import DIRECT_ID, HYBRID_ID, TRANSITIVE_ID
+from api.extension.cache import Cache, CacheConfig
+from api import tracer as tracer_module
+from api.tracer import Tracer, attach_worker_datasets
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestTracerBatch(TestTechniqueHelper):
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.cache_on
+
+    def test_get_metrics_batch(self):
+        technique_names = [
+            self.direct_technique_name,
+            "(x (SUM GLOBAL) ((. (VSM T) (0 1)) (. (VSM NT) (1 2))))",
+            self.combined_technique_name,
+        ]
+        tracer = Tracer()
+        metric_table = tracer.get_metrics_batch(
+            [self.d_name], technique_names, n_workers=2
+        )
+        table = metric_table.table
+        self.assertEqual(technique_names, list(table[NAME_COLNAME]))
+        self.assertEqual([self.d_name] * 3, list(table[DATASET_COLNAME]))
+        self.assertEqual(
+            [DIRECT_ID, TRANSITIVE_ID, HYBRID_ID], list(table[TECHNIQUE_TYPE_COLNAME])
+        )
+        for technique_name, ap in zip(technique_names, table[AP_COLNAME]):
+            expected_metrics = tracer.get_metrics(self.d_name, technique_name)[0]
+            self.assertAlmostEqual(expected_metrics.ap, ap)
+
+    def test_worker_cache_config(self):
+        cache_config = CacheConfig(cache_on=True)
+        attach_worker_datasets([], cache_config)
+        try:
+            self.assertIs(cache_config, tracer_module._worker_tracer.cache_config)
+        finally:
+            tracer_module._worker_tracer = None
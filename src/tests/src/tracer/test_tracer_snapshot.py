@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+import numpy as np
+
+from api.datasets.change_set import ChangeSet
+from api.extension.cache import Cache, CacheConfig
+from api.tracer import Tracer
+from tests.res.test_technique_helper import TestTechniqueHelper
+
+
+class TestTracerSnapshot(TestTechniqueHelper):
+    technique_names = [
+        "(. (VSM NT) (0 2))",
+        "(. (LSI NT) (0 1))",
+        "(x (SUM GLOBAL) ((. (VSM NT) (0 1)) (. (VSM NT) (1 2))))",
+    ]
+
+    def setUp(self):
+        self.cache_on = Cache.CACHE_ON
+        Cache.CACHE_ON = False
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.path_to_snapshot = os.path.join(self.snapshot_dir.name, "snapshot")
+
+    def tearDown(self):
+        Cache.CACHE_ON = self.cache_on
+        self.snapshot_dir.cleanup()
+
+    def test_restores_queries(self):
+        tracer = Tracer()
+        for technique_name in self.technique_names:
+            tracer.get_top_k_targets(self.d_name, technique_name, (0, 0), 3)
+        tracer.save_snapshot(self.path_to_snapshot)
+
+        restored_tracer = Tracer.load_snapshot(self.path_to_snapshot)
+        self.assertEqual(
+            set(tracer.query_cache.vectors.keys()),
+            set(restored_tracer.query_cache.vectors.keys()),
+        )
+        self.assertEqual(
+            set(tracer.query_cache.matrices.keys()),
+            set(restored_tracer.query_cache.matrices.keys()),
+        )
+        for technique_name in self.technique_names:
+            self.assertEqual(
+                tracer.get_top_k_targets(self.d_name, technique_name, (0, 0), 3),
+                restored_tracer.get_top_k_targets(
+                    self.d_name, technique_name, (0, 0), 3
+                ),
+            )
+        dataset = restored_tracer.get_dataset(self.d_name)
+        self.assertIsInstance(dataset.traced_matrices["0-2"], np.memmap)
+        self.assertEqual(
+            list(self.dataset.artifacts[2]["id"]), list(dataset.artifacts[2]["id"])
+        )
+
+    def test_save_restored_snapshot_to_same_path(self):
+        tracer = Tracer()
+        for technique_name in self.technique_names:
+            tracer.get_top_k_targets(self.d_name, technique_name, (0, 0), 3)
+        tracer.save_snapshot(self.path_to_snapshot)
+
+        restored_tracer = Tracer.load_snapshot(self.path_to_snapshot)
+        restored_tracer.save_snapshot(self.path_to_snapshot)
+        self.assertEqual(["snapshot"], os.listdir(self.snapshot_dir.name))
+
+        reloaded_tracer = Tracer.load_snapshot(self.path_to_snapshot)
+        for technique_name in self.technique_names:
+            expected_targets = tracer.get_top_k_targets(
+                self.d_name, technique_name, (0, 0), 3
+            )
+            self.assertEqual(
+                expected_targets,
+                restored_tracer.get_top_k_targets(
+                    self.d_name, technique_name, (0, 0), 3
+                ),
+            )
+            self.assertEqual(
+                expected_targets,
+                reloaded_tracer.get_top_k_targets(
+                    self.d_name, technique_name, (0, 0), 3
+                ),
+            )
+
+    def test_restores_edited_dataset(self):
+        tracer = Tracer()
+        technique_name = self.technique_names[0]
+        tracer.get_tracked_metrics(self.d_name, technique_name)
+        tracer.apply_change_set(self.d_name, ChangeSet().remove_link("R1", "C3"))
+        tracer.save_snapshot(self.path_to_snapshot)
+
+        restored_tracer = Tracer.load_snapshot(self.path_to_snapshot)
+        self.assertEqual(1, restored_tracer.get_dataset(self.d_name).revision)
+        self.assertEqual(
+            [vars(m) for m in tracer.get_tracked_metrics(self.d_name, technique_name)],
+            [
+                vars(m)
+                for m in restored_tracer.get_tracked_metrics(
+                    self.d_name, technique_name
+                )
+            ],
+        )
+        refreshed_queries = restored_tracer.apply_change_set(
+            self.d_name, ChangeSet().add_link("R1", "C3")
+        )
+        self.assertEqual([0], refreshed_queries[technique_name])
+
+    def test_restores_cache_config(self):
+        Tracer().save_snapshot(self.path_to_snapshot)
+        cache_config = CacheConfig(cache_on=False)
+        restored_tracer = Tracer.load_snapshot(
+            self.path_to_snapshot, cache_config=cache_config
+        )
+        self.assertIs(cache_config, restored_tracer.cache_config)